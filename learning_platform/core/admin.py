@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import User, Course, LearningPath, Module, Quiz, Question, Answer, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress 
+from .models import User, Course, LearningPath, Module, Quiz, Question, Answer, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress, EnrichmentJob, QuizGenerationJob, QuestionResponse, ProgressEvent, ApiQuota, SearchEntry
+from .services.enrichment_service import requeue_modules
 from django.utils.translation import gettext_lazy as _
 
 # User Admin
@@ -17,16 +18,24 @@ class CourseAdmin(admin.ModelAdmin):
 # LearningPath Admin
 @admin.register(LearningPath)
 class LearningPathAdmin(admin.ModelAdmin):
-    list_display = ('path_name', 'course', 'date_created')
+    list_display = ('path_name', 'course', 'position', 'date_created')
     search_fields = ('path_name',)
 
 # Module Admin
 @admin.register(Module)
 class ModuleAdmin(admin.ModelAdmin):
-    list_display = ('module_name', 'learning_path', 'topic', 'video_link', 'blog_link')
+    list_display = ('module_name', 'learning_path', 'position', 'topic', 'video_link', 'blog_link', 'enrichment_status')
     search_fields = ('module_name', 'topic')
+    list_filter = ('enrichment_status',)
+    readonly_fields = ('slug', 'enrichment_status', 'enriched_topic', 'enriched_at')
+    actions = ['rerun_enrichment']
     save_on_top = True
     save_as = True
+
+    @admin.action(description=_('Re-fetch video and blog content'))
+    def rerun_enrichment(self, request, queryset):
+        queued = requeue_modules(queryset)
+        self.message_user(request, _('%d module(s) queued for enrichment.') % queued)
     
     def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
         extra_context = extra_context or {}
@@ -37,11 +46,26 @@ class ModuleAdmin(admin.ModelAdmin):
         })
         return super().changeform_view(request, object_id, form_url, extra_context)
 
+@admin.register(EnrichmentJob)
+class EnrichmentJobAdmin(admin.ModelAdmin):
+    list_display = ('module', 'topic', 'status', 'attempts', 'created_at', 'finished_at')
+    search_fields = ('module__module_name', 'topic')
+    list_filter = ('status',)
+    readonly_fields = ('last_error',)
+
+@admin.register(QuizGenerationJob)
+class QuizGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('module', 'status', 'attempts', 'quiz', 'requested_by', 'created_at', 'finished_at')
+    search_fields = ('module__module_name',)
+    list_filter = ('status',)
+    readonly_fields = ('last_error',)
+
 # Quiz Admin
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     list_display = ('quiz_name', 'module', 'date_created')
     search_fields = ('quiz_name',)
+    readonly_fields = ('content_hash',)
 
 # Question Admin
 @admin.register(Question)
@@ -80,4 +104,32 @@ class LearningPathProgressAdmin(admin.ModelAdmin):
     list_display = ('user', 'learning_path', 'progress_percentage', 'completed', 'completion_date')
     search_fields = ('user__username', 'learning_path__path_name')
     list_filter = ('completed',)
-    readonly_fields = ('progress_percentage', 'completed', 'completion_date')
+    readonly_fields = ('progress_percentage', 'completed', 'completion_date', 'completed_modules')
+
+
+@admin.register(QuestionResponse)
+class QuestionResponseAdmin(admin.ModelAdmin):
+    list_display = ('user', 'quiz', 'question', 'is_correct', 'submitted_at')
+    search_fields = ('user__username', 'quiz__quiz_name')
+    list_filter = ('is_correct',)
+
+
+@admin.register(ProgressEvent)
+class ProgressEventAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event_type', 'idempotency_key', 'client_timestamp', 'received_at')
+    search_fields = ('user__username', 'idempotency_key')
+    list_filter = ('event_type',)
+    readonly_fields = ('received_at',)
+
+
+@admin.register(ApiQuota)
+class ApiQuotaAdmin(admin.ModelAdmin):
+    list_display = ('name', 'tokens', 'capacity', 'refilled_at')
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'title', 'deleted', 'updated_at')
+    search_fields = ('title',)
+    list_filter = ('kind', 'deleted')
+    readonly_fields = ('updated_at',)
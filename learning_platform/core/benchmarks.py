@@ -0,0 +1,237 @@
+"""
+Synthetic data and request scenarios for the API benchmark suite
+(see the run_benchmarks management command).
+
+Scenarios call the view callables directly with APIRequestFactory, so the
+timings cover authentication, permissions, the view and its queries but not
+URL routing or middleware. Every scenario draws its users, modules and
+quizzes from a seeded random.Random, so two runs with the same options
+issue the same requests.
+"""
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from django.db import connection
+from django.utils.text import slugify
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .models import (
+    Answer, Course, CourseProgress, LearningPath, Module, ModuleProgress, Question, Quiz, QuizProgress, User,
+)
+from .services.progress_service import recompute_all
+from .services.search_index import rebuild_index
+from .views import (
+    CourseViewSet, get_module_by_name, get_next_learning_path, get_user_profile, search_catalog, submit_quiz,
+    update_module_progress,
+)
+
+# Module topics are two of these words, so catalog searches match a realistic share of the rows
+TOPIC_WORDS = [
+    'accessibility', 'algorithms', 'authentication', 'caching', 'concurrency', 'containers', 'databases',
+    'debugging', 'deployment', 'design', 'django', 'docker', 'encryption', 'graphql', 'html', 'indexing',
+    'javascript', 'kubernetes', 'linux', 'logging', 'microservices', 'monitoring', 'networking', 'pandas',
+    'performance', 'postgres', 'python', 'react', 'recursion', 'security', 'statistics', 'streaming',
+    'testing', 'typescript', 'visualization', 'websockets',
+]
+
+
+@dataclass
+class Dataset:
+    users: list = field(default_factory=list)
+    modules: list = field(default_factory=list)
+    # Learning paths that are followed by another one in their course
+    learning_paths: list = field(default_factory=list)
+    # quiz id -> [(question id, [answer ids])]
+    quizzes: dict = field(default_factory=dict)
+
+
+def populate(courses=5, paths=4, modules=5, questions=5, users=200, progress=0.3, seed=0, batch_size=1000):
+    """
+    Create `courses` x `paths` x `modules` modules, each with one quiz of `questions` four-answer questions,
+    and `users` learners who have finished roughly a `progress` fraction of the modules.
+    """
+    rng = random.Random(seed)
+    topic_rng = random.Random(f"{seed}:topics")
+    course_rows = Course.objects.bulk_create([
+        Course(course_name=f"Course {c}", description="Synthetic benchmark course") for c in range(courses)
+    ])
+    path_rows = LearningPath.objects.bulk_create([
+        LearningPath(path_name=f"Course {c} / Path {p}", course=course, position=p + 1)
+        for c, course in enumerate(course_rows) for p in range(paths)
+    ])
+    module_rows = [
+        Module(
+            module_name=f"{path.path_name} / Module {m}", slug=slugify(f"{path.path_name} / Module {m}"),
+            learning_path=path, position=m + 1,
+            topic=' '.join(topic_rng.sample(TOPIC_WORDS, 2)), enrichment_status=Module.ENRICHMENT_DONE,
+        )
+        for path in path_rows for m in range(modules)
+    ]
+    for module in module_rows:
+        module.enriched_topic = module.topic
+    module_rows = Module.objects.bulk_create(module_rows, batch_size=batch_size)
+    quiz_rows = Quiz.objects.bulk_create([
+        Quiz(quiz_name=f"{module.module_name} quiz", module=module) for module in module_rows
+    ], batch_size=batch_size)
+    question_rows = Question.objects.bulk_create([
+        Question(quiz=quiz, question_text=f"Question {q} on {module.topic}")
+        for module, quiz in zip(module_rows, quiz_rows) for q in range(questions)
+    ], batch_size=batch_size)
+    answer_rows = Answer.objects.bulk_create([
+        Answer(question=question, answer_text=f"Answer {a}", is_correct=a == 0)
+        for question in question_rows for a in range(4)
+    ], batch_size=batch_size)
+
+    dataset = Dataset(modules=module_rows, learning_paths=[path for path in path_rows if path.position < paths])
+    answers_by_question = {}
+    for answer in answer_rows:
+        answers_by_question.setdefault(answer.question_id, []).append(answer.pk)
+    for question in question_rows:
+        dataset.quizzes.setdefault(question.quiz_id, []).append((question.pk, answers_by_question[question.pk]))
+
+    dataset.users = User.objects.bulk_create([
+        User(username=f"bench{u}", email=f"bench{u}@example.com", full_name=f"Bench {u}", password="!")
+        for u in range(users)
+    ], batch_size=batch_size)
+
+    quiz_by_module = {quiz.module_id: quiz for quiz in quiz_rows}
+    course_by_path = {path.pk: path.course_id for path in path_rows}
+    module_progress, quiz_progress, course_progress = [], [], set()
+    for user in dataset.users:
+        for module in module_rows:
+            if rng.random() >= progress:
+                continue
+            module_progress.append(ModuleProgress(
+                user=user, module=module, video_watched=True, quiz_completed=True, completed=True, score=100.0
+            ))
+            quiz_progress.append(QuizProgress(user=user, quiz=quiz_by_module[module.pk], score=100.0, completed=True))
+            course_progress.add((user.pk, course_by_path[module.learning_path_id]))
+    ModuleProgress.objects.bulk_create(module_progress, batch_size=batch_size)
+    QuizProgress.objects.bulk_create(quiz_progress, batch_size=batch_size)
+    CourseProgress.objects.bulk_create([
+        CourseProgress(user_id=user_id, course_id=course_id) for user_id, course_id in course_progress
+    ], batch_size=batch_size)
+    # Learning path and course counters come from the same code path as `manage.py recompute_progress`
+    recompute_all()
+    # bulk_create sends no signals, so the search entries are written in one pass
+    rebuild_index(batch_size=batch_size)
+    return dataset
+
+
+def _submit_quiz(rng, dataset):
+    quiz_id = rng.choice(list(dataset.quizzes))
+    answers = [
+        {'question_id': question_id, 'answer_id': rng.choice(answer_ids)}
+        for question_id, answer_ids in dataset.quizzes[quiz_id]
+    ]
+    return submit_quiz, 'post', f'/api/v1/quizzes/{quiz_id}/submit/', {'answers': answers}, {'quiz_id': quiz_id}
+
+
+def _update_module_progress(rng, dataset):
+    module = rng.choice(dataset.modules)
+    return update_module_progress, 'post', f'/api/v1/modules/{module.pk}/progress/', {}, {'module_id': module.pk}
+
+
+def _user_profile(rng, dataset):
+    return get_user_profile, 'get', '/api/v1/user-profile/', None, {}
+
+
+_course_list = CourseViewSet.as_view({'get': 'list'})
+
+
+def _course_list_scenario(rng, dataset):
+    return _course_list, 'get', '/api/v1/courses/', None, {}
+
+
+def _module_by_name(rng, dataset):
+    module = rng.choice(dataset.modules)
+    return get_module_by_name, 'get', '/api/v1/module-by-name/', None, {'module_name': module.module_name}
+
+
+def _next_learning_path(rng, dataset):
+    path_id = rng.choice(dataset.learning_paths).pk
+    return (
+        get_next_learning_path, 'get', f'/api/v1/next-learning-path/{path_id}/', None,
+        {'current_learning_path_id': path_id},
+    )
+
+
+def _search(rng, dataset):
+    # One whole word and the start of another, as typed into a search box
+    first, second = rng.sample(TOPIC_WORDS, 2)
+    query = f"{first} {second[:4]}"
+    return search_catalog, 'get', '/api/v1/search/', {'q': query}, {}
+
+
+SCENARIOS = {
+    'submit_quiz': _submit_quiz,
+    'update_module_progress': _update_module_progress,
+    'get_user_profile': _user_profile,
+    'course_list': _course_list_scenario,
+    'get_module_by_name': _module_by_name,
+    'next_learning_path': _next_learning_path,
+    'search': _search,
+}
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_scenario(name, dataset, requests=200, warmup=20, seed=0):
+    """
+    Issue `warmup` untimed requests (to fill the quiz and dashboard caches) and then `requests` timed ones.
+    Returns a dict of latency percentiles in ms, queries per request and single-client throughput.
+    """
+    build = SCENARIOS[name]
+    rng = random.Random(f"{seed}:{name}")
+    factory = APIRequestFactory()
+
+    def issue():
+        view, method, path, data, kwargs = build(rng, dataset)
+        request = getattr(factory, method)(path, data, format='json')
+        force_authenticate(request, user=rng.choice(dataset.users))
+        response = view(request, **kwargs)
+        response.render()
+        return response.status_code
+
+    for _ in range(warmup):
+        issue()
+
+    executed = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal executed
+        executed += 1
+        return execute(sql, params, many, context)
+
+    timings, queries, errors = [], [], 0
+    started = time.perf_counter()
+    with connection.execute_wrapper(count_query):
+        for _ in range(requests):
+            executed = 0
+            start = time.perf_counter()
+            status_code = issue()
+            timings.append((time.perf_counter() - start) * 1000)
+            queries.append(executed)
+            errors += status_code >= 400
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(statistics.fmean(timings), 3) if timings else 0.0,
+        'queries_per_request': round(statistics.fmean(queries), 2) if queries else 0.0,
+        'max_queries': max(queries, default=0),
+        'throughput_rps': round(requests / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,119 @@
+"""
+Structured logging helpers, wired up by LOGGING in settings.py.
+
+- RequestIdMiddleware tags every request with an id (taken from the
+  X-Request-ID header or generated) and echoes it back on the response.
+- RequestIdFilter copies that id onto each log record.
+- JsonFormatter renders records as one JSON object per line, including any
+  `extra={...}` fields.
+- QueuedHandler hands records to a background thread that does the actual
+  writing, so a log call never blocks a request on file or stdout I/O.
+"""
+import contextvars
+import copy
+import json
+import logging
+import queue
+import re
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+
+from django.utils.module_loading import import_string
+
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+
+def get_request_id():
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = '-'
+        return super().format(record)
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Queue in front of a real handler that runs on a listener thread.
+    `handler_class` is a dotted path; remaining kwargs are passed to it (e.g. `filename`).
+    """
+    def __init__(self, handler_class='logging.StreamHandler', fmt='json', **handler_kwargs):
+        super().__init__(queue.SimpleQueue())
+        target = import_string(handler_class)(**handler_kwargs)
+        target.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+        self.listener = QueueListener(self.queue, target)
+        self.listener.start()
+        self._listening = True
+
+    def close(self):
+        # logging.shutdown() closes every handler at exit; drain the queue before the process goes away
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        super().close()
+
+    def prepare(self, record):
+        # Resolve the message and traceback on the calling thread; JSON rendering happens on the listener
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RequestIdMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        if not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
@@ -0,0 +1,105 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models import Course, LearningPath, Module, ModuleProgress, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the hot ModuleProgress lookups against a throwaway test database filled with synthetic rows, "
+        "with and without the composite indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help="ModuleProgress rows to generate.")
+        parser.add_argument('--modules', type=int, default=500, help="Modules per synthetic course.")
+        parser.add_argument('--lookups', type=int, default=500, help="Timed lookups per query shape.")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        old_name = connection.settings_dict['NAME']
+        # Never touch the real database: build and tear down a test database
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            users, modules = self.populate(options['rows'], options['modules'], options['batch_size'])
+            samples = [(random.choice(users), random.choice(modules)) for _ in range(options['lookups'])]
+
+            self.report("with indexes", samples)
+            self.drop_progress_indexes()
+            self.report("without indexes", samples)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self, rows, num_modules, batch_size):
+        num_modules = max(1, min(num_modules, rows))
+        num_users = -(-rows // num_modules)
+        self.stdout.write(f"Generating {rows} progress rows ({num_users} users x {num_modules} modules)...")
+
+        course = Course.objects.create(course_name="Benchmark", description="Synthetic")
+        paths = LearningPath.objects.bulk_create([
+            LearningPath(path_name=f"Path {i}", course=course) for i in range(max(1, num_modules // 10))
+        ])
+        modules = Module.objects.bulk_create([
+            Module(
+                module_name=f"Module {i}", slug=f"module-{i}", learning_path=paths[i % len(paths)],
+                topic="Topic", enriched_topic="Topic", enrichment_status=Module.ENRICHMENT_DONE,
+            )
+            for i in range(num_modules)
+        ])
+        users = User.objects.bulk_create([
+            User(username=f"bench{i}", email=f"bench{i}@example.com", full_name=f"Bench {i}", password="!")
+            for i in range(num_users)
+        ], batch_size=batch_size)
+
+        batch = []
+        created = 0
+        for user in users:
+            for module in modules:
+                if created == rows:
+                    break
+                done = random.random() < 0.5
+                batch.append(ModuleProgress(
+                    user=user, module=module, video_watched=done, quiz_completed=done, completed=done
+                ))
+                created += 1
+                if len(batch) == batch_size:
+                    ModuleProgress.objects.bulk_create(batch)
+                    batch = []
+        ModuleProgress.objects.bulk_create(batch)
+        return users, modules
+
+    def drop_progress_indexes(self):
+        with connection.schema_editor() as schema_editor:
+            for constraint in ModuleProgress._meta.constraints:
+                schema_editor.remove_constraint(ModuleProgress, constraint)
+            for index in ModuleProgress._meta.indexes:
+                schema_editor.remove_index(ModuleProgress, index)
+
+    def report(self, label, samples):
+        shapes = {
+            "get (user, module)": lambda user, module: ModuleProgress.objects.filter(user=user, module=module).first(),
+            "count (user, completed)": lambda user, module: ModuleProgress.objects.filter(
+                user=user, completed=True
+            ).count(),
+            "count (user, path, completed)": lambda user, module: ModuleProgress.objects.filter(
+                user=user, module__learning_path_id=module.learning_path_id, completed=True
+            ).count(),
+        }
+        self.stdout.write(f"\n{label}:")
+        for name, lookup in shapes.items():
+            timings = []
+            for user, module in samples:
+                start = time.perf_counter()
+                lookup(user, module)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"  {name:<32} median {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms"
+            )
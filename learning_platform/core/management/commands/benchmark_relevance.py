@@ -0,0 +1,90 @@
+import random
+import re
+import statistics
+import time
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from django.core.management.base import BaseCommand
+
+from core.services.relevance import rank_videos, score_documents, term_coverage
+
+WORDS = """
+    python javascript html css django react database index query cache async thread server client api
+    function class object module package test deploy docker linux network security algorithm data
+    structure tutorial course beginner advanced project build learn guide full complete crash explained
+""".split()
+
+
+def legacy_similarity(a, b):
+    # Scoring used before core.services.relevance, kept here as the baseline
+    a_clean = re.sub(r'[^\w\s]', '', a.lower())
+    b_clean = re.sub(r'[^\w\s]', '', b.lower())
+    return SequenceMatcher(None, a_clean, b_clean).ratio()
+
+
+def legacy_rank(topic, candidates):
+    videos = []
+    for video in candidates:
+        title_similarity = legacy_similarity(topic, video['title'])
+        desc_similarity = legacy_similarity(topic, video['description'])
+        videos.append({**video, 'title_similarity': title_similarity, 'desc_similarity': desc_similarity})
+    return sorted(videos, key=lambda x: (x['views'], x['title_similarity']), reverse=True)
+
+
+def current_rank(topic, candidates):
+    scores = score_documents(topic, [video['description'] for video in candidates])
+    videos = [
+        {**video, 'title_similarity': term_coverage(topic, video['title']), 'desc_similarity': score}
+        for video, score in zip(candidates, scores)
+    ]
+    return rank_videos(videos)
+
+
+class Command(BaseCommand):
+    help = "Time YouTube candidate scoring and ranking against the previous SequenceMatcher implementation."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=20, help="Videos per search (the API returns 20).")
+        parser.add_argument('--description-words', type=int, default=400)
+        parser.add_argument('--searches', type=int, default=50, help="Timed searches per implementation.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        searches = [self.search(rng, options['candidates'], options['description_words'])
+                    for _ in range(options['searches'])]
+
+        self.stdout.write(
+            f"{options['searches']} searches x {options['candidates']} candidates, "
+            f"~{options['description_words']} words per description"
+        )
+        baseline = self.report("SequenceMatcher (previous)", legacy_rank, searches)
+        current = self.report("BM25 + weighted ranking", current_rank, searches)
+        self.stdout.write(f"  speedup: {baseline / current:.1f}x (median)")
+
+    def search(self, rng, candidates, description_words):
+        topic = " ".join(rng.sample(WORDS, 2))
+        videos = []
+        for _ in range(candidates):
+            title_words = rng.sample(WORDS, 5)
+            videos.append({
+                'title': " ".join(title_words).title(),
+                'description': " ".join(rng.choice(WORDS) for _ in range(description_words)),
+                'views': rng.randint(0, 5_000_000),
+                'published_at': f"{rng.randint(2022, 2024)}-0{rng.randint(1, 9)}-15T00:00:00Z",
+                'duration': timedelta(minutes=rng.randint(20, 180)),
+            })
+        return topic, videos
+
+    def report(self, label, rank, searches):
+        timings = []
+        for topic, candidates in searches:
+            start = time.perf_counter()
+            rank(topic, candidates)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        median = statistics.median(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"  {label:<28} median {median:8.3f} ms   p95 {p95:8.3f} ms")
+        return median
@@ -0,0 +1,47 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.models import EnrichmentJob, Module
+from core.services.enrichment_service import drain_enrichment_queue, requeue_modules
+from core.services.job_queue import release_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Fetch YouTube videos and blog posts for modules waiting on content enrichment."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help="Process at most this many jobs.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new jobs (worker mode).")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls in --loop mode.")
+        parser.add_argument(
+            '--requeue', choices=['failed', 'all'],
+            help="Queue failed modules (or every module) for enrichment before draining.",
+        )
+        parser.add_argument(
+            '--stale-minutes', type=int, default=30,
+            help="Put jobs stuck in 'running' for longer than this back on the queue.",
+        )
+
+    def handle(self, *args, **options):
+        released = release_stale_jobs(EnrichmentJob, older_than=timedelta(minutes=options['stale_minutes']))
+        if released:
+            self.stdout.write(f"Released {released} stale job(s).")
+
+        if options['requeue']:
+            modules = Module.objects.all()
+            if options['requeue'] == 'failed':
+                modules = modules.filter(enrichment_status=Module.ENRICHMENT_FAILED)
+            queued = requeue_modules(modules.iterator())
+            self.stdout.write(f"Queued {queued} module(s) for enrichment.")
+
+        while True:
+            counts = drain_enrichment_queue(limit=options['limit'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"Enrichment: {counts['done']} done, {counts['pending']} retrying, {counts['failed']} failed."
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
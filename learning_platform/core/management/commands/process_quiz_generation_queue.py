@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.models import QuizGenerationJob
+from core.services.job_queue import release_stale_jobs
+from core.services.quiz_job_service import drain_quiz_generation_queue
+
+
+class Command(BaseCommand):
+    help = "Generate quizzes for queued modules, several at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Jobs to run concurrently.")
+        parser.add_argument('--limit', type=int, default=None, help="Process at most this many jobs.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new jobs (worker mode).")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds between polls in --loop mode.")
+        parser.add_argument(
+            '--stale-minutes', type=int, default=15,
+            help="Put jobs stuck in 'running' for longer than this back on the queue.",
+        )
+
+    def handle(self, *args, **options):
+        released = release_stale_jobs(QuizGenerationJob, older_than=timedelta(minutes=options['stale_minutes']))
+        if released:
+            self.stdout.write(f"Released {released} stale job(s).")
+
+        while True:
+            counts = drain_quiz_generation_queue(limit=options['limit'], workers=options['workers'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"Quiz generation: {counts['done']} done, {counts['pending']} retrying, {counts['failed']} failed."
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
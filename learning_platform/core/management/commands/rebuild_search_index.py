@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.services.search_index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite the catalog search entries from the course, learning path, module and question tables. "
+        "Run after migrating, and after bulk loads or raw SQL that bypass the save signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help="Objects written per INSERT.")
+
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(f"Indexed {count} catalog object(s).")
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.services.progress_service import recompute_all
+
+
+class Command(BaseCommand):
+    help = "Rebuild learning path and course progress counters from module progress (fixes drift)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='usernames', help="Only recompute for this username.")
+
+    def handle(self, *args, **options):
+        users = None
+        if options['usernames']:
+            users = get_user_model().objects.filter(username__in=options['usernames'])
+
+        path_count, course_count = recompute_all(users)
+        self.stdout.write(
+            f"Recomputed {path_count} learning path progress row(s) and {course_count} course progress row(s)."
+        )
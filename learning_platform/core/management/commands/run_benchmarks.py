@@ -0,0 +1,109 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks import SCENARIOS, populate, run_scenario
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API hot paths against a throwaway test database filled with synthetic courses, "
+        "users and progress. Reports p50/p95/p99 latency, queries per request and throughput, "
+        "and optionally saves them as JSON for comparing commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=5)
+        parser.add_argument('--paths', type=int, default=4, help="Learning paths per course.")
+        parser.add_argument('--modules', type=int, default=5, help="Modules (each with one quiz) per path.")
+        parser.add_argument('--questions', type=int, default=5, help="Questions per quiz.")
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--progress', type=float, default=0.3, help="Fraction of modules each user finished.")
+        parser.add_argument('--requests', type=int, default=200, help="Timed requests per scenario.")
+        parser.add_argument('--warmup', type=int, default=20, help="Untimed requests per scenario.")
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', choices=sorted(SCENARIOS),
+            help="Only run this scenario (repeatable).",
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--baseline', help="JSON file from an earlier run to compare against.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)['scenarios']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {e}")
+
+        params = {
+            key: options[key]
+            for key in ('courses', 'paths', 'modules', 'questions', 'users', 'progress', 'requests', 'warmup', 'seed')
+        }
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        # Never touch the real database: build and tear down a test database
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(
+                f"Generating {params['courses']} courses x {params['paths']} paths x {params['modules']} modules, "
+                f"{params['users']} users..."
+            )
+            dataset = populate(
+                params['courses'], params['paths'], params['modules'], params['questions'],
+                params['users'], params['progress'], params['seed'],
+            )
+            results = {}
+            for name in options['scenarios'] or SCENARIOS:
+                results[name] = run_scenario(name, dataset, params['requests'], params['warmup'], params['seed'])
+                self.report(name, results[name], (baseline or {}).get(name))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({
+                    'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    'commit': self.git_commit(),
+                    'database': connection.vendor,
+                    'params': params,
+                    'scenarios': results,
+                }, f, indent=2)
+            self.stdout.write(f"\nResults written to {options['output']}")
+
+    def report(self, name, result, previous):
+        line = (
+            f"{name:<24} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  {result['queries_per_request']:6.1f} queries  "
+            f"{result['throughput_rps']:7.1f} req/s"
+        )
+        if result['errors']:
+            line += f"  {result['errors']} errors"
+        if previous:
+            line += (
+                f"  (p95 {self.change(result['p95_ms'], previous['p95_ms'])}, "
+                f"queries {result['queries_per_request'] - previous['queries_per_request']:+.1f})"
+            )
+        self.stdout.write(line)
+
+    @staticmethod
+    def change(current, previous):
+        if not previous:
+            return "n/a"
+        return f"{(current - previous) / previous * 100:+.0f}%"
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
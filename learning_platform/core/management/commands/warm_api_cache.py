@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from core.models import BackgroundJob, Module
+from core.services import api_cache
+from core.services.blog_service import get_blog_posts
+from core.services.quiz_generation_service import fetch_video_description, fetch_video_transcript
+from core.services.youtube_service import get_youtube_videos_for_topics
+
+
+class Command(BaseCommand):
+    help = "Prefetch YouTube, SerpAPI and transcript responses for every module topic into the API cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=25, help="Topics per YouTube batch.")
+        parser.add_argument(
+            '--skip-transcripts', action='store_true',
+            help="Do not prefetch transcripts/descriptions for module videos.",
+        )
+
+    def handle(self, *args, **options):
+        api_cache.reset_cache_stats()
+
+        topics = list(Module.objects.order_by().values_list('topic', flat=True).distinct())
+        self.stdout.write(f"Warming cache for {len(topics)} topic(s)...")
+
+        batch_size = options['batch_size']
+        for start in range(0, len(topics), batch_size):
+            get_youtube_videos_for_topics(topics[start:start + batch_size], priority=BackgroundJob.PRIORITY_BACKGROUND)
+        for topic in topics:
+            get_blog_posts(topic)
+
+        if not options['skip_transcripts']:
+            video_links = Module.objects.exclude(video_link='').order_by().values_list('video_link', flat=True).distinct()
+            for video_link in video_links:
+                if fetch_video_transcript(video_link) is None:
+                    fetch_video_description(video_link)
+
+        for source, counters in sorted(api_cache.get_cache_stats().items()):
+            self.stdout.write(f"{source}: {counters['hits']} hit(s), {counters['misses']} miss(es)")
@@ -0,0 +1,261 @@
+"""
+In-process request metrics.
+
+PerformanceMiddleware measures each request:
+- wall time
+- DB query count and time, via connection.execute_wrapper
+- external API calls made through track_external()
+- response size
+
+The numbers go out as a Server-Timing header. They are also added to
+histograms per URL name, which metrics_view serves in the Prometheus text
+format at /metrics to staff users and to scrapers sending settings.METRICS_TOKEN
+as a bearer token. Aggregates live in process memory: each worker process
+reports its own.
+"""
+import bisect
+import contextvars
+import hmac
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.http import Http404, HttpResponse
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.settings import api_settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-1]}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUESTS = Counter('http_requests_total', "Requests by route, method and status.", ('route', 'method', 'status'))
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', "Request wall time.", DURATION_BUCKETS, ('route', 'method')
+)
+REQUEST_QUERIES = Histogram('http_request_db_queries', "DB queries per request.", QUERY_BUCKETS, ('route',))
+REQUEST_DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', "Time spent in DB queries per request.", DURATION_BUCKETS, ('route',)
+)
+REQUEST_EXTERNAL_CALLS = Histogram(
+    'http_request_external_calls', "External API calls per request.", QUERY_BUCKETS, ('route',)
+)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', "Response body size.", SIZE_BUCKETS, ('route',))
+EXTERNAL_DURATION = Histogram(
+    'external_call_duration_seconds', "External API call time by service.", DURATION_BUCKETS, ('service',)
+)
+EXTERNAL_ERRORS = Counter('external_call_errors_total', "Failed external API calls by service.", ('service',))
+
+REGISTRY = [
+    REQUESTS, REQUEST_DURATION, REQUEST_QUERIES, REQUEST_DB_DURATION, REQUEST_EXTERNAL_CALLS, RESPONSE_SIZE,
+    EXTERNAL_DURATION, EXTERNAL_ERRORS,
+]
+
+
+class RequestStats:
+    __slots__ = ('db_queries', 'db_time', 'external_calls', 'external_time')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.external_calls = 0
+        self.external_time = 0.0
+
+
+_current_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+@contextmanager
+def track_external(service):
+    """
+    Time an outbound API call (YouTube, SerpAPI, OpenAI...). Counted against the current request, if any.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_ERRORS.inc(service)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_DURATION.observe(elapsed, service)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.external_calls += 1
+            stats.external_time += elapsed
+
+
+def _count_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += time.perf_counter() - start
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_count_query))
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = (match.url_name or match.route) if match else 'unmatched'
+        REQUESTS.inc(route, request.method, response.status_code)
+        REQUEST_DURATION.observe(elapsed, route, request.method)
+        REQUEST_QUERIES.observe(stats.db_queries, route)
+        REQUEST_DB_DURATION.observe(stats.db_time, route)
+        REQUEST_EXTERNAL_CALLS.observe(stats.external_calls, route)
+        RESPONSE_SIZE.observe(_response_size(response), route)
+
+        response['Server-Timing'] = ', '.join([
+            f'app;dur={elapsed * 1000:.1f}',
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_queries} queries"',
+            f'ext;dur={stats.external_time * 1000:.1f};desc="{stats.external_calls} calls"',
+        ])
+        return response
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    for metric in REGISTRY:
+        metric.reset()
+
+
+SCRAPER = 'metrics-token'
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """
+    Accepts `Authorization: Bearer <METRICS_TOKEN>` from a metrics scraper. Any other
+    credentials are left to the regular authentication classes.
+    """
+
+    def authenticate(self, request):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        header = request.headers.get('Authorization', '')
+        if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return AnonymousUser(), SCRAPER
+        return None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="metrics"'
+
+
+class IsMetricsScraper(BasePermission):
+    def has_permission(self, request, view):
+        return request.auth == SCRAPER
+
+
+@api_view(['GET'])
+@authentication_classes([MetricsTokenAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+@permission_classes([IsAdminUser | IsMetricsScraper])
+def metrics_view(request):
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        raise Http404
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
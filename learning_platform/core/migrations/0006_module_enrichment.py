@@ -0,0 +1,60 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_modules_enriched(apps, schema_editor):
+    # Modules saved before the queue existed were already enriched synchronously
+    Module = apps.get_model('core', 'Module')
+    Module.objects.update(enrichment_status='done', enriched_topic=F('topic'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_moduleprogress_score_learningpathprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='module',
+            name='enriched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='enriched_topic',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='enrichment_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='learningpathprogress',
+            name='learning_path',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='core.learningpath'),
+        ),
+        migrations.CreateModel(
+            name='EnrichmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('topic', models.CharField(max_length=255)),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrichment_jobs', to='core.module')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(mark_existing_modules_enriched, migrations.RunPython.noop),
+    ]
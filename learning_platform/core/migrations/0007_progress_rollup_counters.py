@@ -0,0 +1,52 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:37
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    LearningPathProgress = apps.get_model('core', 'LearningPathProgress')
+    CourseProgress = apps.get_model('core', 'CourseProgress')
+    ModuleProgress = apps.get_model('core', 'ModuleProgress')
+
+    for path_progress in LearningPathProgress.objects.all().iterator():
+        path_progress.completed_modules = ModuleProgress.objects.filter(
+            user_id=path_progress.user_id,
+            module__learning_path_id=path_progress.learning_path_id,
+            completed=True,
+        ).count()
+        path_progress.save(update_fields=['completed_modules'])
+
+    for course_progress in CourseProgress.objects.all().iterator():
+        totals = LearningPathProgress.objects.filter(
+            user_id=course_progress.user_id, learning_path__course_id=course_progress.course_id
+        ).aggregate(total=Sum('progress_percentage'), completed=Count('id', filter=Q(completed=True)))
+        course_progress.path_progress_total = totals['total'] or 0.0
+        course_progress.completed_learning_paths = totals['completed']
+        course_progress.save(update_fields=['path_progress_total', 'completed_learning_paths'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_module_enrichment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseprogress',
+            name='completed_learning_paths',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='courseprogress',
+            name='path_progress_total',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='learningpathprogress',
+            name='completed_modules',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_progress_rollup_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_correct', models.BooleanField(default=False)),
+                ('submitted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('answer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='responses', to='core.answer')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='core.question')),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='core.quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_responses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['question', 'is_correct'], name='core_questi_questio_a7eaef_idx'), models.Index(fields=['user', 'quiz', 'submitted_at'], name='core_questi_user_id_9a43fc_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+def _duplicate_groups(model, field):
+    """
+    Yield the rows of every (user, <field>) pair that has more than one progress row, oldest first.
+    """
+    groups = (
+        model.objects.values_list('user_id', field)
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for user_id, value, _ in groups.iterator():
+        yield user_id, list(model.objects.filter(user_id=user_id, **{field: value}).order_by('id'))
+
+
+def _earliest(dates):
+    dates = [date for date in dates if date is not None]
+    return min(dates) if dates else None
+
+
+def _merge_module_progress(ModuleProgress):
+    users = set()
+    for user_id, rows in _duplicate_groups(ModuleProgress, 'module_id'):
+        keeper, duplicates = rows[0], rows[1:]
+        scores = [row.score for row in rows if row.score is not None]
+        keeper.video_watched = any(row.video_watched for row in rows)
+        keeper.quiz_completed = any(row.quiz_completed for row in rows)
+        keeper.score = max(scores) if scores else None
+        keeper.completed = keeper.video_watched and keeper.quiz_completed
+        keeper.completion_date = _earliest(row.completion_date for row in rows) if keeper.completed else None
+        keeper.save()
+        ModuleProgress.objects.filter(pk__in=[row.pk for row in duplicates]).delete()
+        users.add(user_id)
+    return users
+
+
+def _merge_quiz_progress(QuizProgress):
+    for user_id, rows in _duplicate_groups(QuizProgress, 'quiz_id'):
+        keeper, duplicates = rows[0], rows[1:]
+        scores = [row.score for row in rows if row.score is not None]
+        keeper.score = max(scores) if scores else None
+        keeper.completed = keeper.score is not None and keeper.score >= 70.0
+        keeper.completion_date = (
+            _earliest(row.completion_date for row in rows if row.completed) if keeper.completed else None
+        )
+        keeper.save()
+        QuizProgress.objects.filter(pk__in=[row.pk for row in duplicates]).delete()
+
+
+def _drop_rollup_duplicates(model, field):
+    # Rollup rows are derived data: keep one and let the recount below fix its numbers
+    users = set()
+    for user_id, rows in _duplicate_groups(model, field):
+        model.objects.filter(pk__in=[row.pk for row in rows[1:]]).delete()
+        users.add(user_id)
+    return users
+
+
+def _recount(apps, users):
+    Module = apps.get_model('core', 'Module')
+    LearningPath = apps.get_model('core', 'LearningPath')
+    ModuleProgress = apps.get_model('core', 'ModuleProgress')
+    LearningPathProgress = apps.get_model('core', 'LearningPathProgress')
+    CourseProgress = apps.get_model('core', 'CourseProgress')
+
+    for path_progress in LearningPathProgress.objects.filter(user_id__in=users).iterator():
+        total_modules = Module.objects.filter(learning_path_id=path_progress.learning_path_id).count()
+        path_progress.completed_modules = ModuleProgress.objects.filter(
+            user_id=path_progress.user_id, module__learning_path_id=path_progress.learning_path_id, completed=True
+        ).count()
+        if total_modules > 0:
+            path_progress.progress_percentage = round((path_progress.completed_modules / total_modules) * 100)
+            path_progress.completed = path_progress.progress_percentage == 100
+            if not path_progress.completed:
+                path_progress.completion_date = None
+        path_progress.save()
+
+    for course_progress in CourseProgress.objects.filter(user_id__in=users).iterator():
+        total_learning_paths = LearningPath.objects.filter(course_id=course_progress.course_id).count()
+        totals = LearningPathProgress.objects.filter(
+            user_id=course_progress.user_id, learning_path__course_id=course_progress.course_id
+        ).aggregate(total=Sum('progress_percentage'), completed=Count('id', filter=Q(completed=True)))
+        course_progress.path_progress_total = totals['total'] or 0.0
+        course_progress.completed_learning_paths = totals['completed']
+        if total_learning_paths > 0:
+            course_progress.progress_percentage = round(course_progress.path_progress_total / total_learning_paths)
+            course_progress.completed = course_progress.progress_percentage == 100
+            if not course_progress.completed:
+                course_progress.completion_date = None
+        course_progress.save()
+
+
+def merge_duplicate_progress(apps, schema_editor):
+    """
+    Collapse duplicate (user, target) progress rows so the unique constraints in 0010 can be added.
+    Module and quiz rows are merged field by field; learning path and course rows are recounted.
+    """
+    users = _merge_module_progress(apps.get_model('core', 'ModuleProgress'))
+    _merge_quiz_progress(apps.get_model('core', 'QuizProgress'))
+    users |= _drop_rollup_duplicates(apps.get_model('core', 'LearningPathProgress'), 'learning_path_id')
+    users |= _drop_rollup_duplicates(apps.get_model('core', 'CourseProgress'), 'course_id')
+    if users:
+        _recount(apps, users)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_questionresponse'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_progress, migrations.RunPython.noop),
+    ]
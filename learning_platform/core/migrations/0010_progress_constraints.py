@@ -0,0 +1,41 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_merge_duplicate_progress'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='learningpathprogress',
+            index=models.Index(fields=['user', 'completed'], name='pathprogress_user_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moduleprogress',
+            index=models.Index(fields=['user', 'completed'], name='moduleprogress_user_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizprogress',
+            index=models.Index(fields=['user', 'completed'], name='quizprogress_user_done_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='courseprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='unique_course_progress_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='learningpathprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'learning_path'), name='unique_path_progress_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='moduleprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'module'), name='unique_module_progress_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='quizprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'quiz'), name='unique_quiz_progress_per_user'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_progress_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('event_type', models.CharField(choices=[('video_watched', 'Video watched'), ('quiz_submitted', 'Quiz submitted')], max_length=20)),
+                ('client_timestamp', models.DateTimeField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('module', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='progress_events', to='core.module')),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='progress_events', to='core.quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'idempotency_key'), name='unique_progress_event_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_quizgenerationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='reuse_existing',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_quiz_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('capacity', models.PositiveIntegerField()),
+                ('tokens', models.FloatField()),
+                ('refilled_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='enrichmentjob',
+            name='priority',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Interactive'), (10, 'Background')], default=0),
+        ),
+        migrations.AddField(
+            model_name='enrichmentjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='priority',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Interactive'), (10, 'Background')], default=0),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
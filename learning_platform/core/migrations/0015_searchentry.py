@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-18 21:22
+
+import django.contrib.postgres.search
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_gin_index(apps, schema_editor):
+    # Only Postgres has tsvector/GIN; other databases use the in-process index
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX core_searchentry_vector_gin ON core_searchentry USING gin (search_vector)'
+        )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS core_searchentry_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_job_priority_apiquota'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('learning_path', 'Learning path'), ('module', 'Module'), ('question', 'Question')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField()),
+                ('body', models.TextField(blank=True)),
+                ('context', models.JSONField(blank=True, default=dict)),
+                ('deleted', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.2 on 2026-10-18 21:37
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def number_and_slug_existing_rows(apps, schema_editor):
+    # Positions follow the old id order; duplicate module names get -2, -3, ... slugs
+    LearningPath = apps.get_model('core', 'LearningPath')
+    Module = apps.get_model('core', 'Module')
+
+    paths = list(LearningPath.objects.order_by('course_id', 'id'))
+    for index, path in enumerate(paths):
+        same_course = index and paths[index - 1].course_id == path.course_id
+        path.position = paths[index - 1].position + 1 if same_course else 1
+    LearningPath.objects.bulk_update(paths, ['position'], batch_size=1000)
+
+    modules = list(Module.objects.order_by('learning_path_id', 'id'))
+    taken = set()
+    for index, module in enumerate(modules):
+        same_path = index and modules[index - 1].learning_path_id == module.learning_path_id
+        module.position = modules[index - 1].position + 1 if same_path else 1
+    for module in sorted(modules, key=lambda module: module.pk):
+        base = slugify(module.module_name)[:240] or 'module'
+        slug, suffix = base, 2
+        while slug in taken:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        taken.add(slug)
+        module.slug = slug
+    Module.objects.bulk_update(modules, ['position', 'slug'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_searchentry'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='learningpath',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='module',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='learningpath',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='slug',
+            field=models.SlugField(editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(number_and_slug_existing_rows, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='module',
+            name='slug',
+            field=models.SlugField(editable=False, max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='module',
+            name='module_name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='learningpath',
+            index=models.Index(fields=['course', 'position'], name='learningpath_course_position'),
+        ),
+        migrations.AddIndex(
+            model_name='module',
+            index=models.Index(fields=['learning_path', 'position'], name='module_path_position'),
+        ),
+    ]
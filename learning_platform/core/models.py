@@ -1,13 +1,16 @@
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model  # Import get_user_model
-from .services.youtube_service import get_youtube_videos
-from .services.blog_service import get_blog_posts
 from django.core.validators import EmailValidator
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.text import slugify
+from django.db.models import Max, Q
+import logging
 import math
 
+logger = logging.getLogger(__name__)
+
 
 # User model
 class User(AbstractUser):
@@ -37,52 +40,207 @@ class Course(models.Model):
     def __str__(self):
         return self.course_name
 
+def _next_position(siblings):
+    return (siblings.aggregate(last=Max('position'))['last'] or 0) + 1
+
+
 # LearningPath model
 class LearningPath(models.Model):
     path_name = models.CharField(max_length=255)
     course = models.ForeignKey(Course, related_name='learning_paths', on_delete=models.CASCADE)
+    # Order within the course; left at 0, a new path is placed after the existing ones
+    position = models.PositiveIntegerField(default=0)
     date_created = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(fields=['course', 'position'], name='learningpath_course_position'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.position:
+            self.position = _next_position(LearningPath.objects.filter(course_id=self.course_id))
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.path_name
 
-# Module model with auto-fetching for YouTube video and blog content
+# Inserts tried with a fresh slug when concurrent creates of same-named modules collide
+SLUG_ATTEMPTS = 5
+
+
+# Module model; YouTube video and blog content are fetched by the enrichment queue
 class Module(models.Model):
-    module_name = models.CharField(max_length=255)
+    ENRICHMENT_PENDING = 'pending'
+    ENRICHMENT_RUNNING = 'running'
+    ENRICHMENT_DONE = 'done'
+    ENRICHMENT_FAILED = 'failed'
+    ENRICHMENT_STATUS_CHOICES = [
+        (ENRICHMENT_PENDING, 'Pending'),
+        (ENRICHMENT_RUNNING, 'Running'),
+        (ENRICHMENT_DONE, 'Done'),
+        (ENRICHMENT_FAILED, 'Failed'),
+    ]
+
+    module_name = models.CharField(max_length=255, db_index=True)
+    # Set from the name when the module is created and kept when it is renamed
+    slug = models.SlugField(max_length=255, unique=True, editable=False)
     learning_path = models.ForeignKey(LearningPath, related_name='modules', on_delete=models.CASCADE)
+    # Order within the learning path; left at 0, a new module is placed after the existing ones
+    position = models.PositiveIntegerField(default=0)
     topic = models.CharField(max_length=255)
     video_link = models.CharField(max_length=500, blank=True)
     blog_link = models.CharField(max_length=500, blank=True)
+    enrichment_status = models.CharField(
+        max_length=20, choices=ENRICHMENT_STATUS_CHOICES, default=ENRICHMENT_PENDING, db_index=True
+    )
+    enriched_topic = models.CharField(max_length=255, blank=True)  # Topic the current links were fetched for
+    enriched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(fields=['learning_path', 'position'], name='module_path_position'),
+        ]
+
+    @property
+    def needs_enrichment(self):
+        return self.topic != self.enriched_topic
+
+    @staticmethod
+    def unique_slug(name, taken=()):
+        """
+        Slug for a module called `name`: the slugified name, with -2, -3, ... if it is taken
+        (or in `taken`).
+        """
+        base = slugify(name)[:240] or 'module'
+        taken = set(taken) | set(Module.objects.filter(slug__startswith=base).values_list('slug', flat=True))
+        slug, suffix = base, 2
+        while slug in taken:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        return slug
 
     def save(self, *args, **kwargs):
-        # Fetch potential YouTube videos for the module topic
-        youtube_videos = get_youtube_videos(self.topic)
-        if youtube_videos:
-            # Select the best video automatically
-            self.video_link = youtube_videos[0]['url']
-            
-            # Log all potential videos for manual review
-            print(f"Potential videos for '{self.topic}':")
-            for video in youtube_videos:
-                print(f"- {video['url']} ({video['title']})")
+        generated_slug = self._state.adding and not self.slug
+        if self._state.adding:
+            if not self.position:
+                self.position = _next_position(Module.objects.filter(learning_path_id=self.learning_path_id))
+            if generated_slug:
+                self.slug = Module.unique_slug(self.module_name)
+
+        # Only queue a content fetch when the topic actually changed
+        needs_enrichment = self.needs_enrichment
+        if needs_enrichment:
+            self.enrichment_status = Module.ENRICHMENT_PENDING
+
+        if generated_slug:
+            self._insert_with_unique_slug(*args, **kwargs)
         else:
-            print(f"No suitable videos found for topic '{self.topic}'.")
+            super(Module, self).save(*args, **kwargs)
+
+        if needs_enrichment:
+            from .services.enrichment_service import enqueue_enrichment
+            enqueue_enrichment(self)
+
+    def _insert_with_unique_slug(self, *args, **kwargs):
+        # A concurrent create can take the slug between the lookup and the insert; move on to the next one
+        lost = set()
+        for attempt in range(SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return super(Module, self).save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_ATTEMPTS - 1 or not Module.objects.filter(slug=self.slug).exists():
+                    raise
+                lost.add(self.slug)
+                self.slug = Module.unique_slug(self.module_name, lost)
 
-        # Fetch blog content
-        blog_post = get_blog_posts(self.topic)
-        if blog_post:
-            self.blog_link = blog_post['url']
+    def __str__(self):
+        return self.module_name
 
-        super(Module, self).save(*args, **kwargs)
+
+# Base model for jobs processed by the DB-backed worker queue (see services/job_queue.py)
+class BackgroundJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    # Lower runs first: user-facing work goes ahead of bulk/background work
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_BACKGROUND = 10
+    PRIORITY_CHOICES = [
+        (PRIORITY_INTERACTIVE, 'Interactive'),
+        (PRIORITY_BACKGROUND, 'Background'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    priority = models.PositiveSmallIntegerField(choices=PRIORITY_CHOICES, default=PRIORITY_INTERACTIVE)
+    run_after = models.DateTimeField(null=True, blank=True)  # Deferred jobs are not claimed before this
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+
+class EnrichmentJob(BackgroundJob):
+    module = models.ForeignKey(Module, related_name='enrichment_jobs', on_delete=models.CASCADE)
+    topic = models.CharField(max_length=255)
 
     def __str__(self):
-        return self.module_name
+        return f"Enrichment of {self.module_id} ({self.topic}) - {self.status}"
+
+
+class QuizGenerationJob(BackgroundJob):
+    ACTIVE_STATUSES = (BackgroundJob.STATUS_PENDING, BackgroundJob.STATUS_RUNNING)
+
+    module = models.ForeignKey(Module, related_name='quiz_generation_jobs', on_delete=models.CASCADE)
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    quiz = models.ForeignKey('Quiz', null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
+    reuse_existing = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            # Requests for a module that is already being generated share the in-flight job
+            models.UniqueConstraint(
+                fields=['module'], condition=models.Q(status__in=['pending', 'running']),
+                name='unique_active_quiz_job_per_module',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Quiz generation for {self.module_id} - {self.status}"
+
+
+# Token bucket for an external API's quota, shared by every process through the database
+# (see services/youtube_quota.py)
+class ApiQuota(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    capacity = models.PositiveIntegerField()
+    tokens = models.FloatField()
+    refilled_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.tokens:.0f}/{self.capacity}"
 
 # Quiz model
 class Quiz(models.Model):
     quiz_name = models.CharField(max_length=255)
     module = models.ForeignKey(Module, related_name='quizzes', on_delete=models.CASCADE)
     date_created = models.DateTimeField(default=timezone.now)
+    # Hash of the content, prompt and model a generated quiz came from (blank for hand-written quizzes)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
 
     def __str__(self):
         return self.quiz_name
@@ -104,7 +262,19 @@ class Answer(models.Model):
     def __str__(self):
         return self.answer_text
 
+def _lock_row(model, pk):
+    # Row lock held until the surrounding transaction ends; SQLite serializes writers by itself
+    if connection.features.has_select_for_update:
+        list(model.objects.select_for_update().filter(pk=pk).values_list('pk', flat=True))
+
+
 # Progress Tracking Models
+def _progress_changed(user_id):
+    # Progress rows are mostly written with update(), which sends no signals
+    from .services.dashboard_service import invalidate_dashboard
+    invalidate_dashboard(user_id)
+
+
 class ModuleProgress(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="module_progress")
     module = models.ForeignKey(Module, on_delete=models.CASCADE)
@@ -114,28 +284,38 @@ class ModuleProgress(models.Model):
     quiz_completed = models.BooleanField(default=False)
     score = models.FloatField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'module'], name='unique_module_progress_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'completed'], name='moduleprogress_user_done_idx'),
+        ]
+
     def calculate_progress(self):
         """Calculate module completion progress."""
-        self.completed = self.video_watched and self.quiz_completed
-        if self.completed:
-            self.completion_date = timezone.now()
-        else:
-            self.completion_date = None
+        with transaction.atomic():
+            self.completed = self.video_watched and self.quiz_completed
 
-        # Update the database to avoid recursion
-        ModuleProgress.objects.filter(pk=self.pk).update(
-            completed=self.completed,
-            completion_date=self.completion_date
-        )
-        print(f"[DEBUG] Module Progress Updated: {self.user.username} - {self.module.module_name} - Completed: {self.completed}")
+            completion_date = timezone.now() if self.completed else None
 
-        # Trigger learning path progress update
-        learning_path_progress = LearningPathProgress.objects.filter(
-            user=self.user, learning_path=self.module.learning_path
-        ).first()
-        if learning_path_progress:
-            print(f"[DEBUG] Triggering Learning Path Progress Update for {self.module.learning_path.path_name}")
-            learning_path_progress.calculate_progress()
+            # Only a row whose stored state actually flips counts towards the rollups
+            flipped = ModuleProgress.objects.filter(pk=self.pk).exclude(completed=self.completed).update(
+                completed=self.completed,
+                completion_date=completion_date
+            )
+            if flipped:
+                self.completion_date = completion_date
+            # Ids only: touching self.user/self.module here could cost a query per call
+            logger.debug(
+                "Module progress updated: user=%s module=%s completed=%s", self.user_id, self.module_id, self.completed
+            )
+
+            if flipped:
+                # Push the +1/-1 through the learning path and course counters
+                from .services.progress_service import apply_module_completion_delta
+                apply_module_completion_delta(self.user, self.module, 1 if self.completed else -1)
+        _progress_changed(self.user_id)
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -151,37 +331,60 @@ class LearningPathProgress(models.Model):
     completed = models.BooleanField(default=False)
     completion_date = models.DateTimeField(null=True, blank=True)
     progress_percentage = models.FloatField(default=0.0)
+    completed_modules = models.PositiveIntegerField(default=0)  # Maintained incrementally by progress_service
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'learning_path'], name='unique_path_progress_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'completed'], name='pathprogress_user_done_idx'),
+        ]
+
+    def recalculate(self):
+        """Recount completed modules from scratch (no course cascade)."""
+        with transaction.atomic():
+            _lock_row(LearningPathProgress, self.pk)
+            total_modules = self.learning_path.modules.count()
+            self.completed_modules = ModuleProgress.objects.filter(
+                user=self.user, module__learning_path=self.learning_path, completed=True
+            ).count()
+
+            logger.debug(
+                "Learning path %s: %s/%s modules completed", self.learning_path_id, self.completed_modules, total_modules
+            )
 
-    def calculate_progress(self):
-        """Calculate learning path progress based on completed modules."""
-        total_modules = self.learning_path.modules.count()
-        completed_modules = ModuleProgress.objects.filter(
-            user=self.user, module__learning_path=self.learning_path, completed=True
-        ).count()
-
-        print(f"[DEBUG] Learning Path: {self.learning_path.path_name} - Completed Modules: {completed_modules}/{total_modules}")
-
-        if total_modules > 0:
-            # Round progress percentage to the nearest whole number
-            self.progress_percentage = round((completed_modules / total_modules) * 100)
-            self.completed = self.progress_percentage == 100
-            self.completion_date = timezone.now() if self.completed else None
+            if total_modules > 0:
+                # Round progress percentage to the nearest whole number
+                self.progress_percentage = round((self.completed_modules / total_modules) * 100)
+                self.completed = self.progress_percentage == 100
+                self.completion_date = timezone.now() if self.completed else None
 
             # Update learning path progress
             LearningPathProgress.objects.filter(pk=self.pk).update(
+                completed_modules=self.completed_modules,
                 progress_percentage=self.progress_percentage,
                 completed=self.completed,
                 completion_date=self.completion_date
             )
-            print(f"[DEBUG] Learning Path Progress Updated: {self.progress_percentage}% - Completed: {self.completed}")
+        logger.debug(
+            "Learning path progress updated: user=%s path=%s %s%% completed=%s",
+            self.user_id, self.learning_path_id, self.progress_percentage, self.completed,
+        )
+        _progress_changed(self.user_id)
+
+    def calculate_progress(self):
+        """Calculate learning path progress based on completed modules."""
+        self.recalculate()
 
         # Trigger course progress update
         course_progress, created = CourseProgress.objects.get_or_create(
             user=self.user, course=self.learning_path.course
         )
         if created:
-            print(f"[DEBUG] Created new Course Progress for {self.learning_path.course.course_name}")
-        course_progress.calculate_progress()
+            logger.debug("Created course progress: user=%s course=%s", self.user_id, course_progress.course_id)
+        else:
+            course_progress.calculate_progress()
 
     def save(self, *args, **kwargs):
         """Override save to calculate progress after updates."""
@@ -199,41 +402,51 @@ class CourseProgress(models.Model):
     completed = models.BooleanField(default=False)
     completion_date = models.DateTimeField(null=True, blank=True)
     progress_percentage = models.FloatField(default=0.0)
+    # Running totals over the course's learning paths, maintained incrementally by progress_service
+    completed_learning_paths = models.PositiveIntegerField(default=0)
+    path_progress_total = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'course'], name='unique_course_progress_per_user'),
+        ]
 
     def calculate_progress(self):
         """Calculate course progress based on completed learning paths."""
-        total_learning_paths = self.course.learning_paths.count()
-        completed_learning_paths = 0
-        total_progress = 0
-
-        for learning_path in self.course.learning_paths.all():
-            # Get the progress for each learning path
-            learning_path_progress = LearningPathProgress.objects.filter(
-                learning_path=learning_path, user=self.user
-            ).first()
+        with transaction.atomic():
+            _lock_row(CourseProgress, self.pk)
+            total_learning_paths = self.course.learning_paths.count()
+
+            # Learning paths without progress count as 0%
+            totals = LearningPathProgress.objects.filter(
+                user=self.user, learning_path__course=self.course
+            ).aggregate(
+                total_progress=models.Sum('progress_percentage'),
+                completed_learning_paths=models.Count('id', filter=Q(completed=True)),
+            )
+            self.path_progress_total = totals['total_progress'] or 0.0
+            self.completed_learning_paths = totals['completed_learning_paths']
+
+            # Calculate overall course progress
+            if total_learning_paths > 0:
+                self.progress_percentage = round(self.path_progress_total / total_learning_paths)
+                self.completed = self.progress_percentage == 100
+                self.completion_date = timezone.now() if self.completed else None
+
+            # Save the course progress after calculating
+            CourseProgress.objects.filter(pk=self.pk).update(
+                path_progress_total=self.path_progress_total,
+                completed_learning_paths=self.completed_learning_paths,
+                progress_percentage=self.progress_percentage,
+                completed=self.completed,
+                completion_date=self.completion_date
+            )
 
-            if learning_path_progress:
-                total_progress += learning_path_progress.progress_percentage
-                if learning_path_progress.completed:
-                    completed_learning_paths += 1
-            else:
-                # If no progress is found for this learning path, handle appropriately (e.g., default to 0%)
-                total_progress += 0
-
-        # Calculate overall course progress
-        if total_learning_paths > 0:
-            self.progress_percentage = round(total_progress / total_learning_paths)
-            self.completed = self.progress_percentage == 100
-            self.completion_date = timezone.now() if self.completed else None
-
-        # Save the course progress after calculating
-        CourseProgress.objects.filter(pk=self.pk).update(
-            progress_percentage=self.progress_percentage,
-            completed=self.completed,
-            completion_date=self.completion_date
+        logger.debug(
+            "Course progress updated: user=%s course=%s %s%% completed=%s",
+            self.user_id, self.course_id, self.progress_percentage, self.completed,
         )
-
-        print(f"[DEBUG] Course Progress Updated: {self.progress_percentage}% - Completed: {self.completed}")
+        _progress_changed(self.user_id)
         
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -252,26 +465,115 @@ class QuizProgress(models.Model):
     completed = models.BooleanField(default=False)
     completion_date = models.DateTimeField(null=True, blank=True)
 
-    def calculate_progress(self):
-        self.completed = self.score >= 70.0  # Passing score of 70%
-        if self.completed:
-            self.completion_date = timezone.now()
-        else:
-            self.completion_date = None
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'quiz'], name='unique_quiz_progress_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'completed'], name='quizprogress_user_done_idx'),
+        ]
 
-        # Use `update` instead of `save` to avoid recursion
-        QuizProgress.objects.filter(pk=self.pk).update(
-            completed=self.completed,
-            completion_date=self.completion_date
-        )
+    def calculate_progress(self):
+        with transaction.atomic():
+            self.completed = self.score >= 70.0  # Passing score of 70%
+            if self.completed:
+                self.completion_date = timezone.now()
+            else:
+                self.completion_date = None
 
-        # Update module progress when quiz is passed
-        module_progress = ModuleProgress.objects.filter(user=self.user, module=self.quiz.module).first()
-        if module_progress:
-            module_progress.quiz_completed = self.completed
-            module_progress.calculate_progress()
+            # Use `update` instead of `save` to avoid recursion
+            QuizProgress.objects.filter(pk=self.pk).update(
+                completed=self.completed,
+                completion_date=self.completion_date
+            )
 
+            # Update module progress when quiz is passed
+            module_progress = ModuleProgress.objects.select_for_update().filter(
+                user=self.user, module_id=self.quiz.module_id
+            ).first()
+            if module_progress:
+                module_progress.quiz_completed = self.completed
+                ModuleProgress.objects.filter(pk=module_progress.pk).update(quiz_completed=self.completed)
+                module_progress.calculate_progress()
 
     def __str__(self):
         return f"{self.user.username} - {self.quiz.quiz_name} - {'Completed' if self.completed else 'In Progress'}"
-    
+
+
+# Per-question outcome of each quiz submission, kept for analytics
+class QuestionResponse(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="question_responses")
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="responses")
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="responses")
+    answer = models.ForeignKey(Answer, on_delete=models.SET_NULL, null=True, blank=True, related_name="responses")
+    is_correct = models.BooleanField(default=False)
+    submitted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'is_correct']),
+            models.Index(fields=['user', 'quiz', 'submitted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - Q{self.question_id} - {'Correct' if self.is_correct else 'Incorrect'}"
+
+
+# Client-reported progress events received through the batch endpoint; the key makes retries idempotent
+class ProgressEvent(models.Model):
+    VIDEO_WATCHED = 'video_watched'
+    QUIZ_SUBMITTED = 'quiz_submitted'
+    TYPE_CHOICES = [
+        (VIDEO_WATCHED, 'Video watched'),
+        (QUIZ_SUBMITTED, 'Quiz submitted'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="progress_events")
+    idempotency_key = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, null=True, blank=True, related_name="progress_events")
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, null=True, blank=True, related_name="progress_events")
+    client_timestamp = models.DateTimeField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    result = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'], name='unique_progress_event_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.event_type} - {self.idempotency_key}"
+
+
+# One row per searchable catalog object, kept in sync by core/signals.py (see services/search_index.py)
+class SearchEntry(models.Model):
+    KIND_COURSE = 'course'
+    KIND_LEARNING_PATH = 'learning_path'
+    KIND_MODULE = 'module'
+    KIND_QUESTION = 'question'
+    KIND_CHOICES = [
+        (KIND_COURSE, 'Course'),
+        (KIND_LEARNING_PATH, 'Learning path'),
+        (KIND_MODULE, 'Module'),
+        (KIND_QUESTION, 'Question'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField()
+    body = models.TextField(blank=True)
+    context = models.JSONField(default=dict, blank=True)  # Ids of the parent objects, returned with hits
+    # Deleted objects are kept as tombstones so other processes' in-memory indexes drop them too
+    deleted = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # Postgres only: weighted tsvector of title and body, with a GIN index (migration 0015)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title[:50]}"
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the primary key, which every model has and which never changes.
+    Cost stays proportional to the page size, not the table size.
+    """
+    ordering = 'id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PositionPagination(PageNumberPagination):
+    """
+    Page-number pagination in the explicit `position` order of learning paths and modules
+    (the models' default ordering, with the id breaking ties). Not a cursor: positions restart
+    in every course and path, and a cursor on a non-unique leading field skips and repeats
+    rows once more than a page shares one position.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
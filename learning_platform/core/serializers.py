@@ -1,6 +1,44 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import User, Course, LearningPath, Module, Quiz, Answer, Question, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress
+from .models import User, Course, LearningPath, Module, Quiz, Answer, Question, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress, QuizGenerationJob
+
+
+def get_query_list(request, param):
+    """Parse a comma-separated query parameter such as `?expand=quizzes,questions`."""
+    if request is None:
+        return set()
+    return {value.strip() for value in request.query_params.get(param, '').split(',') if value.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and opt-in nesting for top-level serializers:
+    `?fields=id,module_name` limits the output to those fields, and fields listed in
+    `Meta.expandable_fields` are left out of list responses unless named in `?expand=`.
+    """
+
+    def _is_top_level(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not self._is_top_level():
+            return fields
+
+        if isinstance(self.parent, serializers.ListSerializer):
+            expand = get_query_list(request, 'expand')
+            for field_name in getattr(self.Meta, 'expandable_fields', ()):
+                if field_name not in expand:
+                    fields.pop(field_name, None)
+
+        requested = get_query_list(request, 'fields')
+        if requested:
+            for field_name in set(fields) - requested:
+                fields.pop(field_name)
+        return fields
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,15 +59,15 @@ class UserSerializer(serializers.ModelSerializer):
         )
         return user
 
-class LearningPathSerializer(serializers.ModelSerializer):
+class LearningPathSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     modules = serializers.StringRelatedField(many=True)
 
     class Meta:
         model = LearningPath
-        fields = ['id','path_name', 'modules']
+        fields = ['id', 'path_name', 'position', 'modules']
         
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     learning_paths = LearningPathSerializer(many=True)  #nested serializer here
 
     class Meta:
@@ -49,19 +87,24 @@ class QuestionSerializer(serializers.ModelSerializer):
         model = Question
         fields = ['id', 'question_text', 'answers']
 
-class QuizSerializer(serializers.ModelSerializer):
+class QuizSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     questions = QuestionSerializer(many=True)
 
     class Meta:
         model = Quiz
         fields = ['id', 'quiz_name', 'questions']
+        expandable_fields = ['questions']
 
-class ModuleSerializer(serializers.ModelSerializer):
+class ModuleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     quizzes = QuizSerializer(many=True, read_only=True)  # Include quiz data
 
     class Meta:
         model = Module
-        fields = ['id', 'module_name', 'topic', 'video_link', 'blog_link', 'quizzes']
+        fields = [
+            'id', 'module_name', 'slug', 'position', 'topic', 'video_link', 'blog_link', 'enrichment_status', 'quizzes',
+        ]
+        read_only_fields = ['enrichment_status']
+        expandable_fields = ['quizzes']
 
 class ModuleProgressSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField()
@@ -116,4 +159,15 @@ class CourseProgressSerializer(serializers.ModelSerializer):
         progress_data = LearningPathProgress.objects.filter(
             user=obj.user, learning_path__in=learning_paths
         )
-        return LearningPathProgressSerializer(progress_data, many=True).data
\ No newline at end of file
+        return LearningPathProgressSerializer(progress_data, many=True).data
+
+
+class QuizGenerationJobSerializer(serializers.ModelSerializer):
+    error = serializers.CharField(source='last_error')
+
+    class Meta:
+        model = QuizGenerationJob
+        fields = [
+            'id', 'module', 'status', 'attempts', 'reuse_existing', 'quiz', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import re
+import threading
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'api'
+
+# Seconds to keep each kind of response; override with settings.API_CACHE_TTLS
+DEFAULT_TTLS = {
+    'youtube_search': 60 * 60 * 24,
+    'blog_search': 60 * 60 * 24,
+    'video_transcript': 60 * 60 * 24 * 30,
+    'video_description': 60 * 60 * 24 * 7,
+    'generated_quiz': 60 * 60 * 24 * 90,
+    'negative': 60 * 60 * 6,  # "Nothing found" results, retried sooner
+}
+
+# Stored in place of a value when the upstream definitively had nothing
+_NEGATIVE = '__api_cache_negative__'
+_MISSING = object()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def normalize_topic(topic):
+    """
+    Normalize a search topic so trivially different spellings share a cache entry.
+    """
+    return re.sub(r'\s+', ' ', (topic or '').strip().lower())
+
+
+def make_key(source, identifier):
+    digest = hashlib.sha1(str(identifier).encode('utf-8')).hexdigest()
+    return f"{source}:{digest}"
+
+
+def get_ttl(source):
+    ttls = {**DEFAULT_TTLS, **getattr(settings, 'API_CACHE_TTLS', {})}
+    return ttls.get(source, ttls['negative'])
+
+
+def _get_cache():
+    # Services are also used outside Django (scripts, plain unit tests); skip caching there
+    if not settings.configured:
+        return None
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return None
+
+
+def _record(source, outcome):
+    with _stats_lock:
+        counters = _stats.setdefault(source, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters per source for this process.
+    """
+    with _stats_lock:
+        return {source: dict(counters) for source, counters in _stats.items()}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def lookup(source, identifier):
+    """
+    Return (found, value) for a cached entry. A negative entry is returned as (True, None).
+    """
+    cache = _get_cache()
+    if cache is None:
+        return False, None
+    try:
+        value = cache.get(make_key(source, identifier), _MISSING)
+    except Exception as e:
+        # A broken cache backend must never break the fetch path
+        logger.warning("API cache read failed for %s: %s", source, e)
+        value = _MISSING
+
+    if value is _MISSING:
+        _record(source, 'misses')
+        return False, None
+    _record(source, 'hits')
+    return True, None if value == _NEGATIVE else value
+
+
+def store(source, identifier, value, negative=False):
+    """
+    Cache a value. `negative=True` caches an empty result with the shorter negative TTL.
+    """
+    cache = _get_cache()
+    if cache is None:
+        return
+    ttl = get_ttl('negative' if negative else source)
+    try:
+        cache.set(make_key(source, identifier), _NEGATIVE if negative else value, ttl)
+    except Exception as e:
+        logger.warning("API cache write failed for %s: %s", source, e)
+
+
+def cached_call(source, identifier, fetch, is_negative=lambda value: not value):
+    """
+    Return the cached value for (source, identifier), calling `fetch()` on a miss.
+    Exceptions from `fetch` propagate and are not cached; empty results are cached
+    as negative entries.
+    """
+    found, value = lookup(source, identifier)
+    if found:
+        return value
+    value = fetch()
+    store(source, identifier, value, negative=is_negative(value))
+    return value
+
+
+def clear():
+    cache = _get_cache()
+    if cache is not None:
+        cache.clear()
@@ -1,46 +1,103 @@
 from dotenv import load_dotenv
+import logging
 import os
+import threading
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from . import api_cache
+from .circuit_breaker import get_breaker
+from ..metrics import track_external
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
+SERPAPI_URL = "https://serpapi.com/search"
+
+# (connect, read) seconds; with the retries below a search gives up after roughly 35s at worst
+REQUEST_TIMEOUT = (3.05, 10)
+MAX_RETRIES = 2
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Process-wide requests.Session, so searches reuse pooled keep-alive connections.
+    Idempotent requests are retried with exponential backoff on connection errors, 429 and 5xx.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=MAX_RETRIES, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET']), raise_on_status=False,
+                )
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_maxsize=10, max_retries=retry))
+                session.mount('http://', HTTPAdapter(pool_maxsize=10, max_retries=retry))
+                _session = session
+    return _session
+
+def _search_blog_posts(topic):
+    """
+    Query SerpAPI for the best learning resource. Raises on request errors.
+    """
+    # Adjust query for learning-focused results
+    params = {
+        "engine": "google",
+        "q": f"{topic} tutorial",
+        "hl": "en",
+        "num": 3,  # Get a few results to filter for relevance
+        "api_key": SERPAPI_KEY
+    }
+    with track_external('serpapi'):
+        response = get_session().get(
+            getattr(settings, 'SERPAPI_URL', SERPAPI_URL), params=params, timeout=REQUEST_TIMEOUT
+        )
+    response.raise_for_status()  # Raises HTTPError for bad responses
+
+    search_results = response.json()
+    # Filter for the best learning resource
+    if 'organic_results' in search_results and search_results['organic_results']:
+        for result in search_results['organic_results']:
+            # Search for pages that mention structured learning (course or tutorial terms)
+            if any(term in result['title'].lower() for term in ["tutorial", "course", "learn"]):
+                return {
+                    "title": result["title"],
+                    "url": result["link"]
+                }
+        # Fallback to the first link if no specific learning term is found
+        best_result = search_results['organic_results'][0]
+        return {
+            "title": best_result["title"],
+            "url": best_result["link"]
+        }
+    logger.info("No learning resources found for %r", topic)
+    return None
+
+
+def search_blog_posts(topic):
+    """
+    Cached blog search that raises on failure (CircuitOpenError while SerpAPI keeps failing).
+    """
+    return api_cache.cached_call(
+        'blog_search', api_cache.normalize_topic(topic),
+        lambda: get_breaker('serpapi').call(_search_blog_posts, topic),
+    )
+
 
 def get_blog_posts(topic):
     try:
-        # Adjust query for learning-focused results
-        params = {
-            "engine": "google",
-            "q": f"{topic} tutorial",
-            "hl": "en",
-            "num": 3,  # Get a few results to filter for relevance
-            "api_key": SERPAPI_KEY
-        }
-        response = requests.get("https://serpapi.com/search", params=params)
-        response.raise_for_status()  # Raises HTTPError for bad responses
-
-        search_results = response.json()
-        # Filter for the best learning resource
-        if 'organic_results' in search_results and search_results['organic_results']:
-            for result in search_results['organic_results']:
-                # Search for pages that mention structured learning (course or tutorial terms)
-                if any(term in result['title'].lower() for term in ["tutorial", "course", "learn"]):
-                    return {
-                        "title": result["title"],
-                        "url": result["link"]
-                    }
-            # Fallback to the first link if no specific learning term is found
-            best_result = search_results['organic_results'][0]
-            return {
-                "title": best_result["title"],
-                "url": best_result["link"]
-            }
-        else:
-            print("No learning resources found.")
-            return None
+        return search_blog_posts(topic)
     except requests.exceptions.HTTPError as err:
-        print(f"HTTP error occurred: {err}")
+        logger.warning("HTTP error searching blog posts for %r: %s", topic, err)
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.exception("Error searching blog posts for %r", topic)
     return None
 
 # # Test the function with a sample topic
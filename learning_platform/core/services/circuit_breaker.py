@@ -0,0 +1,109 @@
+"""
+Per-process circuit breakers for external APIs.
+
+After `failure_threshold` consecutive failures a breaker opens and calls fail
+fast with CircuitOpenError instead of waiting on a dead upstream. Once
+`reset_timeout` seconds have passed, one trial call is let through: success
+closes the breaker, failure opens it again.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                # Let one trial call through; others keep failing fast until it reports back
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def is_open(self):
+        """
+        Whether calls would fail fast right now. Unlike allow(), never starts the trial call.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                return self.clock() - self.opened_at < self.reset_timeout
+            return self.state == HALF_OPEN
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit %s closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning("Circuit %s opened after %d failure(s)", self.name, self.failures)
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run `func` through the breaker. Raises CircuitOpenError without calling it while open.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """
+    The process-wide breaker for an upstream, configured from settings.CIRCUIT_BREAKER.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            options = getattr(settings, 'CIRCUIT_BREAKER', {})
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=options.get('failure_threshold', 5),
+                reset_timeout=options.get('reset_timeout', 60.0),
+            )
+        return breaker
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
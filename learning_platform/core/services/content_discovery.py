@@ -0,0 +1,85 @@
+"""
+Query every content source for a topic at once.
+
+Each source runs on a shared thread pool and gets its own deadline
+(settings.DISCOVERY_DEADLINES, seconds). A source that misses it is reported
+as timed out and the others are returned without waiting; the late call keeps
+running in the background, bounded by its HTTP timeouts, and its outcome still
+feeds the source's circuit breaker.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.db import connections
+
+from .blog_service import search_blog_posts
+from .circuit_breaker import CircuitOpenError
+from .youtube_quota import QuotaExceeded
+from .youtube_service import get_youtube_videos
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINES = {'youtube': 15.0, 'blog': 10.0}
+MAX_WORKERS = 8
+
+SOURCES = {
+    'youtube': lambda topic: get_youtube_videos(topic, raise_errors=True),
+    'blog': search_blog_posts,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='discovery')
+    return _executor
+
+
+def _run(fetch, topic):
+    try:
+        return fetch(topic)
+    finally:
+        # Pool threads open their own connections (the api cache may be database-backed)
+        connections.close_all()
+
+
+def discover_content(topic, sources=None):
+    """
+    Search every source for `topic` concurrently.
+    Returns {'results': {source: result},
+             'errors': {source: 'timeout' | 'circuit_open' | 'quota_exceeded' | message}}.
+    """
+    sources = sources or SOURCES
+    deadlines = {**DEFAULT_DEADLINES, **getattr(settings, 'DISCOVERY_DEADLINES', {})}
+    executor = _get_executor()
+
+    started = time.monotonic()
+    futures = {name: executor.submit(_run, fetch, topic) for name, fetch in sources.items()}
+
+    results, errors = {}, {}
+    for name, future in futures.items():
+        remaining = started + deadlines.get(name, max(DEFAULT_DEADLINES.values())) - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(0, remaining))
+        except TimeoutError:
+            logger.warning("Content source %s missed its deadline for %r", name, topic)
+            errors[name] = 'timeout'
+        except CircuitOpenError:
+            errors[name] = 'circuit_open'
+        except QuotaExceeded:
+            errors[name] = 'quota_exceeded'
+        except Exception as e:
+            logger.warning("Content source %s failed for %r: %s", name, topic, e)
+            errors[name] = str(e) or type(e).__name__
+    logger.debug(
+        "Discovered content for %r in %.2fs (errors: %s)", topic, time.monotonic() - started, errors or None
+    )
+    return {'results': results, 'errors': errors}
@@ -0,0 +1,152 @@
+"""
+Per-user progress dashboard.
+
+All of a user's course, learning path and module progress is loaded with
+three queries, grouped in Python and cached in the 'shared' cache. Cached
+dashboards are keyed by a per-user generation token, replaced once a change to
+the user's progress, or to the name of a course, learning path or module they
+have progress in, commits (see core/signals.py). As with compiled quizzes, a
+reader that built the dashboard from the old rows while the change was in
+flight stores it under the old generation, where no one looks any more.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+
+from ..models import CourseProgress, LearningPathProgress, ModuleProgress
+
+CACHE_ALIAS = 'shared'
+# Entries of old generations are never read again; the TTL lets them expire
+DASHBOARD_TTL = 60 * 60
+
+
+def _generation_key(user_id):
+    return f"dashboard:generation:{user_id}"
+
+
+def _key(user_id, generation):
+    return f"dashboard:{user_id}:{generation}"
+
+
+def _generation(user_id):
+    cache = caches[CACHE_ALIAS]
+    generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        cache.add(_generation_key(user_id), uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_generation_key(user_id))
+    return generation
+
+
+def build_dashboard(user):
+    """
+    Load and group the user's progress. Always runs exactly three queries.
+    """
+    course_rows = CourseProgress.objects.filter(user=user).select_related('course').order_by('course_id')
+    path_rows = LearningPathProgress.objects.filter(user=user).select_related('learning_path').order_by(
+        'learning_path_id'
+    )
+    module_rows = ModuleProgress.objects.filter(user=user).order_by('module_id').values(
+        'module_id', 'module__module_name', 'module__learning_path_id',
+        'completed', 'completion_date', 'video_watched', 'quiz_completed', 'score',
+    )
+
+    modules_by_path = {}
+    for row in module_rows:
+        modules_by_path.setdefault(row['module__learning_path_id'], []).append({
+            'module_id': row['module_id'],
+            'module_name': row['module__module_name'],
+            'completed': row['completed'],
+            'completion_date': row['completion_date'],
+            'video_watched': row['video_watched'],
+            'quiz_completed': row['quiz_completed'],
+            'score': row['score'],
+        })
+
+    paths_by_course = {}
+    for path_progress in path_rows:
+        learning_path = path_progress.learning_path
+        paths_by_course.setdefault(learning_path.course_id, []).append({
+            'id': path_progress.pk,
+            'learning_path': learning_path.pk,
+            'learning_path_name': learning_path.path_name,
+            'completed': path_progress.completed,
+            'completion_date': path_progress.completion_date,
+            'progress_percentage': path_progress.progress_percentage,
+            'completed_modules': path_progress.completed_modules,
+            'modules': modules_by_path.get(learning_path.pk, []),
+        })
+
+    courses = []
+    for course_progress in course_rows:
+        courses.append({
+            'id': course_progress.pk,
+            'course_id': course_progress.course_id,
+            'course_name': course_progress.course.course_name,
+            'completed': course_progress.completed,
+            'completion_date': course_progress.completion_date,
+            'progress_percentage': course_progress.progress_percentage,
+            'learning_paths': paths_by_course.get(course_progress.course_id, []),
+        })
+    return {'courses': courses}
+
+
+def get_dashboard(user):
+    """
+    Return the user's dashboard from the cache, building it on a miss.
+    """
+    cache = caches[CACHE_ALIAS]
+    # Read the generation before the rows, so a change committed meanwhile moves readers past this copy
+    key = _key(user.pk, _generation(user.pk))
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(user)
+        cache.add(key, dashboard, DASHBOARD_TTL)
+    return dashboard
+
+
+def invalidate_dashboard(user_id):
+    """
+    Start a new dashboard generation for the user once the current transaction commits.
+    """
+    invalidate_dashboards([user_id])
+
+
+def invalidate_dashboards(user_ids):
+    """
+    Start a new dashboard generation for each of the users once the current transaction commits.
+    """
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: caches[CACHE_ALIAS].set_many(
+            {_generation_key(user_id): uuid.uuid4().hex for user_id in user_ids}, timeout=None
+        ))
+
+
+def profile_progress_data(user, dashboard):
+    """
+    Flatten a dashboard into the legacy `progress_data` shape of the user profile
+    (one entry per course, as CourseProgressSerializer used to produce).
+    """
+    return [
+        {
+            'id': course['id'],
+            'user': user.username,
+            'course': course['course_name'],
+            'completed': course['completed'],
+            'completion_date': course['completion_date'],
+            'progress_percentage': course['progress_percentage'],
+            'learning_path_progress': [
+                {
+                    'id': path['id'],
+                    'learning_path': path['learning_path'],
+                    'learning_path_name': path['learning_path_name'],
+                    'completed': path['completed'],
+                    'completion_date': path['completion_date'],
+                    'progress_percentage': path['progress_percentage'],
+                }
+                for path in course['learning_paths']
+            ],
+        }
+        for course in dashboard['courses']
+    ]
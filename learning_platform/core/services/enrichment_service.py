@@ -0,0 +1,141 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import EnrichmentJob, Module
+from . import youtube_quota
+from .youtube_service import get_youtube_videos, search_quota_cost
+from .blog_service import get_blog_posts
+from .content_discovery import discover_content
+from .job_queue import MAX_ATTEMPTS, DeferJob, drain_queue, run_job
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_enrichment(module, priority=EnrichmentJob.PRIORITY_INTERACTIVE):
+    """
+    Queue a video/blog fetch for the module's current topic.
+    A module has at most one pending job; re-queuing just retargets it to the new topic,
+    and raises its priority if the new request is more urgent.
+    """
+    job = EnrichmentJob.objects.filter(module=module, status=EnrichmentJob.STATUS_PENDING).first()
+    if job:
+        update_fields = []
+        if job.topic != module.topic:
+            job.topic = module.topic
+            update_fields.append('topic')
+        if priority < job.priority:
+            # A deferral was worked out for the old priority
+            job.priority, job.run_after = priority, None
+            update_fields += ['priority', 'run_after']
+        if update_fields:
+            job.save(update_fields=update_fields)
+    else:
+        job = EnrichmentJob.objects.create(module=module, topic=module.topic, priority=priority)
+
+    if getattr(settings, 'ENRICHMENT_INLINE', False):
+        # Local development without a worker process: run once the save has committed
+        transaction.on_commit(lambda: process_enrichment_job(job.pk))
+    return job
+
+
+def _discovery_sources(priority):
+    return {
+        'youtube': lambda topic: get_youtube_videos(topic, raise_errors=True, priority=priority),
+        # A blog link is optional: failures come back as None instead of failing the job
+        'blog': get_blog_posts,
+    }
+
+
+def _quota_wait(job):
+    return youtube_quota.wait_time(search_quota_cost(1), job.priority)
+
+
+def enrich_module(job):
+    """
+    Fetch video and blog candidates for the job's topic (concurrently, each within its deadline)
+    and store the best ones on the module. Raises if the video search failed, so the job is retried,
+    or DeferJob while the YouTube quota can't cover the job's priority.
+    """
+    wait = _quota_wait(job)
+    if wait:
+        raise DeferJob(wait, "YouTube quota too low")
+    Module.objects.filter(pk=job.module_id).update(enrichment_status=Module.ENRICHMENT_RUNNING)
+
+    discovered = discover_content(job.topic, sources=_discovery_sources(job.priority))
+    if discovered['errors'].get('youtube') == 'quota_exceeded':
+        # Another process spent it since the check above
+        raise DeferJob(_quota_wait(job), "YouTube quota too low")
+    if 'youtube' in discovered['errors']:
+        raise RuntimeError(f"YouTube search failed: {discovered['errors']['youtube']}")
+
+    updates = {
+        'enrichment_status': Module.ENRICHMENT_DONE,
+        'enriched_topic': job.topic,
+        'enriched_at': timezone.now(),
+    }
+
+    youtube_videos = discovered['results']['youtube']
+    if youtube_videos:
+        # Select the best video automatically
+        updates['video_link'] = youtube_videos[0]['url']
+        logger.info("Potential videos for '%s': %s", job.topic, [video['url'] for video in youtube_videos])
+    else:
+        logger.info("No suitable videos found for topic '%s'.", job.topic)
+
+    blog_post = discovered['results'].get('blog')
+    if blog_post:
+        updates['blog_link'] = blog_post['url']
+
+    # Skip the write if the topic changed while we were fetching; a newer job covers it
+    Module.objects.filter(pk=job.module_id, topic=job.topic).update(**updates)
+
+
+def _enrich_or_mark_failed(job):
+    try:
+        enrich_module(job)
+    except DeferJob:
+        Module.objects.filter(pk=job.module_id, topic=job.topic).update(enrichment_status=Module.ENRICHMENT_PENDING)
+        raise
+    except Exception:
+        retrying = job.attempts < MAX_ATTEMPTS
+        Module.objects.filter(pk=job.module_id, topic=job.topic).update(
+            enrichment_status=Module.ENRICHMENT_PENDING if retrying else Module.ENRICHMENT_FAILED
+        )
+        raise
+
+
+def process_enrichment_job(job_id):
+    """
+    Run a single job immediately (used for inline mode).
+    """
+    updated = EnrichmentJob.objects.filter(pk=job_id, status=EnrichmentJob.STATUS_PENDING).update(
+        status=EnrichmentJob.STATUS_RUNNING, started_at=timezone.now(), attempts=F('attempts') + 1
+    )
+    if not updated:
+        return None  # Already picked up by a worker
+    job = EnrichmentJob.objects.get(pk=job_id)
+    return run_job(job, _enrich_or_mark_failed)
+
+
+def drain_enrichment_queue(limit=None):
+    """
+    Process pending enrichment jobs. Returns a dict of outcome counts.
+    """
+    return drain_queue(EnrichmentJob, _enrich_or_mark_failed, limit=limit)
+
+
+def requeue_modules(modules, priority=EnrichmentJob.PRIORITY_BACKGROUND):
+    """
+    Force re-enrichment of the given modules, even if their topic has not changed.
+    Runs behind interactive saves and only while the YouTube quota is above its reserve.
+    """
+    count = 0
+    for module in modules:
+        Module.objects.filter(pk=module.pk).update(enrichment_status=Module.ENRICHMENT_PENDING)
+        enqueue_enrichment(module, priority=priority)
+        count += 1
+    return count
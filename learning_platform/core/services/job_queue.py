@@ -0,0 +1,160 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import connection, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Seconds before retrying a failed job, doubled after each further failed attempt
+RETRY_BACKOFF = 30
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before the next run of a job that has failed `attempts` times.
+    """
+    return RETRY_BACKOFF * 2 ** (attempts - 1)
+
+
+class DeferJob(Exception):
+    """
+    Raised by a handler to put its job back on the queue until `delay` seconds have passed,
+    without counting the run as an attempt (e.g. while an API quota is exhausted).
+    """
+
+    def __init__(self, delay, reason=''):
+        super().__init__(reason)
+        self.delay = delay
+
+
+def claim_next_job(job_model, queryset=None):
+    """
+    Atomically move the next pending job to 'running' and return it: the most urgent priority
+    first, oldest first within a priority, skipping jobs deferred to later.
+    Returns None when the queue is empty. Safe to call from several worker processes.
+    """
+    queryset = queryset if queryset is not None else job_model.objects.all()
+    while True:
+        with transaction.atomic():
+            pending = queryset.filter(
+                Q(run_after__isnull=True) | Q(run_after__lte=timezone.now()), status=job_model.STATUS_PENDING
+            ).order_by('priority', 'created_at', 'id')
+            if connection.features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            job = pending.first()
+            if job is None:
+                return None
+
+            # Without row locks another worker may have read the same job; only one update wins
+            started_at = timezone.now()
+            claimed = job_model.objects.filter(pk=job.pk, status=job_model.STATUS_PENDING).update(
+                status=job_model.STATUS_RUNNING, attempts=F('attempts') + 1, started_at=started_at
+            )
+        if claimed:
+            job.status = job_model.STATUS_RUNNING
+            job.attempts += 1
+            job.started_at = started_at
+            return job
+
+
+def run_job(job, handler, max_attempts=MAX_ATTEMPTS):
+    """
+    Run a claimed job with the given handler and record the outcome.
+    Failed jobs go back to pending, not to be claimed again until retry_delay() has passed,
+    until they run out of attempts; deferred ones go back to pending with `run_after` set.
+    """
+    update_fields = ['status', 'last_error', 'finished_at']
+    try:
+        handler(job)
+    except DeferJob as e:
+        logger.info("Deferring %s %s for %.0fs: %s", type(job).__name__, job.pk, e.delay, e)
+        job.status = job.STATUS_PENDING
+        job.run_after = timezone.now() + timedelta(seconds=e.delay)
+        job.attempts -= 1  # This run does not count
+        job.last_error = str(e)
+        job.finished_at = None
+        update_fields += ['run_after', 'attempts']
+    except Exception as e:
+        logger.exception("Job %s %s failed", type(job).__name__, job.pk)
+        job.last_error = str(e)
+        if job.attempts < max_attempts:
+            job.status = job.STATUS_PENDING
+            job.run_after = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            job.finished_at = None
+            update_fields.append('run_after')
+        else:
+            job.status = job.STATUS_FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.last_error = ''
+        job.status = job.STATUS_DONE
+        job.finished_at = timezone.now()
+    job.save(update_fields=update_fields)
+    return job.status
+
+
+def drain_queue(job_model, handler, limit=None, queryset=None):
+    """
+    Process pending jobs until the queue is empty or `limit` jobs have run.
+    Returns a dict of outcome counts.
+    """
+    counts = {job_model.STATUS_DONE: 0, job_model.STATUS_PENDING: 0, job_model.STATUS_FAILED: 0}
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job(job_model, queryset=queryset)
+        if job is None:
+            break
+        counts[run_job(job, handler)] += 1
+        processed += 1
+    return counts
+
+
+def drain_queue_concurrently(job_model, handler, workers, limit=None, queryset=None):
+    """
+    drain_queue() with up to `workers` jobs running at once on a thread pool, for I/O-bound handlers.
+    Each thread claims its own jobs, so the pool can share the queue with other worker processes.
+    """
+    if workers <= 1:
+        return drain_queue(job_model, handler, limit=limit, queryset=queryset)
+
+    counts = {job_model.STATUS_DONE: 0, job_model.STATUS_PENDING: 0, job_model.STATUS_FAILED: 0}
+    lock = threading.Lock()
+    started = 0
+
+    def work():
+        nonlocal started
+        try:
+            while True:
+                with lock:
+                    if limit is not None and started >= limit:
+                        return
+                    started += 1
+                job = claim_next_job(job_model, queryset=queryset)
+                if job is None:
+                    return
+                outcome = run_job(job, handler)
+                with lock:
+                    counts[outcome] += 1
+        finally:
+            # Each thread opened its own connections
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{job_model.__name__}-worker') as pool:
+        for future in [pool.submit(work) for _ in range(workers)]:
+            future.result()
+    return counts
+
+
+def release_stale_jobs(job_model, older_than=timedelta(minutes=30)):
+    """
+    Put jobs left in 'running' by a crashed worker back on the queue.
+    """
+    cutoff = timezone.now() - older_than
+    return job_model.objects.filter(
+        status=job_model.STATUS_RUNNING, started_at__lt=cutoff
+    ).update(status=job_model.STATUS_PENDING)
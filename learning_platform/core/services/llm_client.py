@@ -0,0 +1,83 @@
+"""
+Chat completion clients used for quiz generation.
+
+settings.LLM_CLIENT names the class to use. OpenAIChatClient calls the
+OpenAI API; StubLLMClient returns a deterministic quiz built from the
+prompt, so tests and benchmarks run offline and give repeatable output.
+"""
+import hashlib
+import re
+import time
+from collections import Counter
+
+import openai
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from ..metrics import track_external
+
+DEFAULT_CLIENT = 'core.services.llm_client.OpenAIChatClient'
+
+
+class LLMError(Exception):
+    pass
+
+
+class OpenAIChatClient:
+    model = "gpt-3.5-turbo"
+
+    def complete(self, messages, max_tokens, temperature=0.7):
+        try:
+            with track_external('openai'):
+                response = openai.ChatCompletion.create(
+                    api_key=settings.OPENAI_API_KEY,
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+        except openai.error.OpenAIError as e:
+            raise LLMError(str(e)) from e
+        return response.choices[0].message['content'].strip()
+
+
+_QUESTION_COUNT = re.compile(r'(\d+)[\w\s-]*?questions')
+_WORD = re.compile(r'[A-Za-z][A-Za-z-]{3,}')
+
+
+class StubLLMClient:
+    """
+    Answers every prompt with quiz questions about words taken from it, in the
+    "Question / Answer ... Correct:" format the prompts ask for. The same prompt always gives the
+    same quiz. settings.LLM_STUB_LATENCY adds a fixed delay per call to mimic a real API.
+    """
+    model = "stub"
+
+    def complete(self, messages, max_tokens, temperature=0.7):
+        latency = getattr(settings, 'LLM_STUB_LATENCY', 0)
+        if latency:
+            time.sleep(latency)
+
+        prompt = messages[-1]['content']
+        match = _QUESTION_COUNT.search(prompt)
+        count = int(match.group(1)) if match else 3
+        words = [word for word, _ in sorted(
+            Counter(word.lower() for word in _WORD.findall(prompt)).items(), key=lambda item: (-item[1], item[0])
+        )]
+        words = words or ['topic']
+        seed = int(hashlib.sha256(prompt.encode()).hexdigest(), 16)
+
+        blocks = []
+        for number in range(count):
+            term = words[(seed + number) % len(words)]
+            correct = (seed >> number) % 4
+            lines = [f"Question {number + 1}: Which statement about '{term}' matches the material?"]
+            for option in range(4):
+                text = f"Statement {'ABCD'[option]} about {term}"
+                lines.append(f"{text} Correct:" if option == correct else text)
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+
+def get_llm_client():
+    return import_string(getattr(settings, 'LLM_CLIENT', DEFAULT_CLIENT))()
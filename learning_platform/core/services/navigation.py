@@ -0,0 +1,92 @@
+"""
+Previous/next navigation through a course.
+
+A course's learning paths and modules are loaded in position order with one query,
+linked to their neighbours and cached in the 'shared' cache. Cached maps are keyed by
+a per-course generation token, replaced once a change to a path or module of the
+course commits (see core/signals.py), as compiled quizzes are. Module links run across
+learning paths: the last module of one path is followed by the first module of the next.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+
+from ..models import LearningPath
+
+CACHE_ALIAS = 'shared'
+# Entries of old generations are never read again; the TTL lets them expire
+NAVIGATION_TTL = 60 * 60
+
+
+def _generation_key(course_id):
+    return f"navigation:generation:{course_id}"
+
+
+def _key(course_id, generation):
+    return f"navigation:{course_id}:{generation}"
+
+
+def _generation(course_id):
+    cache = caches[CACHE_ALIAS]
+    generation = cache.get(_generation_key(course_id))
+    if generation is None:
+        cache.add(_generation_key(course_id), uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_generation_key(course_id))
+    return generation
+
+
+def _link(items):
+    for previous, current in zip(items, items[1:]):
+        previous['next'] = current['id']
+        current['previous'] = previous['id']
+
+
+def build_navigation(course_id):
+    """
+    Learning paths of the course, each with its modules, in order and linked to their neighbours.
+    Always runs exactly one query.
+    """
+    rows = LearningPath.objects.filter(course_id=course_id).order_by(
+        'position', 'id', 'modules__position', 'modules__id'
+    ).values_list('id', 'path_name', 'position', 'modules__id', 'modules__module_name', 'modules__slug')
+
+    paths, modules = [], []
+    for path_id, path_name, path_position, module_id, module_name, slug in rows:
+        if not paths or paths[-1]['id'] != path_id:
+            paths.append({
+                'id': path_id, 'path_name': path_name, 'position': path_position,
+                'previous': None, 'next': None, 'modules': [],
+            })
+        if module_id is not None:
+            module = {'id': module_id, 'module_name': module_name, 'slug': slug, 'previous': None, 'next': None}
+            paths[-1]['modules'].append(module)
+            modules.append(module)
+    _link(paths)
+    _link(modules)
+    return {'course_id': course_id, 'learning_paths': paths}
+
+
+def get_navigation(course_id):
+    """
+    Return the course's navigation map from the cache, building it on a miss.
+    """
+    cache = caches[CACHE_ALIAS]
+    # Read the generation before the rows, so a change committed meanwhile moves readers past this copy
+    key = _key(course_id, _generation(course_id))
+    navigation = cache.get(key)
+    if navigation is None:
+        navigation = build_navigation(course_id)
+        cache.add(key, navigation, NAVIGATION_TTL)
+    return navigation
+
+
+def invalidate_navigation(*course_ids):
+    """
+    Start a new navigation generation for the courses once the current transaction commits.
+    """
+    course_ids = {course_id for course_id in course_ids if course_id is not None}
+    if course_ids:
+        transaction.on_commit(lambda: caches[CACHE_ALIAS].set_many(
+            {_generation_key(course_id): uuid.uuid4().hex for course_id in course_ids}, timeout=None
+        ))
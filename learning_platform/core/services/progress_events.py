@@ -0,0 +1,265 @@
+"""
+Batch ingestion of client progress events.
+
+Offline and mobile clients sync an ordered list of events (videos watched,
+quizzes submitted). Each idempotency key is applied once; replays come back
+as duplicates with their original result. Progress rows are written in bulk
+and the rollup runs once per affected learning path and once per affected
+course, instead of once per event.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Module, ModuleProgress, ProgressEvent, QuestionResponse, QuizProgress
+from .dashboard_service import invalidate_dashboard
+from .progress_service import apply_learning_path_delta, apply_path_completion_delta
+from .quiz_cache import get_answer_key, get_compiled_quiz
+from .quiz_grading import calculate_score, grade_answers
+
+MAX_EVENTS = 500
+PASSING_SCORE = 70.0
+
+
+def _as_id(value, index, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"events[{index}]: invalid {field}: {value!r}")
+
+
+def _parse_timestamp(value, index):
+    if value is None:
+        return timezone.now()
+    timestamp = parse_datetime(value) if isinstance(value, str) else None
+    if timestamp is None:
+        raise ValueError(f"events[{index}]: invalid timestamp: {value!r}")
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    # Client clocks drift; never record progress in the future
+    return min(timestamp, timezone.now())
+
+
+def parse_events(events):
+    """
+    Validate raw event dicts from a request body. Raises ValueError naming the first bad event.
+    """
+    if not isinstance(events, list):
+        raise ValueError("events must be a list")
+    if len(events) > MAX_EVENTS:
+        raise ValueError(f"At most {MAX_EVENTS} events can be sent at once.")
+
+    parsed = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise ValueError(f"events[{index}]: must be an object")
+        key = event.get('idempotency_key')
+        if not isinstance(key, str) or not 0 < len(key) <= 64:
+            raise ValueError(f"events[{index}]: idempotency_key must be a string of 1-64 characters")
+
+        event_type = event.get('type')
+        timestamp = _parse_timestamp(event.get('timestamp'), index)
+        if event_type == ProgressEvent.VIDEO_WATCHED:
+            parsed.append({
+                'key': key, 'type': event_type, 'timestamp': timestamp,
+                'module_id': _as_id(event.get('module_id'), index, 'module_id'),
+            })
+        elif event_type == ProgressEvent.QUIZ_SUBMITTED:
+            answers = event.get('answers', [])
+            if not isinstance(answers, list):
+                raise ValueError(f"events[{index}]: answers must be a list")
+            parsed.append({
+                'key': key, 'type': event_type, 'timestamp': timestamp,
+                'quiz_id': _as_id(event.get('quiz_id'), index, 'quiz_id'), 'answers': answers,
+            })
+        else:
+            raise ValueError(f"events[{index}]: unknown type {event_type!r}")
+    return parsed
+
+
+def _grade_quiz_events(events):
+    """
+    Grade every quiz event against the cached answer keys, adding 'module_id', 'results' and 'score'.
+    """
+    compiled_quizzes = {}
+    for event in events:
+        if event['type'] != ProgressEvent.QUIZ_SUBMITTED:
+            continue
+        quiz_id = event['quiz_id']
+        if quiz_id not in compiled_quizzes:
+            compiled_quizzes[quiz_id] = get_compiled_quiz(quiz_id)
+        compiled = compiled_quizzes[quiz_id]
+        if compiled is None:
+            raise ValueError(f"Event {event['key']}: quiz {quiz_id} not found")
+
+        answer_key = get_answer_key(compiled)
+        try:
+            event['results'] = grade_answers(answer_key, event['answers'])
+        except ValueError as e:
+            raise ValueError(f"Event {event['key']}: {e}")
+        event['score'] = calculate_score(answer_key, event['results'])
+        event['module_id'] = compiled['module_id']
+
+
+def _event_result(event):
+    if event['type'] == ProgressEvent.QUIZ_SUBMITTED:
+        return {'score': event['score'], 'completed': event['score'] >= PASSING_SCORE}
+    return {}
+
+
+def _apply_module_states(user, events, modules):
+    """
+    Fold the events into the user's module progress, upsert the changed rows in one statement and
+    return the net change in completed modules per learning path.
+    """
+    rows = {
+        row.module_id: row
+        for row in ModuleProgress.objects.select_for_update().filter(user=user, module_id__in=modules)
+    }
+    was_completed = {module_id: row.completed for module_id, row in rows.items()}
+    last_event = {}
+
+    for event in events:
+        module_id = event['module_id']
+        row = rows.get(module_id)
+        if event['type'] == ProgressEvent.VIDEO_WATCHED:
+            if row is None:
+                row = rows[module_id] = ModuleProgress(user=user, module_id=module_id)
+            row.video_watched = True
+        elif row is not None:
+            # As with single submissions, a quiz only counts once the module has been started
+            row.quiz_completed = event['score'] >= PASSING_SCORE
+        else:
+            continue
+        last_event[module_id] = event
+
+    path_deltas = defaultdict(int)
+    for module_id, row in rows.items():
+        if module_id not in last_event:
+            continue
+        before = was_completed.get(module_id, False)
+        row.completed = row.video_watched and row.quiz_completed
+        if not row.completed:
+            row.completion_date = None
+        elif not before or row.completion_date is None:
+            row.completion_date = last_event[module_id]['timestamp']
+        path_deltas[modules[module_id][0]] += int(row.completed) - int(before)
+
+    changed = [rows[module_id] for module_id in last_event]
+    if changed:
+        ModuleProgress.objects.bulk_create(
+            changed, update_conflicts=True, unique_fields=['user', 'module'],
+            update_fields=['video_watched', 'quiz_completed', 'completed', 'completion_date'],
+        )
+    return path_deltas
+
+
+def _roll_up(user, path_deltas, path_courses):
+    # Each learning path is updated once; course changes are summed and applied once per course
+    course_deltas = defaultdict(lambda: [0, 0])
+    for learning_path_id in sorted(path_deltas):
+        change = apply_path_completion_delta(user, learning_path_id, path_deltas[learning_path_id])
+        course_id = path_courses[learning_path_id]
+        if change is None:
+            # The course was just recounted from the path rows, which already include earlier paths' changes
+            course_deltas[course_id] = [0, 0]
+        else:
+            course_deltas[course_id][0] += change[0]
+            course_deltas[course_id][1] += change[1]
+
+    for course_id in sorted(course_deltas):
+        apply_learning_path_delta(user, course_id, *course_deltas[course_id])
+
+
+def _apply(user, events):
+    stored = {
+        event.idempotency_key: event.result
+        for event in ProgressEvent.objects.filter(user=user, idempotency_key__in=[e['key'] for e in events])
+    }
+    new_events = []
+    seen = set(stored)
+    for event in events:
+        if event['key'] not in seen:
+            seen.add(event['key'])
+            new_events.append(event)
+
+    _grade_quiz_events(new_events)
+    module_ids = {event['module_id'] for event in new_events}
+    modules = {
+        module_id: (learning_path_id, course_id)
+        for module_id, learning_path_id, course_id in Module.objects.filter(pk__in=module_ids).values_list(
+            'pk', 'learning_path_id', 'learning_path__course_id'
+        )
+    }
+    missing = sorted(module_ids - set(modules))
+    if missing:
+        raise ValueError(f"Unknown module id(s): {', '.join(map(str, missing))}")
+
+    with transaction.atomic():
+        ProgressEvent.objects.bulk_create([
+            ProgressEvent(
+                user=user, idempotency_key=event['key'], event_type=event['type'],
+                module_id=event['module_id'], quiz_id=event.get('quiz_id'),
+                client_timestamp=event['timestamp'], result=_event_result(event),
+            )
+            for event in new_events
+        ])
+
+        quiz_events = [event for event in new_events if event['type'] == ProgressEvent.QUIZ_SUBMITTED]
+        QuestionResponse.objects.bulk_create([
+            QuestionResponse(
+                user=user, quiz_id=event['quiz_id'], question_id=question_id, answer_id=answer_id,
+                is_correct=is_correct, submitted_at=event['timestamp'],
+            )
+            for event in quiz_events for question_id, answer_id, is_correct in event['results']
+        ])
+
+        # The last submission of each quiz in the batch wins
+        final_quiz_events = {event['quiz_id']: event for event in quiz_events}
+        if final_quiz_events:
+            QuizProgress.objects.bulk_create(
+                [
+                    QuizProgress(
+                        user=user, quiz_id=quiz_id, score=event['score'],
+                        completed=event['score'] >= PASSING_SCORE,
+                        completion_date=event['timestamp'] if event['score'] >= PASSING_SCORE else None,
+                    )
+                    for quiz_id, event in final_quiz_events.items()
+                ],
+                update_conflicts=True, unique_fields=['user', 'quiz'],
+                update_fields=['score', 'completed', 'completion_date'],
+            )
+
+        path_deltas = _apply_module_states(user, new_events, modules)
+        _roll_up(user, path_deltas, {path_id: course_id for path_id, course_id in modules.values()})
+        if new_events:
+            invalidate_dashboard(user.pk)
+
+    applied = {event['key']: _event_result(event) for event in new_events}
+    response = []
+    for event in events:
+        key = event['key']
+        if key in applied:
+            response.append({'idempotency_key': key, 'status': 'applied', **applied.pop(key)})
+            stored[key] = response[-1]
+        else:
+            # Already stored, or repeated within this batch
+            result = {field: value for field, value in stored[key].items() if field not in ('idempotency_key', 'status')}
+            response.append({'idempotency_key': key, 'status': 'duplicate', **result})
+    return response
+
+
+def apply_progress_events(user, events):
+    """
+    Apply a batch of raw progress events for `user` in one transaction.
+    Returns one {'idempotency_key', 'status', ...} entry per event, in order;
+    status is 'applied' or 'duplicate'. Raises ValueError for invalid events.
+    """
+    events = parse_events(events)
+    try:
+        return _apply(user, events)
+    except IntegrityError:
+        # A concurrent sync stored some of the same keys first; retrying reports them as duplicates
+        return _apply(user, events)
@@ -0,0 +1,205 @@
+"""
+Incremental progress rollups.
+
+Completing (or un-completing) a module changes one counter on the user's
+LearningPathProgress and, through it, the running totals on CourseProgress.
+Each event costs a fixed number of queries regardless of course size; the
+`recompute_progress` command rebuilds everything from scratch if the
+counters ever drift.
+
+Writes go through record_module_progress()/record_quiz_score(), which upsert
+the progress row and run the whole rollup in one transaction. Rollup rows
+are locked (SELECT ... FOR UPDATE) in a fixed order, module -> learning path
+-> course, so concurrent submissions for the same user serialize instead of
+interleaving.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import CourseProgress, LearningPath, LearningPathProgress, Module, ModuleProgress, QuizProgress
+
+
+def _percentage(done, total):
+    return round((done / total) * 100) if total > 0 else 0
+
+
+def _completion_date(completed, was_completed, previous_date):
+    # Keep the original completion date while a row stays completed
+    if not completed:
+        return None
+    return previous_date if was_completed and previous_date else timezone.now()
+
+
+def _lock_or_create(model, create, **lookup):
+    """
+    Lock and return the user's rollup row for `lookup`. If there is none, create it with `create()` and return None:
+    a new row is counted from scratch, so no delta needs applying.
+    """
+    row = model.objects.select_for_update().filter(**lookup).first()
+    if row is not None:
+        return row
+    try:
+        with transaction.atomic():
+            create()
+        return None
+    except IntegrityError:
+        # A concurrent transaction created it first; wait for its lock, then apply our delta on top
+        return model.objects.select_for_update().get(**lookup)
+
+
+def apply_module_completion_delta(user, module, delta):
+    """
+    Apply a +1/-1 change in completed modules for `module` to the user's learning path and course progress.
+    """
+    with transaction.atomic():
+        change = apply_path_completion_delta(user, module.learning_path_id, delta)
+        if change is not None:
+            course_id = LearningPath.objects.values_list('course_id', flat=True).get(pk=module.learning_path_id)
+            apply_learning_path_delta(user, course_id, *change)
+
+
+def apply_path_completion_delta(user, learning_path_id, delta):
+    """
+    Add `delta` completed modules to the user's progress on a learning path, creating the row if needed.
+    Returns (percentage_delta, completed_delta) for the caller to apply to the course, or None when
+    nothing is left to apply because the course was recounted from scratch.
+    """
+    with transaction.atomic():
+        path_progress = _lock_or_create(
+            LearningPathProgress,
+            # save() counts from scratch and cascades to the course
+            lambda: LearningPathProgress(user=user, learning_path_id=learning_path_id).save(),
+            user=user, learning_path_id=learning_path_id,
+        )
+        if path_progress is None:
+            return None
+        if not delta:
+            return 0, 0
+
+        old_percentage, old_completed = path_progress.progress_percentage, path_progress.completed
+
+        LearningPathProgress.objects.filter(pk=path_progress.pk).update(
+            completed_modules=F('completed_modules') + delta
+        )
+        completed_modules = LearningPathProgress.objects.values_list('completed_modules', flat=True).get(
+            pk=path_progress.pk
+        )
+        total_modules = Module.objects.filter(learning_path_id=learning_path_id).count()
+        if total_modules == 0:
+            return 0, 0
+
+        percentage = _percentage(completed_modules, total_modules)
+        completed = percentage == 100
+        LearningPathProgress.objects.filter(pk=path_progress.pk).update(
+            progress_percentage=percentage,
+            completed=completed,
+            completion_date=_completion_date(completed, old_completed, path_progress.completion_date),
+        )
+        return percentage - old_percentage, int(completed) - int(old_completed)
+
+
+def apply_learning_path_delta(user, course_id, percentage_delta, completed_delta):
+    """
+    Apply a change in one learning path's percentage/completion to the user's course progress.
+    """
+    if not percentage_delta and not completed_delta:
+        return
+
+    with transaction.atomic():
+        course_progress = _lock_or_create(
+            CourseProgress,
+            # save() aggregates the learning path rows, which already include this change
+            lambda: CourseProgress(user=user, course_id=course_id).save(),
+            user=user, course_id=course_id,
+        )
+        if course_progress is None:
+            return
+
+        CourseProgress.objects.filter(pk=course_progress.pk).update(
+            path_progress_total=F('path_progress_total') + percentage_delta,
+            completed_learning_paths=F('completed_learning_paths') + completed_delta,
+        )
+        path_progress_total = CourseProgress.objects.values_list('path_progress_total', flat=True).get(
+            pk=course_progress.pk
+        )
+        total_learning_paths = LearningPath.objects.filter(course_id=course_id).count()
+        if total_learning_paths == 0:
+            return
+
+        percentage = round(path_progress_total / total_learning_paths)
+        completed = percentage == 100
+        CourseProgress.objects.filter(pk=course_progress.pk).update(
+            progress_percentage=percentage,
+            completed=completed,
+            completion_date=_completion_date(completed, course_progress.completed, course_progress.completion_date),
+        )
+
+
+def record_module_progress(user, module_id, **fields):
+    """
+    Upsert the user's progress on a module with `fields` and roll it up, all in one transaction.
+    Returns the updated ModuleProgress.
+    """
+    with transaction.atomic():
+        row = ModuleProgress(user=user, module_id=module_id, **fields)
+        if fields:
+            ModuleProgress.objects.bulk_create(
+                [row], update_conflicts=True, unique_fields=['user', 'module'], update_fields=list(fields)
+            )
+        else:
+            ModuleProgress.objects.bulk_create([row], ignore_conflicts=True)
+        module_progress = ModuleProgress.objects.select_for_update(of=('self',)).select_related(
+            'user', 'module'
+        ).get(user=user, module_id=module_id)
+        module_progress.calculate_progress()
+    return module_progress
+
+
+def record_quiz_score(user, quiz_id, score):
+    """
+    Upsert the user's score on a quiz and propagate it to module, learning path and course progress
+    in one transaction. Returns the updated QuizProgress.
+    """
+    with transaction.atomic():
+        QuizProgress.objects.bulk_create(
+            [QuizProgress(user=user, quiz_id=quiz_id, score=score)],
+            update_conflicts=True, unique_fields=['user', 'quiz'], update_fields=['score'],
+        )
+        quiz_progress = QuizProgress.objects.select_for_update(of=('self',)).select_related(
+            'user', 'quiz'
+        ).get(user=user, quiz_id=quiz_id)
+        quiz_progress.calculate_progress()
+    return quiz_progress
+
+
+def recompute_all(users=None):
+    """
+    Rebuild every learning path and course rollup from the module progress rows.
+    Returns (learning_path_rows, course_rows) recomputed.
+    """
+    module_progress = ModuleProgress.objects.filter(completed=True)
+    if users is not None:
+        module_progress = module_progress.filter(user__in=users)
+
+    # Make sure every path with completed modules has a counter row
+    active_paths = module_progress.values_list('user_id', 'module__learning_path_id').distinct()
+    for user_id, learning_path_id in active_paths:
+        LearningPathProgress.objects.get_or_create(user_id=user_id, learning_path_id=learning_path_id)
+
+    path_rows = LearningPathProgress.objects.select_related('user', 'learning_path')
+    course_rows = CourseProgress.objects.select_related('user', 'course')
+    if users is not None:
+        path_rows = path_rows.filter(user__in=users)
+        course_rows = course_rows.filter(user__in=users)
+
+    path_count = 0
+    for path_progress in path_rows.iterator():
+        path_progress.recalculate()
+        path_count += 1
+
+    course_count = 0
+    for course_progress in course_rows.iterator():
+        course_progress.calculate_progress()
+        course_count += 1
+    return path_count, course_count
@@ -0,0 +1,122 @@
+"""
+Compiled, cache-backed quiz representation.
+
+A quiz is walked Quiz -> Question -> Answer once and stored in the 'shared'
+cache, so grading and rendering in every worker process read the same
+snapshot. Compiled entries are keyed by a per-quiz generation token, which the
+signal handlers in core/signals.py replace once a change to a Quiz, Question or
+Answer commits. A reader that compiled the old rows while the change was in
+flight stores its copy under the old generation, where no one looks any more.
+"""
+import hashlib
+import json
+import uuid
+
+from django.core.cache import caches
+
+from ..models import Quiz
+
+CACHE_ALIAS = 'shared'
+# Entries of old generations are never read again; the TTL lets them expire
+COMPILED_QUIZ_TTL = 60 * 60
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generation_key(quiz_id):
+    return f"quiz:generation:{quiz_id}"
+
+
+def _key(quiz_id, generation):
+    return f"quiz:compiled:{quiz_id}:{generation}"
+
+
+def _generation(quiz_id):
+    cache = _cache()
+    generation = cache.get(_generation_key(quiz_id))
+    if generation is None:
+        cache.add(_generation_key(quiz_id), uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_generation_key(quiz_id))
+    return generation
+
+
+def compile_quiz(quiz_id):
+    """
+    Build the compiled representation of a quiz from the database, or None if it does not exist.
+    """
+    quiz = Quiz.objects.filter(pk=quiz_id).prefetch_related('questions__answers').first()
+    if quiz is None:
+        return None
+
+    questions = []
+    answer_key = {}
+    for question in sorted(quiz.questions.all(), key=lambda q: q.pk):
+        answers = sorted(question.answers.all(), key=lambda a: a.pk)
+        questions.append({
+            'id': question.pk,
+            'question_text': question.question_text,
+            'answers': [
+                {'id': answer.pk, 'answer_text': answer.answer_text, 'is_correct': answer.is_correct}
+                for answer in answers
+            ],
+        })
+        answer_key[question.pk] = [answer.pk for answer in answers if answer.is_correct]
+
+    compiled = {
+        'id': quiz.pk,
+        'quiz_name': quiz.quiz_name,
+        'module_id': quiz.module_id,
+        'questions': questions,
+        'answer_key': answer_key,
+    }
+    # Content hash, so every process derives the same version (used for ETags)
+    compiled['version'] = hashlib.sha1(
+        json.dumps(compiled, sort_keys=True).encode('utf-8')
+    ).hexdigest()[:16]
+    return compiled
+
+
+def get_compiled_quiz(quiz_id):
+    """
+    Return the compiled quiz from the shared cache, compiling it on a miss.
+    Each call returns a fresh copy, so callers cannot alter the cached snapshot.
+    """
+    # Read the generation before the rows, so a change committed meanwhile moves readers past this copy
+    key = _key(quiz_id, _generation(quiz_id))
+    compiled = _cache().get(key)
+    if compiled is None:
+        compiled = compile_quiz(quiz_id)
+        if compiled is not None:
+            _cache().add(key, compiled, COMPILED_QUIZ_TTL)
+    return compiled
+
+
+def invalidate_quiz(quiz_id):
+    """
+    Start a new generation for the quiz. Call after the change has committed.
+    """
+    _cache().set(_generation_key(quiz_id), uuid.uuid4().hex, timeout=None)
+
+
+def get_answer_key(compiled):
+    """
+    Answer key of a compiled quiz as question id -> set of correct answer ids.
+    """
+    return {question_id: set(answer_ids) for question_id, answer_ids in compiled['answer_key'].items()}
+
+
+def render_quiz(compiled):
+    """
+    Public representation of a compiled quiz (same shape as QuizSerializer).
+    """
+    return {
+        'id': compiled['id'],
+        'quiz_name': compiled['quiz_name'],
+        'questions': compiled['questions'],
+    }
+
+
+def etag(compiled):
+    return f'"quiz-{compiled["id"]}-{compiled["version"]}"'
@@ -1,103 +1,208 @@
-import openai
-import os
-from googleapiclient.discovery import build
+import hashlib
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+from . import api_cache, youtube_quota
+from .llm_client import LLMError, get_llm_client
+from .quiz_parser import PARSER_VERSION, parse_quiz_text
+from .search_index import index_objects
+from .transcript_chunker import estimate_tokens, iter_chunks, query_terms, select_chunks
+from .youtube_client import NUM_RETRIES, get_youtube_client
+from ..metrics import track_external
+from ..models import Answer, Question, Quiz
 
-# Load API keys from environment variables
-openai.api_key = os.getenv("OPENAI_API_KEY")
-YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+logger = logging.getLogger(__name__)
+
+def _video_id(video_url):
+    return video_url.split("v=")[-1]
+
+def _download_transcript(video_id):
+    try:
+        with track_external('youtube_transcript'):
+            transcript = YouTubeTranscriptApi.get_transcript(video_id)
+    except (TranscriptsDisabled, NoTranscriptFound) as e:
+        # Definitive "no transcript": cached as a negative result
+        logger.info("Transcript not available for video %s: %s", video_id, e)
+        return None
+    return " ".join([t['text'] for t in transcript])
 
 def fetch_video_transcript(video_url):
     """
     Fetch transcript of a YouTube video.
     """
     try:
-        video_id = video_url.split("v=")[-1]
-
-        # Fetch transcript
-        transcript = YouTubeTranscriptApi.get_transcript(video_id)
-        transcript_text = " ".join([t['text'] for t in transcript])
-        return transcript_text
-    except (TranscriptsDisabled, NoTranscriptFound) as e:
-        print(f"Transcript not available for video {video_url}: {e}")
-        return None
+        video_id = _video_id(video_url)
+        return api_cache.cached_call('video_transcript', video_id, lambda: _download_transcript(video_id))
     except Exception as e:
-        print(f"Unexpected error fetching transcript for video {video_url}: {e}")
+        logger.exception("Unexpected error fetching transcript for video %s", video_url)
         return None
 
+def _download_description(video_id):
+    youtube_quota.consume(youtube_quota.VIDEOS_LIST_COST)
+    youtube = get_youtube_client()
+    request = youtube.videos().list(part='snippet', id=video_id)
+    with track_external('youtube'):
+        response = request.execute(num_retries=NUM_RETRIES)
+    items = response.get('items', [])
+    return items[0]['snippet']['description'] if items else None
+
 def fetch_video_description(video_url):
     """
     Fetch description of a YouTube video.
     """
     try:
-        video_id = video_url.split("v=")[-1]
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
-        request = youtube.videos().list(part='snippet', id=video_id)
-        response = request.execute()
-        return response['items'][0]['snippet']['description']
+        video_id = _video_id(video_url)
+        return api_cache.cached_call('video_description', video_id, lambda: _download_description(video_id))
+    except youtube_quota.QuotaExceeded as e:
+        logger.warning("Not fetching description for %s: %s", video_url, e)
+        return None
     except Exception as e:
-        print(f"Error fetching video description for {video_url}: {e}")
+        logger.exception("Error fetching video description for %s", video_url)
         return None
 
+# Prompts are part of the generated-quiz cache key: editing one regenerates every quiz
+QUIZ_SYSTEM_PROMPT = "You are an educational assistant that generates quizzes from text."
+QUIZ_PROMPT = (
+    "Create {num_questions} multiple-choice quiz questions from the following content. "
+    "Each question should include one correct answer and three incorrect answers. "
+    "Output in the format:\n"
+    "Question 1:\nAnswer A\nAnswer B Correct:\nAnswer C\nAnswer D\n\n"
+    "Content:\n"
+    "{content}"
+)
+DEFAULT_QUIZ_SYSTEM_PROMPT = "You are an educational assistant that generates quizzes for learning modules."
+DEFAULT_QUIZ_PROMPT = (
+    "Generate a simple quiz with {num_questions} questions about the topic: {content}. "
+    "For each question, provide 4 multiple-choice answers and mark one as correct. "
+    "Format the output as follows:\n"
+    "Question 1:\nAnswer A\nAnswer B Correct:\nAnswer C\nAnswer D\n\n"
+    "Question 2:\n..."
+)
+
+def quiz_content_hash(content, prompt_template, model, num_questions):
+    """
+    Identify a generated quiz by everything that determines the LLM's output.
+    """
+    payload = json.dumps([content, prompt_template, model, num_questions])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _generate(system_prompt, prompt_template, content, num_questions, max_tokens):
+    client = get_llm_client()
+    model = getattr(client, 'model', type(client).__name__)
+    content_hash = quiz_content_hash(content, system_prompt + prompt_template, model, num_questions)
+    cache_id = f"{content_hash}:{PARSER_VERSION}"
+    found, generated = api_cache.lookup('generated_quiz', cache_id)
+    if found and generated:
+        logger.debug("Reusing generated quiz %s", content_hash)
+        return generated
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt_template.format(num_questions=num_questions, content=content)},
+    ]
+    questions_text = client.complete(messages, max_tokens=max_tokens, temperature=0.7)
+    generated = {
+        'content_hash': content_hash,
+        'text': questions_text,
+        'questions': parse_quiz_text(questions_text),
+    }
+    # Unusable output is not cached, so the next attempt asks again
+    if generated['questions']:
+        api_cache.store('generated_quiz', cache_id, generated)
+    return generated
+
 def generate_quiz_with_chat_api(content, num_questions=5):
     """
-    Generate multiple-choice quiz questions from content using OpenAI's Chat API.
+    Generate multiple-choice quiz questions from content using the configured LLM client.
+    Returns {'content_hash', 'text', 'questions'} (see quiz_parser.parse_quiz_text), or None on failure.
+    Results are cached by content, prompt, model and question count.
     """
     try:
-        messages = [
-            {"role": "system", "content": "You are an educational assistant that generates quizzes from text."},
-            {"role": "user", "content": (
-                f"Create {num_questions} multiple-choice quiz questions from the following content. "
-                "Each question should include one correct answer and three incorrect answers. "
-                "Output in the format:\n"
-                "Question 1:\nAnswer A\nAnswer B Correct:\nAnswer C\nAnswer D\n\n"
-                "Content:\n"
-                f"{content}"
-            )}
-        ]
-
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            max_tokens=800,
-            temperature=0.7,
-        )
-        return response.choices[0].message['content'].strip()
-    except openai.error.OpenAIError as e:
-        print(f"OpenAI API error: {e}")
+        return _generate(QUIZ_SYSTEM_PROMPT, QUIZ_PROMPT, content, num_questions, max_tokens=800)
+    except LLMError as e:
+        logger.error("LLM API error: %s", e)
         return None
     except Exception as e:
-        print(f"Error generating quiz: {e}")
+        logger.exception("Error generating quiz")
         return None
 
-def generate_default_quiz(topic):
+def _chunk_settings():
+    return {
+        'chunk_tokens': getattr(settings, 'QUIZ_CHUNK_TOKENS', 1200),
+        'overlap_tokens': getattr(settings, 'QUIZ_CHUNK_OVERLAP_TOKENS', 150),
+        'budget': getattr(settings, 'QUIZ_CONTENT_TOKEN_BUDGET', 3600),
+        'parallelism': getattr(settings, 'QUIZ_GENERATION_PARALLELISM', 4),
+    }
+
+def _generate_for_chunk(chunk_text, num_questions):
+    try:
+        return generate_quiz_with_chat_api(chunk_text, num_questions)
+    finally:
+        # Runs on a pool thread, which opened its own connection for the api cache
+        connections.close_all()
+
+def _question_key(question):
+    return re.sub(r'\W+', ' ', question['question'].lower()).strip()
+
+def generate_quiz_from_content(content, query='', num_questions=5):
     """
-    Generate a default quiz based on the module topic using OpenAI's Chat API.
+    Like generate_quiz_with_chat_api, but content longer than one chunk is split into overlapping
+    chunks, the ones most relevant to `query` are kept within settings.QUIZ_CONTENT_TOKEN_BUDGET,
+    and questions are generated for each chunk in parallel and merged. Prompt size and latency
+    therefore stay bounded by the budget, not the length of the video.
+    """
+    options = _chunk_settings()
+    if estimate_tokens(content) <= options['chunk_tokens']:
+        return generate_quiz_with_chat_api(content, num_questions)
+
+    limit = max(1, min(options['budget'] // options['chunk_tokens'], num_questions))
+    chunks = select_chunks(
+        iter_chunks(content, options['chunk_tokens'], options['overlap_tokens']), query_terms(query), limit
+    )
+    # Spread the questions over the chunks; earlier chunks take the remainder
+    counts = [num_questions // len(chunks) + (position < num_questions % len(chunks)) for position in range(len(chunks))]
+    logger.debug(
+        "Generating %s questions from %s chunk(s) of %s token(s)", num_questions, len(chunks),
+        [chunk.tokens for chunk in chunks],
+    )
+
+    workers = max(1, min(options['parallelism'], len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='quiz-chunk') as pool:
+        results = list(pool.map(_generate_for_chunk, [chunk.text for chunk in chunks], counts))
+
+    results = [result for result in results if result and result['questions']]
+    if not results:
+        return None
+    questions, seen = [], set()
+    for result in results:
+        for question in result['questions']:
+            key = _question_key(question)
+            if key not in seen:
+                seen.add(key)
+                questions.append(question)
+    merged_hash = hashlib.sha256(''.join(result['content_hash'] for result in results).encode('utf-8')).hexdigest()
+    return {
+        'content_hash': merged_hash,
+        'text': "\n\n".join(result['text'] for result in results),
+        'questions': questions[:num_questions],
+    }
+
+def generate_default_quiz(topic, num_questions=3):
+    """
+    Generate a default quiz based on the module topic using the configured LLM client.
+    Returns the same structure as generate_quiz_with_chat_api.
     """
     try:
-        messages = [
-            {"role": "system", "content": "You are an educational assistant that generates quizzes for learning modules."},
-            {"role": "user", "content": (
-                f"Generate a simple quiz with 3 questions about the topic: {topic}. "
-                "For each question, provide 4 multiple-choice answers and mark one as correct. "
-                "Format the output as follows:\n"
-                "Question 1:\nAnswer A\nAnswer B Correct:\nAnswer C\nAnswer D\n\n"
-                "Question 2:\n..."
-            )}
-        ]
-
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            max_tokens=500,
-            temperature=0.7,
-        )
-        return response.choices[0].message['content'].strip()
-    except openai.error.OpenAIError as e:
-        print(f"OpenAI API error: {e}")
+        return _generate(DEFAULT_QUIZ_SYSTEM_PROMPT, DEFAULT_QUIZ_PROMPT, topic, num_questions, max_tokens=500)
+    except LLMError as e:
+        logger.error("LLM API error: %s", e)
         return None
     except Exception as e:
-        print(f"Error generating default quiz: {e}")
+        logger.exception("Error generating default quiz")
         return None
 
 def generate_quiz_from_module(module):
@@ -108,18 +213,70 @@ def generate_quiz_from_module(module):
         # Step 1: Try fetching the transcript
         transcript = fetch_video_transcript(module.video_link)
         if transcript:
-            print("Using transcript for quiz generation.")
-            return generate_quiz_with_chat_api(transcript)
+            logger.debug("Using transcript for quiz generation (module %s)", module.pk)
+            return generate_quiz_from_content(transcript, query=module.topic)
 
         # Step 2: Try fetching the description
         description = fetch_video_description(module.video_link)
         if description:
-            print("Using video description for quiz generation.")
+            logger.debug("Using video description for quiz generation (module %s)", module.pk)
             return generate_quiz_with_chat_api(description)
 
         # Step 3: Log fallback if both transcript and description are unavailable
-        print(f"No content available for video: {module.video_link}")
+        logger.info("No content available for video: %s", module.video_link)
         return None  # No content available, return None or raise an exception
     except Exception as e:
-        print(f"Error generating quiz for module {module.id}: {e}")
+        logger.exception("Error generating quiz for module %s", module.id)
         return None
+
+def generate_module_quiz(module):
+    """
+    Generated quiz for a module: from its transcript, else its video description, else its topic,
+    falling back to a generic quiz on the topic. Returns None if every attempt fails.
+    """
+    # Try to fetch transcript
+    content = fetch_video_transcript(module.video_link)
+    if not content:
+        # Fallback to fetching video description
+        logger.info("No transcript available for %s, trying description", module.video_link)
+        content = fetch_video_description(module.video_link)
+
+    if not content:
+        # Dynamically generate meaningful fallback content
+        logger.info("No transcript or description available for %s, generating default content", module.video_link)
+        content = f"This module covers the topic: {module.topic}. Please prepare questions related to {module.topic}."
+
+    # Generate quiz questions from the parts of the content most relevant to the module
+    generated = generate_quiz_from_content(content, query=f"{module.module_name} {module.topic}")
+    if not generated or not generated['questions']:
+        # Generate quiz from default fallback
+        logger.warning("Failed to generate quiz from content for module %s, using default generation", module.pk)
+        generated = generate_default_quiz(module.topic)
+    return generated if generated and generated['questions'] else None
+
+def find_reusable_quiz(module, content_hash):
+    """
+    The module's most recent quiz generated from the same content, prompt and model, if any.
+    """
+    return Quiz.objects.filter(module=module, content_hash=content_hash).order_by('-date_created', '-pk').first()
+
+def save_generated_quiz(module, generated):
+    """
+    Store a generated quiz (see generate_quiz_with_chat_api) as a Quiz with its questions and answers,
+    in one transaction and three INSERTs.
+    """
+    with transaction.atomic():
+        # Quiz post_save drops any compiled copy once this commits; the bulk inserts send no signals
+        quiz = Quiz.objects.create(
+            quiz_name=f"Quiz for {module.module_name}", module=module, content_hash=generated['content_hash']
+        )
+        questions = Question.objects.bulk_create([
+            Question(quiz=quiz, question_text=question_data['question']) for question_data in generated['questions']
+        ])
+        Answer.objects.bulk_create([
+            Answer(question=question, answer_text=answer['text'], is_correct=answer['is_correct'])
+            for question, question_data in zip(questions, generated['questions'])
+            for answer in question_data['answers']
+        ])
+        transaction.on_commit(lambda: index_objects(questions))
+    return quiz
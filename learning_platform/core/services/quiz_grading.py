@@ -0,0 +1,37 @@
+def _as_id(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field}: {value!r}")
+
+
+def grade_answers(answer_key, answers):
+    """
+    Grade submitted answers against an answer key without touching the database.
+    `answers` is a list of {'question_id': ..., 'answer_id': ...} dicts.
+    Returns a list of (question_id, answer_id, is_correct) for questions that belong to the quiz.
+    Raises ValueError for items that are not dicts, malformed ids or a question answered more than once.
+    """
+    results = []
+    seen = set()
+    for answer in answers:
+        if not isinstance(answer, dict):
+            raise ValueError(f"Invalid answer: {answer!r}")
+        question_id = _as_id(answer.get('question_id'), 'question_id')
+        answer_id = answer.get('answer_id')
+        answer_id = _as_id(answer_id, 'answer_id') if answer_id is not None else None
+
+        if question_id in seen:
+            raise ValueError(f"Question {question_id} was answered more than once.")
+        seen.add(question_id)
+
+        if question_id not in answer_key:
+            continue  # Not part of this quiz; counts as unanswered
+        results.append((question_id, answer_id, answer_id in answer_key[question_id]))
+    return results
+
+
+def calculate_score(answer_key, results):
+    total_questions = len(answer_key)
+    correct_answers = sum(1 for _, _, is_correct in results if is_correct)
+    return (correct_answers / total_questions) * 100 if total_questions > 0 else 0
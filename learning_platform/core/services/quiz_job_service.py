@@ -0,0 +1,80 @@
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import QuizGenerationJob
+from .job_queue import drain_queue_concurrently, run_job
+from .quiz_generation_service import find_reusable_quiz, generate_module_quiz, save_generated_quiz
+
+logger = logging.getLogger(__name__)
+
+
+def _active_job(module):
+    return QuizGenerationJob.objects.filter(module=module, status__in=QuizGenerationJob.ACTIVE_STATUSES).first()
+
+
+def enqueue_quiz_generation(module, requested_by=None, reuse_existing=False):
+    """
+    Queue quiz generation for the module, or return the job already pending or running for it.
+    With `reuse_existing`, a quiz the module already has for the same generated content is linked
+    instead of being stored again. Returns (job, created).
+    """
+    job = _active_job(module)
+    if job:
+        return job, False
+    try:
+        with transaction.atomic():
+            job = QuizGenerationJob.objects.create(
+                module=module, requested_by=requested_by, reuse_existing=reuse_existing
+            )
+    except IntegrityError:
+        # Another request queued it between our check and insert
+        job = _active_job(module) or QuizGenerationJob.objects.filter(module=module).latest('created_at')
+        return job, False
+
+    if getattr(settings, 'QUIZ_GENERATION_INLINE', False):
+        # Local development without a worker process: run once the request has committed
+        transaction.on_commit(lambda: process_quiz_generation_job(job.pk))
+    return job, True
+
+
+def generate_quiz_for_job(job):
+    """
+    Fetch content for the job's module, ask the LLM for questions and store the quiz.
+    """
+    module = job.module
+    generated = generate_module_quiz(module)
+    if not generated:
+        raise RuntimeError("Failed to generate quiz questions.")
+
+    quiz = find_reusable_quiz(module, generated['content_hash']) if job.reuse_existing else None
+    if quiz is not None:
+        logger.info("Reusing quiz %s for module %s (job %s)", quiz.pk, module.pk, job.pk)
+    else:
+        quiz = save_generated_quiz(module, generated)
+        logger.info("Generated quiz %s for module %s (job %s)", quiz.pk, module.pk, job.pk)
+    job.quiz = quiz
+    job.save(update_fields=['quiz'])
+
+
+def process_quiz_generation_job(job_id):
+    """
+    Run a single job immediately (used for inline mode).
+    """
+    updated = QuizGenerationJob.objects.filter(pk=job_id, status=QuizGenerationJob.STATUS_PENDING).update(
+        status=QuizGenerationJob.STATUS_RUNNING, started_at=timezone.now(), attempts=F('attempts') + 1
+    )
+    if not updated:
+        return None  # Already picked up by a worker
+    job = QuizGenerationJob.objects.get(pk=job_id)
+    return run_job(job, generate_quiz_for_job)
+
+
+def drain_quiz_generation_queue(limit=None, workers=1):
+    """
+    Process pending quiz generation jobs, up to `workers` at a time. Returns a dict of outcome counts.
+    """
+    return drain_queue_concurrently(QuizGenerationJob, generate_quiz_for_job, workers, limit=limit)
@@ -0,0 +1,153 @@
+"""
+Parser for LLM-generated quiz text.
+
+The prompts ask for blocks like
+
+    Question 1: What does an index speed up?
+    Writes
+    Lookups Correct:
+    Backups
+    Migrations
+
+but models drift: CRLF line endings, markdown bold, "A)" / "b." / "- " answer
+labels, "(Correct)" or a trailing "Correct answer: B" line, preambles such as
+"Here is your quiz:", and missing blank lines between questions. parse_quiz_text()
+accepts all of these and keeps only questions with at least two answers and
+exactly one correct one.
+"""
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Part of the generated-quiz cache key, so cached parses are redone when parsing changes
+PARSER_VERSION = 2
+
+_QUESTION_HEADER = re.compile(r'^(?:#+\s*)?(?:question|q)\s*(\d+)\s*[:.)\-]?\s*(.*)$', re.IGNORECASE)
+_NUMBERED_QUESTION = re.compile(r'^(\d+)\s*[.)]\s+(.+)$')
+_ANSWER_LABEL = re.compile(r'^(?:[-*•]\s*)?(?:answer\s+)?\(?([A-Ha-h])\s*[).:\]]\s+')
+_BULLET = re.compile(r'^[-*•]\s+')
+_ANSWER_KEY = re.compile(
+    r'^(?:correct\s+answer\s*(?:is\s*)?[:\-]?|answer\s*(?:is\s*|[:\-]\s*))\s*\(?([A-Ha-h])\)?\.?$', re.IGNORECASE
+)
+_CORRECT_MARKERS = [
+    re.compile(r'\(\s*correct(?:\s+answer)?\s*\)', re.IGNORECASE),
+    re.compile(r'\[\s*(?:correct|x)\s*\]', re.IGNORECASE),
+    re.compile(r'\bcorrect(?:\s+answer)?\s*:', re.IGNORECASE),
+    re.compile(r'\s+[-–]\s*correct\s*$', re.IGNORECASE),
+    re.compile(r'[✓✔]'),
+]
+
+
+def _clean(line):
+    return line.replace('**', '').replace('__', '').strip()
+
+
+def _split_answer(line):
+    """
+    Return (label letter or None, answer text, is_correct) for an answer line.
+    """
+    is_correct = False
+    for marker in _CORRECT_MARKERS:
+        line, found = marker.subn(' ', line)
+        is_correct = is_correct or bool(found)
+    line = line.strip()
+
+    label = None
+    match = _ANSWER_LABEL.match(line)
+    if match:
+        label = match.group(1).upper()
+        line = line[match.end():]
+    else:
+        line = _BULLET.sub('', line)
+    return label, re.sub(r'\s+', ' ', line).strip(' -'), is_correct
+
+
+def _blocks(text):
+    """
+    Group lines into question blocks: a header line ("Question 2:", "2.") always starts a
+    block, and a blank line ends one once it has answers. A lone line followed by a blank
+    line outside any header ("Here is your quiz:") is dropped.
+    """
+    blocks, current = [], None
+    for raw in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        line = _clean(raw)
+        if line.startswith('```'):
+            continue
+        if not line:
+            if current and len(current['lines']) > 1:
+                blocks.append(current)
+                current = None
+            elif current and not current['header']:
+                current = None
+            continue
+
+        header = _QUESTION_HEADER.match(line) or _NUMBERED_QUESTION.match(line)
+        if header:
+            if current:
+                blocks.append(current)
+            question_text = header.group(2).strip()
+            current = {'lines': [question_text] if question_text else [], 'header': True}
+            continue
+        if current is None:
+            current = {'lines': [], 'header': False}
+        current['lines'].append(line)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _parse_block(lines):
+    question_text, answers, labels, answer_key = None, [], [], None
+    for line in lines:
+        key = _ANSWER_KEY.match(line)
+        if key and answers:
+            answer_key = key.group(1).upper()
+            continue
+        if question_text is None:
+            question_text = line
+            continue
+        label, answer_text, is_correct = _split_answer(line)
+        # Unlabelled answers are lettered by position, for "Correct answer: B" lines
+        labels.append(label or 'ABCDEFGH'[min(len(answers), 7)])
+        answers.append({'text': answer_text, 'is_correct': is_correct})
+
+    if answer_key and not any(answer['is_correct'] for answer in answers):
+        for label, answer in zip(labels, answers):
+            answer['is_correct'] = label == answer_key
+    return question_text, answers
+
+
+def validate_question(question_text, answers):
+    """
+    Return the reason a parsed question is unusable, or None if it is fine.
+    """
+    if not question_text:
+        return "no question text"
+    if len(answers) < 2:
+        return f"{len(answers)} answer(s)"
+    if any(not answer['text'] for answer in answers):
+        return "empty answer"
+    correct = sum(answer['is_correct'] for answer in answers)
+    if correct != 1:
+        return f"{correct} correct answers"
+    return None
+
+
+def parse_quiz_text(questions_text):
+    """
+    Parse LLM output into [{'question': ..., 'answers': [{'text': ..., 'is_correct': ...}]}].
+    Questions that fail validate_question() are dropped and logged.
+    """
+    questions = []
+    for block in _blocks(questions_text or ''):
+        question_text, answers = _parse_block(block['lines'])
+        problem = validate_question(question_text, answers)
+        if problem is None:
+            questions.append({'question': question_text, 'answers': answers})
+        elif answers:
+            logger.warning("Dropping generated question %r: %s", question_text, problem)
+        else:
+            # Preamble or closing remark rather than a question
+            logger.debug("Ignoring generated text %r", question_text)
+    return questions
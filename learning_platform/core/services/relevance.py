@@ -0,0 +1,149 @@
+"""
+Text relevance scoring, and ranking for YouTube search candidates.
+
+tokenize(), term_counts() and bm25_scores() are the one tokenizer and BM25 used for
+video ranking, transcript chunk selection (transcript_chunker) and catalog search
+(search_index).
+
+Video titles are scored by how many of the topic's terms they contain. Descriptions
+are scored in one batch per search with BM25, so a term's weight comes from how many
+candidates use it and long descriptions don't win by repeating it. Both scores are
+in [0, 1]. rank_videos() orders candidates by a weighted mix of the two with views,
+recency and duration (settings.VIDEO_RANKING_WEIGHTS).
+"""
+import math
+import re
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset("""
+    a about after also an and are as at be because been before but by can could does for from has have
+    how in into is it its just like more not now of on one only or other our out over some than that the
+    their them then there these they this those through to very was were what when where which while who
+    why will with would you your
+""".split())
+
+RECENCY_HALF_LIFE_DAYS = 365
+# Longer videos score lower on duration in proportion to how far over this they run
+PREFERRED_MAX_DURATION = timedelta(minutes=90)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _stem(token):
+    # Just enough to match "decorators" with "decorator"
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """
+    Lowercased, lightly stemmed word tokens, without stopwords unless the text is only stopwords.
+    """
+    tokens = [_stem(token) for token in _TOKEN.findall((text or '').casefold())]
+    content = [token for token in tokens if token not in _STOPWORDS]
+    return content or tokens
+
+
+def term_counts(text):
+    """
+    Counter of tokenize(text), stemming each distinct word once rather than every occurrence.
+    """
+    counts = Counter()
+    for word, count in Counter(_TOKEN.findall((text or '').casefold())).items():
+        if word not in _STOPWORDS:
+            counts[_stem(word)] += count
+    return counts
+
+
+def term_coverage(query, text):
+    """
+    Share of the query's distinct terms that appear in `text`.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return 0.0
+    return len(terms & term_counts(text).keys()) / len(terms)
+
+
+def bm25_scores(terms, counts, capped=False):
+    """
+    BM25 score of each document, given as its term_counts(), for the set of query `terms`, with
+    term weights (IDF) from the documents themselves. Returns the scores and the summed weight of
+    the terms. With `capped`, a term scores at most its weight, reached by one mention in a
+    document of average length.
+    """
+    lengths = [sum(count.values()) for count in counts]
+    average_length = sum(lengths) / len(lengths) if lengths else 0
+    idf = {}
+    for term in terms:
+        frequency = sum(1 for count in counts if term in count)
+        idf[term] = math.log(1 + (len(counts) - frequency + 0.5) / (frequency + 0.5))
+
+    scores = []
+    for count, length in zip(counts, lengths):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (average_length or 1))
+        score = 0.0
+        for term in terms:
+            tf = count.get(term)
+            if tf:
+                saturation = tf * (BM25_K1 + 1) / (tf + norm)
+                score += idf[term] * (min(1.0, saturation) if capped else saturation)
+        scores.append(score)
+    return scores, sum(idf.values())
+
+
+def score_documents(query, documents):
+    """
+    BM25 score of each document for `query`, normalized to [0, 1]: one mention of every query
+    term in a document of average length scores 1. Term weights (IDF) come from `documents`.
+    """
+    terms = set(tokenize(query))
+    if not documents or not terms:
+        return [0.0] * len(documents)
+
+    scores, total_weight = bm25_scores(terms, [term_counts(document) for document in documents], capped=True)
+    return [score / total_weight for score in scores]
+
+
+def _recency(published_at, now):
+    published = parse_datetime(published_at) if isinstance(published_at, str) else published_at
+    if published is None:
+        return 0.0
+    age_days = max(0.0, (now - published).total_seconds() / 86400)
+    return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _duration_fit(duration):
+    if not duration:
+        return 0.0
+    return min(1.0, PREFERRED_MAX_DURATION / duration)
+
+
+def rank_videos(videos, weights=None, now=None):
+    """
+    Sort video dicts (as built by youtube_service) best first and set each one's 'relevance_score'.
+    `weights` override settings.VIDEO_RANKING_WEIGHTS; a component without a weight counts for nothing.
+    Views are scored on a log scale relative to the most viewed candidate.
+    """
+    weights = {**settings.VIDEO_RANKING_WEIGHTS, **(weights or {})}
+    now = now or timezone.now()
+    most_views = max((math.log1p(video['views']) for video in videos), default=0) or 1
+
+    for video in videos:
+        components = {
+            'title': video['title_similarity'],
+            'description': video['desc_similarity'],
+            'views': math.log1p(video['views']) / most_views,
+            'recency': _recency(video['published_at'], now),
+            'duration': _duration_fit(video['duration']),
+        }
+        video['relevance_score'] = round(sum(weights.get(name, 0) * value for name, value in components.items()), 4)
+    return sorted(videos, key=lambda video: (video['relevance_score'], video['views']), reverse=True)
@@ -0,0 +1,351 @@
+"""
+Full-text search over the catalog: courses, learning paths, modules and quiz questions.
+
+Every searchable object has a SearchEntry row (title, body and parent ids), written by
+the signal handlers in core/signals.py once a change commits. On Postgres the rows also
+carry a weighted tsvector with a GIN index, and queries run in the database. On other
+databases (SQLite in development and tests) each process keeps an in-memory inverted
+index built from the rows. A token in the 'shared' cache changes whenever any process
+writes entries; on seeing a new token a process reads just the rows changed since its
+last sync, and deleted objects stay behind as tombstones so they can be dropped too.
+rebuild_index() purges the tombstones and changes a second token, which makes every
+process reload its index from scratch.
+
+Each query word matches the words it is a prefix of ("pyth" finds "Python"). A hit must
+match every query word.
+"""
+import bisect
+import heapq
+import logging
+import math
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Course, LearningPath, Module, Question, SearchEntry
+from .relevance import tokenize
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'shared'
+VERSION_KEY = 'search:version'
+GENERATION_KEY = 'search:generation'
+# How often a process looks for other processes' changes, and how far back it re-reads
+# rows to cover writes that were in flight during its last sync
+CHECK_INTERVAL = 1.0
+SYNC_OVERLAP = timedelta(seconds=5)
+
+TITLE_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.5  # A prefix match counts for less than the whole word
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 200
+
+KINDS = {
+    Course: SearchEntry.KIND_COURSE,
+    LearningPath: SearchEntry.KIND_LEARNING_PATH,
+    Module: SearchEntry.KIND_MODULE,
+    Question: SearchEntry.KIND_QUESTION,
+}
+
+
+def _document(instance):
+    """
+    (title, body, context) indexed for a catalog object.
+    """
+    if isinstance(instance, Course):
+        return instance.course_name, instance.description, {}
+    if isinstance(instance, LearningPath):
+        return instance.path_name, '', {'course_id': instance.course_id}
+    if isinstance(instance, Module):
+        return instance.module_name, instance.topic, {'learning_path_id': instance.learning_path_id}
+    if isinstance(instance, Question):
+        return instance.question_text, '', {'quiz_id': instance.quiz_id, 'module_id': instance.quiz.module_id}
+    raise TypeError(f"{type(instance).__name__} is not searchable")
+
+
+def _use_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def _search_vector():
+    return SearchVector('title', weight='A', config='simple') + SearchVector('body', weight='B', config='simple')
+
+
+class _MemoryIndex:
+    """
+    Inverted index of SearchEntry rows for one process: term -> {(kind, id): weight}.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.postings = {}
+        self.documents = {}  # (kind, id) -> (title, context, {term: weight})
+        self.vocabulary = []  # Sorted terms, for prefix lookups
+        self.version = None
+        self.generation = None
+        self.synced_at = None
+        self.checked_at = 0.0
+
+    def add(self, entry, keep_sorted=True):
+        key = (entry.kind, entry.object_id)
+        self.remove(key)
+        if entry.deleted:
+            return
+        terms = {}
+        for term in tokenize(entry.body):
+            terms[term] = BODY_WEIGHT
+        for term in tokenize(entry.title):
+            terms[term] = TITLE_WEIGHT
+        self.documents[key] = (entry.title, entry.context, terms)
+        for term, weight in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                if keep_sorted:
+                    bisect.insort(self.vocabulary, term)
+            posting[key] = weight
+
+    def remove(self, key):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        for term in document[2]:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+                position = bisect.bisect_left(self.vocabulary, term)
+                if position < len(self.vocabulary) and self.vocabulary[position] == term:
+                    del self.vocabulary[position]
+
+    def load(self, entries):
+        for entry in entries:
+            self.add(entry, keep_sorted=False)
+        self.vocabulary = sorted(self.postings)
+
+    def sync(self):
+        """
+        Bring the index up to date with other processes' writes (at most once per CHECK_INTERVAL).
+        """
+        now = time.monotonic()
+        if self.synced_at is not None and now - self.checked_at < CHECK_INTERVAL:
+            return
+        self.checked_at = now
+        tokens = caches[CACHE_ALIAS].get_many([VERSION_KEY, GENERATION_KEY])
+        version, generation = tokens.get(VERSION_KEY), tokens.get(GENERATION_KEY)
+        if self.synced_at is not None and version == self.version:
+            return
+
+        started = timezone.now()
+        if self.synced_at is None or generation != self.generation:
+            self.reset()
+            self.checked_at = now
+            self.load(SearchEntry.objects.filter(deleted=False).iterator(chunk_size=5000))
+            logger.info("Loaded search index: %d entries, %d terms", len(self.documents), len(self.postings))
+        else:
+            for entry in SearchEntry.objects.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP):
+                self.add(entry)
+        self.version = version
+        self.generation = generation
+        self.synced_at = started
+
+    def _matches(self, word):
+        """
+        {term: factor} for the indexed terms `word` matches, the whole word first.
+        """
+        if len(word) < MIN_PREFIX_LENGTH:
+            return {word: 1.0} if word in self.postings else {}
+        matches = {}
+        position = bisect.bisect_left(self.vocabulary, word)
+        while position < len(self.vocabulary) and len(matches) < MAX_PREFIX_EXPANSIONS:
+            term = self.vocabulary[position]
+            if not term.startswith(word):
+                break
+            matches[term] = 1.0 if term == word else PREFIX_WEIGHT
+            position += 1
+        return matches
+
+    def _idf(self, term):
+        return math.log(1 + len(self.documents) / len(self.postings[term]))
+
+    def _expand(self, word):
+        """
+        [(posting, boost)] for the terms `word` matches; a document's score for the word is
+        its best weight * boost over them.
+        """
+        return [(self.postings[term], self._idf(term) * factor) for term, factor in self._matches(word).items()]
+
+    def search(self, words, kinds, offset, limit):
+        expansions = [self._expand(word) for word in words]
+        if not all(expansions):
+            return 0, []
+
+        # Collect candidates from the word with the fewest postings, then look each candidate
+        # up in the other words' postings
+        expansions.sort(key=lambda postings: sum(len(posting) for posting, _ in postings))
+        scores = {}
+        for posting, boost in expansions[0]:
+            if not scores:
+                scores = {key: weight * boost for key, weight in posting.items()}
+                continue
+            for key, weight in posting.items():
+                score = weight * boost
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+        if kinds:
+            scores = {key: score for key, score in scores.items() if key[0] in kinds}
+
+        for postings in expansions[1:]:
+            if len(postings) == 1:
+                (posting, boost), = postings
+                scores = {key: score + posting[key] * boost for key, score in scores.items() if key in posting}
+                continue
+            narrowed = {}
+            for key, score in scores.items():
+                best = 0.0
+                for posting, boost in postings:
+                    weight = posting.get(key)
+                    if weight is not None and weight * boost > best:
+                        best = weight * boost
+                if best:
+                    narrowed[key] = score + best
+            scores = narrowed
+
+        top = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        hits = []
+        for (kind, object_id), score in top[offset:]:
+            title, context, _ = self.documents[(kind, object_id)]
+            hits.append({'type': kind, 'id': object_id, 'title': title, 'score': round(score, 4), **context})
+        return len(scores), hits
+
+
+_index = _MemoryIndex()
+
+
+def _bump_version():
+    caches[CACHE_ALIAS].set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _changed(entries):
+    # Visible to this process at once; other processes pick the change up from the new token
+    _bump_version()
+    if not _use_postgres():
+        with _index.lock:
+            if _index.synced_at is not None:
+                for entry in entries:
+                    _index.add(entry)
+
+
+def _write_entries(instances):
+    now = timezone.now()
+    entries = []
+    for instance in instances:
+        title, body, context = _document(instance)
+        entries.append(SearchEntry(
+            kind=KINDS[type(instance)], object_id=instance.pk, title=title, body=body, context=context,
+            deleted=False, updated_at=now,
+        ))
+    if not entries:
+        return entries
+    SearchEntry.objects.bulk_create(
+        entries, batch_size=1000, update_conflicts=True, unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body', 'context', 'deleted', 'updated_at'],
+    )
+    if _use_postgres():
+        for kind in {entry.kind for entry in entries}:
+            SearchEntry.objects.filter(
+                kind=kind, object_id__in=[entry.object_id for entry in entries if entry.kind == kind]
+            ).update(search_vector=_search_vector())
+    return entries
+
+
+def index_objects(instances):
+    """
+    Create or update the search entries for catalog objects (any mix of searchable models).
+    """
+    entries = _write_entries(instances)
+    if entries:
+        _changed(entries)
+
+
+def remove_object(model, object_id):
+    """
+    Mark the entry of a deleted catalog object as deleted.
+    """
+    kind = KINDS[model]
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).update(deleted=True, updated_at=timezone.now())
+    _changed([SearchEntry(kind=kind, object_id=object_id, title='', deleted=True)])
+
+
+def rebuild_index(batch_size=2000):
+    """
+    Re-create every entry from the catalog tables and drop tombstones. Returns the number of entries.
+    Needed after bulk_create/update or raw SQL, which send no signals.
+    """
+    SearchEntry.objects.filter(deleted=True).delete()
+    querysets = [
+        Course.objects.all(), LearningPath.objects.all(), Module.objects.all(),
+        Question.objects.select_related('quiz').only('question_text', 'quiz_id', 'quiz__module_id'),
+    ]
+    count = 0
+    for queryset in querysets:
+        model = queryset.model
+        SearchEntry.objects.filter(kind=KINDS[model]).exclude(
+            object_id__in=model.objects.values('pk')
+        ).delete()
+        batch = []
+        for instance in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) == batch_size:
+                count += len(_write_entries(batch))
+                batch = []
+        count += len(_write_entries(batch))
+    caches[CACHE_ALIAS].set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+    _bump_version()
+    with _index.lock:
+        _index.reset()  # Reloaded on the next search
+    return count
+
+
+def _search_postgres(words, kinds, offset, limit):
+    query = SearchQuery(' & '.join(f"{word}:*" for word in words), search_type='raw', config='simple')
+    entries = SearchEntry.objects.filter(deleted=False, search_vector=query)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    total = entries.count()
+    rows = entries.annotate(rank=SearchRank(F('search_vector'), query)).order_by(
+        '-rank', 'kind', 'object_id'
+    ).values('kind', 'object_id', 'title', 'context', 'rank')[offset:offset + limit]
+    hits = [
+        {'type': row['kind'], 'id': row['object_id'], 'title': row['title'], 'score': round(row['rank'], 4),
+         **row['context']}
+        for row in rows
+    ]
+    return total, hits
+
+
+def search(query, kinds=None, offset=0, limit=20):
+    """
+    Ranked catalog search. `kinds` restricts the hits to some SearchEntry kinds.
+    Returns (total number of hits, the hits from `offset`, at most `limit` of them).
+    """
+    words = list(dict.fromkeys(tokenize(query)))
+    if not words:
+        return 0, []
+    kinds = set(kinds or ())
+    if _use_postgres():
+        return _search_postgres(words, kinds, offset, limit)
+    with _index.lock:
+        _index.sync()
+        return _index.search(words, kinds, offset, limit)
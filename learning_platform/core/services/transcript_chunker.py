@@ -0,0 +1,82 @@
+"""
+Split long transcripts into overlapping, token-bounded chunks and pick the
+ones most relevant to a module, so the prompt size for quiz generation stays
+bounded however long the video is.
+
+Chunks are scored against the module with the tokenizer and BM25 of
+core.services.relevance. Token counts are estimates (about one token per word piece of up to four
+characters, one per punctuation mark), close enough to OpenAI's tokenizer for
+budgeting without shipping one.
+"""
+import math
+import re
+from collections import namedtuple
+
+from .relevance import bm25_scores, term_counts, tokenize
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+Chunk = namedtuple('Chunk', ['index', 'text', 'tokens'])
+
+
+def _piece_tokens(piece):
+    return max(1, math.ceil(len(piece) / 4))
+
+
+def estimate_tokens(text):
+    return sum(_piece_tokens(match.group()) for match in _PIECE.finditer(text or ''))
+
+
+def iter_chunks(text, chunk_tokens=1200, overlap_tokens=150):
+    """
+    Yield Chunks of about `chunk_tokens` tokens, each starting with the last `overlap_tokens`
+    of the previous one. Works through the text piece by piece, holding one chunk at a time.
+    """
+    if overlap_tokens >= chunk_tokens:
+        raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+
+    spans, total, index = [], 0, 0  # (start, end, tokens) of the current chunk's pieces
+    fresh = False  # Whether the current chunk has pieces beyond the carried-over overlap
+    for match in _PIECE.finditer(text or ''):
+        tokens = _piece_tokens(match.group())
+        spans.append((match.start(), match.end(), tokens))
+        total += tokens
+        fresh = True
+        if total < chunk_tokens:
+            continue
+
+        yield Chunk(index, text[spans[0][0]:spans[-1][1]], total)
+        index += 1
+        # Carry the tail over as the start of the next chunk
+        position, kept = len(spans), 0
+        while overlap_tokens and position > 1 and kept < overlap_tokens:
+            position -= 1
+            kept += spans[position][2]
+        spans, total, fresh = spans[position:], kept, False
+
+    if fresh:
+        yield Chunk(index, text[spans[0][0]:spans[-1][1]], total)
+
+
+def query_terms(*texts):
+    return {term for text in texts for term in tokenize(text)}
+
+
+def select_chunks(chunks, query, limit):
+    """
+    Pick up to `limit` chunks, most relevant to the `query` terms first (BM25 over the chunks),
+    returned in transcript order.
+    Without any matching term the picks are spread evenly over the transcript.
+    """
+    chunks = list(chunks)
+    if len(chunks) <= limit:
+        return chunks
+
+    scores, _ = bm25_scores(query, [term_counts(chunk.text) for chunk in chunks])
+
+    if not any(scores):
+        step = len(chunks) / limit
+        return [chunks[int(step * position + step / 2)] for position in range(limit)]
+
+    ranked = sorted(range(len(chunks)), key=lambda position: (-scores[position], position))[:limit]
+    return [chunks[position] for position in sorted(ranked)]
@@ -0,0 +1,59 @@
+import threading
+
+import httplib2
+from decouple import config
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+HTTP_TIMEOUT = 10  # seconds
+# Retries for request.execute(); googleapiclient backs off exponentially on 429, 5xx and connection errors
+NUM_RETRIES = 2
+
+_discovery_document = None
+_discovery_lock = threading.Lock()
+
+# httplib2.Http (and therefore a built client) is not thread-safe, so each
+# thread keeps its own client. The Http object holds keep-alive connections.
+_local = threading.local()
+_generation = 0
+
+
+def _get_discovery_document():
+    """
+    Load the YouTube v3 discovery document bundled with google-api-python-client, once per process.
+    """
+    global _discovery_document
+    if _discovery_document is None:
+        with _discovery_lock:
+            if _discovery_document is None:
+                _discovery_document = get_static_doc('youtube', 'v3')
+    return _discovery_document
+
+
+def get_youtube_client():
+    """
+    Return this thread's YouTube Data API client, building it on first use.
+    The API key (and YOUTUBE_API_ENDPOINT, for pointing at a stand-in server) is read here
+    rather than at import time.
+    """
+    client = getattr(_local, 'client', None)
+    if client is None or _local.generation != _generation:
+        endpoint = config('YOUTUBE_API_ENDPOINT', default=None)
+        client = build_from_document(
+            _get_discovery_document(),
+            developerKey=config('YOUTUBE_API_KEY', default=None),
+            http=httplib2.Http(timeout=HTTP_TIMEOUT),
+            client_options={'api_endpoint': endpoint} if endpoint else None,
+        )
+        _local.client = client
+        _local.generation = _generation
+    return client
+
+
+def reset_youtube_clients():
+    """
+    Drop cached clients (e.g. after the API key changes); each thread rebuilds on next use.
+    """
+    global _generation
+    with _discovery_lock:
+        _generation += 1
@@ -0,0 +1,124 @@
+"""
+YouTube Data API quota accounting.
+
+The API grants a fixed number of units per day; search().list costs 100 and
+videos().list costs 1. The budget is a token bucket in the ApiQuota table, so web and
+worker processes all draw from the same one. It holds up to a day's units and refills
+continuously at a day's units per 24 hours. Background work may only spend down to
+YOUTUBE_QUOTA_RESERVE units, leaving the rest for interactive requests.
+"""
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import ApiQuota, BackgroundJob, EnrichmentJob
+
+logger = logging.getLogger(__name__)
+
+BUCKET = 'youtube'
+SEARCH_COST = 100
+VIDEOS_LIST_COST = 1
+DAY = 86400  # seconds
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _limits():
+    capacity = getattr(settings, 'YOUTUBE_QUOTA_UNITS_PER_DAY', 10_000)
+    reserve = getattr(settings, 'YOUTUBE_QUOTA_RESERVE', 2_000)
+    return capacity, min(reserve, capacity)
+
+
+def _refilled(bucket, capacity, now):
+    elapsed = max(0.0, (now - bucket.refilled_at).total_seconds())
+    return min(capacity, bucket.tokens + elapsed * capacity / DAY)
+
+
+def _floor(priority, reserve):
+    # Tokens that must be left in the bucket after a call at this priority
+    return reserve if priority >= BackgroundJob.PRIORITY_BACKGROUND else 0
+
+
+def _wait(tokens, units, priority, capacity, reserve):
+    missing = _floor(priority, reserve) + units - tokens
+    if missing <= 0:
+        return 0.0
+    return min(DAY, missing * DAY / capacity)
+
+
+def _locked_bucket(capacity, now):
+    bucket = ApiQuota.objects.select_for_update().filter(name=BUCKET).first()
+    if bucket is None:
+        try:
+            with transaction.atomic():
+                return ApiQuota.objects.create(name=BUCKET, capacity=capacity, tokens=capacity, refilled_at=now)
+        except IntegrityError:
+            # Another process created it first
+            bucket = ApiQuota.objects.select_for_update().get(name=BUCKET)
+    return bucket
+
+
+def consume(units, priority=BackgroundJob.PRIORITY_INTERACTIVE):
+    """
+    Take `units` from the shared budget before making API calls. Raises QuotaExceeded, with
+    the seconds until enough units will have refilled, if the budget can't cover them.
+    """
+    capacity, reserve = _limits()
+    now = timezone.now()
+    with transaction.atomic():
+        bucket = _locked_bucket(capacity, now)
+        tokens = _refilled(bucket, capacity, now)
+        wait = _wait(tokens, units, priority, capacity, reserve)
+        if wait:
+            raise QuotaExceeded(
+                f"YouTube quota too low: {units} unit(s) needed, {tokens:.0f} left", retry_after=wait
+            )
+        bucket.tokens = tokens - units
+        bucket.capacity = capacity
+        bucket.refilled_at = now
+        bucket.save(update_fields=['tokens', 'capacity', 'refilled_at'])
+    logger.debug("Spent %d YouTube quota unit(s), %.0f left", units, bucket.tokens)
+    return bucket.tokens
+
+
+def _remaining(capacity, now):
+    bucket = ApiQuota.objects.filter(name=BUCKET).first()
+    return capacity if bucket is None else _refilled(bucket, capacity, now)
+
+
+def wait_time(units, priority=BackgroundJob.PRIORITY_INTERACTIVE):
+    """
+    Seconds until `units` could be spent at `priority` (0 if they can be now). Does not spend anything.
+    """
+    capacity, reserve = _limits()
+    return _wait(_remaining(capacity, timezone.now()), units, priority, capacity, reserve)
+
+
+def get_quota_status():
+    """
+    Remaining budget and the enrichment work waiting on it.
+    """
+    capacity, reserve = _limits()
+    now = timezone.now()
+    remaining = _remaining(capacity, now)
+    pending = EnrichmentJob.objects.filter(status=EnrichmentJob.STATUS_PENDING).aggregate(
+        interactive=Count('pk', filter=Q(priority__lt=BackgroundJob.PRIORITY_BACKGROUND)),
+        background=Count('pk', filter=Q(priority__gte=BackgroundJob.PRIORITY_BACKGROUND)),
+        deferred=Count('pk', filter=Q(run_after__gt=now)),
+    )
+    return {
+        'capacity': capacity,
+        'remaining': int(remaining),
+        'reserve': reserve,
+        'refill_per_hour': round(capacity / 24),
+        'seconds_until_full': round((capacity - remaining) * DAY / capacity),
+        'background_allowed': remaining - SEARCH_COST >= reserve,
+        'pending_jobs': pending,
+    }
@@ -1,113 +1,232 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import logging
-from decouple import config
+import math
 import isodate
 from datetime import datetime, timedelta
-import re
-from difflib import SequenceMatcher
+from . import api_cache, youtube_quota
+from ..metrics import track_external
+from ..models import BackgroundJob
+from .circuit_breaker import CircuitOpenError, get_breaker
+from .relevance import rank_videos, score_documents, term_coverage
+from .youtube_client import NUM_RETRIES, get_youtube_client
 
-# Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-YOUTUBE_API_KEY = config('YOUTUBE_API_KEY')
 
 def calculate_text_similarity(a, b):
     """
-    Calculate similarity between two strings using SequenceMatcher.
+    Share of the terms of `a` (the topic) found in `b`, from 0 to 1.
     """
-    a_clean = re.sub(r'[^\w\s]', '', a.lower())
-    b_clean = re.sub(r'[^\w\s]', '', b.lower())
-    return SequenceMatcher(None, a_clean, b_clean).ratio()
+    return term_coverage(a, b)
+
+# videos().list accepts at most 50 comma-separated ids per call
+VIDEO_DETAILS_BATCH_SIZE = 50
+SEARCH_MAX_RESULTS = 20
+
 
-def get_youtube_videos(topic, max_results=10, similarity_threshold=0.6):
+def search_quota_cost(topic_count):
     """
-    Search YouTube videos with strict language and relevance filtering.
+    Quota units a search for this many topics can cost: one search per topic, plus the
+    details lookups for every hit, 50 ids at a time.
+    """
+    details_calls = math.ceil(topic_count * SEARCH_MAX_RESULTS / VIDEO_DETAILS_BATCH_SIZE)
+    return topic_count * youtube_quota.SEARCH_COST + details_calls * youtube_quota.VIDEOS_LIST_COST
+
+
+def _search_video_ids(youtube, topic):
+    """
+    Run the search for a topic and return the video ids of the hits, in ranking order.
     """
     current_year = datetime.now().year
     published_after = f"{current_year - 2}-01-01T00:00:00Z"  # Limit to last 2 years
 
-    try:
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
-        all_videos = []
-
-        # Define primary language and region filters
-        relevance_language = 'en'  # English language content
-        primary_region = 'US'      # United States region
-
-        request = youtube.search().list(
-            q=topic,
-            part='snippet',
-            maxResults=20,
-            order='relevance',
-            videoDuration='long',  # Videos longer than 20 minutes
-            type='video',
-            publishedAfter=published_after,
-            relevanceLanguage=relevance_language,
-            regionCode=primary_region
-        )
-
-        response = request.execute()
-        
-        for item in response.get('items', []):
-            try:
-                video_id = item['id']['videoId']
-
-                # Fetch video details
-                video_details = youtube.videos().list(
-                    part='contentDetails,snippet,statistics',
-                    id=video_id
-                ).execute()
-
-                details = video_details['items'][0]
-
-                duration_str = details['contentDetails']['duration']
-                duration = isodate.parse_duration(duration_str) if duration_str else None
-
-                if not duration:
-                    continue
-
-                # Extract video details
-                title = details['snippet']['title']
-                description = details['snippet']['description']
-                channel_title = details['snippet']['channelTitle']
-                published_at = details['snippet']['publishedAt']
-                views = int(details['statistics'].get('viewCount', 0))
-
-                # Calculate similarity
-                title_similarity = calculate_text_similarity(topic, title)
-                desc_similarity = calculate_text_similarity(topic, description)
-
-                if title_similarity < similarity_threshold and desc_similarity < similarity_threshold:
-                    continue
-
-                video_info = {
-                    'title': title,
-                    'description': description,
-                    'videoId': video_id,
-                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                    'duration': duration,
-                    'views': views,
-                    'channel_title': channel_title,
-                    'published_at': published_at,
-                    'title_similarity': title_similarity,
-                    'desc_similarity': desc_similarity
-                }
-                all_videos.append(video_info)
-            except Exception as e:
-                logger.warning(f"Error processing video: {e}")
-
-        # Return top results sorted by views and relevance
-        sorted_videos = sorted(all_videos, key=lambda x: (x['views'], x['title_similarity']), reverse=True)
-        return sorted_videos[:max_results]
+    # Define primary language and region filters
+    relevance_language = 'en'  # English language content
+    primary_region = 'US'      # United States region
+
+    request = youtube.search().list(
+        q=topic,
+        part='snippet',
+        maxResults=SEARCH_MAX_RESULTS,
+        order='relevance',
+        videoDuration='long',  # Videos longer than 20 minutes
+        type='video',
+        publishedAfter=published_after,
+        relevanceLanguage=relevance_language,
+        regionCode=primary_region
+    )
+
+    with track_external('youtube'):
+        response = request.execute(num_retries=NUM_RETRIES)
+    return [item['id']['videoId'] for item in response.get('items', []) if item.get('id', {}).get('videoId')]
 
+
+def _fetch_video_details(youtube, video_ids):
+    """
+    Fetch details for many videos with one videos().list call per 50 ids.
+    Returns a dict of video id -> details item.
+    """
+    details_by_id = {}
+    for start in range(0, len(video_ids), VIDEO_DETAILS_BATCH_SIZE):
+        batch = video_ids[start:start + VIDEO_DETAILS_BATCH_SIZE]
+        with track_external('youtube'):
+            response = youtube.videos().list(
+                part='contentDetails,snippet,statistics',
+                id=','.join(batch),
+                maxResults=len(batch)
+            ).execute(num_retries=NUM_RETRIES)
+        for item in response.get('items', []):
+            # Deleted or private videos are left out of the response, so an item's position
+            # says nothing about which id it answers; skip the rare item that has no id
+            if not item.get('id'):
+                logger.warning(
+                    "Skipping YouTube video details without an id: %r", item.get('snippet', {}).get('title')
+                )
+                continue
+            details_by_id[item['id']] = item
+    return details_by_id
+
+
+def _build_video_info(topic, video_id, details):
+    """
+    Turn a videos().list item into our video dict, or None if it has no duration.
+    """
+    duration_str = details['contentDetails']['duration']
+    duration = isodate.parse_duration(duration_str) if duration_str else None
+
+    if not duration:
+        return None
+
+    # Extract video details
+    title = details['snippet']['title']
+    description = details['snippet']['description']
+    channel_title = details['snippet']['channelTitle']
+    published_at = details['snippet']['publishedAt']
+    views = int(details['statistics'].get('viewCount', 0))
+
+    return {
+        'title': title,
+        'description': description,
+        'videoId': video_id,
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'duration': duration,
+        'views': views,
+        'channel_title': channel_title,
+        'published_at': published_at,
+        'title_similarity': calculate_text_similarity(topic, title),
+    }
+
+
+def _rank_videos(topic, video_ids, details_by_id, max_results, similarity_threshold):
+    all_videos = []
+    for video_id in video_ids:
+        details = details_by_id.get(video_id)
+        if details is None:
+            continue
+        try:
+            video_info = _build_video_info(topic, video_id, details)
+        except Exception as e:
+            logger.warning("Error processing video: %s", e)
+            continue
+        if video_info:
+            all_videos.append(video_info)
+
+    # Descriptions are scored together: term weights depend on the whole candidate set
+    desc_scores = score_documents(topic, [video['description'] for video in all_videos])
+    relevant = []
+    for video, desc_similarity in zip(all_videos, desc_scores):
+        video['desc_similarity'] = desc_similarity
+        if video['title_similarity'] >= similarity_threshold or desc_similarity >= similarity_threshold:
+            relevant.append(video)
+    return rank_videos(relevant)[:max_results]
+
+
+def get_youtube_videos(topic, max_results=10, similarity_threshold=0.6, raise_errors=False,
+                       priority=BackgroundJob.PRIORITY_INTERACTIVE):
+    """
+    Search YouTube videos with strict language and relevance filtering.
+    """
+    return get_youtube_videos_for_topics(
+        [topic], max_results, similarity_threshold, raise_errors, priority
+    ).get(topic, [])
+
+
+def _search_uncached(topics, cache_ids, max_results, similarity_threshold):
+    youtube = get_youtube_client()
+
+    results = {}
+    ids_by_topic = {}
+    for topic in topics:
+        try:
+            ids_by_topic[topic] = _search_video_ids(youtube, topic)
+        except HttpError as e:
+            # A rejected query only fails its own topic; outages and quota errors fail the call
+            if e.resp.status >= 500 or e.resp.status in (403, 429):
+                raise
+            logger.error("YouTube API error searching %r: %s", topic, e)
+            results[topic] = []
+
+    unique_ids = list(dict.fromkeys(video_id for ids in ids_by_topic.values() for video_id in ids))
+    details_by_id = _fetch_video_details(youtube, unique_ids) if unique_ids else {}
+
+    for topic, video_ids in ids_by_topic.items():
+        videos = _rank_videos(topic, video_ids, details_by_id, max_results, similarity_threshold)
+        api_cache.store('youtube_search', cache_ids[topic], videos, negative=not videos)
+        results[topic] = videos
+    return results
+
+
+def get_youtube_videos_for_topics(topics, max_results=10, similarity_threshold=0.6, raise_errors=False,
+                                  priority=BackgroundJob.PRIORITY_INTERACTIVE):
+    """
+    Search YouTube for several topics at once.
+    Video ids are de-duplicated across topics so each video's details are fetched once,
+    50 per request. Cached topics are served without an API call; the others are charged
+    to the shared quota at `priority` first.
+    Returns a dict of topic -> ranked video list. Failed lookups come back empty, or raise
+    with `raise_errors` (CircuitOpenError while the API keeps failing, QuotaExceeded when
+    the quota can't cover the search).
+    """
+    results = {}
+    cache_ids = {}
+    for topic in dict.fromkeys(topics):
+        cache_ids[topic] = f"{api_cache.normalize_topic(topic)}|{max_results}|{similarity_threshold}"
+        found, videos = api_cache.lookup('youtube_search', cache_ids[topic])
+        if found:
+            results[topic] = videos or []
+
+    uncached = [topic for topic in cache_ids if topic not in results]
+    if not uncached:
+        return results
+
+    breaker = get_breaker('youtube')
+    try:
+        # Nothing is charged while the circuit is open, as no call would be made. The quota is
+        # charged outside the breaker: running out of it says nothing about the API's health
+        if breaker.is_open():
+            raise CircuitOpenError("youtube is unavailable (circuit open)")
+        youtube_quota.consume(search_quota_cost(len(uncached)), priority)
+        results.update(breaker.call(
+            _search_uncached, uncached, cache_ids, max_results, similarity_threshold
+        ))
+        return results
+    except youtube_quota.QuotaExceeded as e:
+        if raise_errors:
+            raise
+        logger.warning("Skipping YouTube search: %s", e)
+    except CircuitOpenError as e:
+        if raise_errors:
+            raise
+        logger.warning("Skipping YouTube search: %s", e)
     except HttpError as e:
-        logger.error(f"YouTube API error: {e}")
-        return []
+        if raise_errors:
+            raise
+        logger.error("YouTube API error: %s", e)
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        return []
+        if raise_errors:
+            raise
+        logger.exception("Unexpected error fetching YouTube videos")
+    # Failed lookups are not cached
+    return {**{topic: [] for topic in uncached}, **results}
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Answer, Course, CourseProgress, LearningPath, LearningPathProgress, Module, ModuleProgress, Question, Quiz,
+)
+from .services.dashboard_service import invalidate_dashboard, invalidate_dashboards
+from .services.navigation import invalidate_navigation
+from .services.quiz_cache import invalidate_quiz
+from .services.search_index import index_objects, remove_object
+
+
+def _invalidate_after_commit(quiz_id):
+    # Drop the entry once the change is visible to other processes
+    if quiz_id is not None:
+        transaction.on_commit(lambda: invalidate_quiz(quiz_id))
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_compiled_quiz(sender, instance, **kwargs):
+    _invalidate_after_commit(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_compiled_quiz_for_question(sender, instance, **kwargs):
+    _invalidate_after_commit(instance.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=Answer)
+def invalidate_compiled_quiz_for_answer(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(pk=instance.question_id).values_list('quiz_id', flat=True).first()
+    _invalidate_after_commit(quiz_id)
+
+
+@receiver(post_delete, sender=ModuleProgress)
+@receiver(post_delete, sender=LearningPathProgress)
+@receiver(post_delete, sender=CourseProgress)
+def invalidate_dashboard_on_delete(sender, instance, **kwargs):
+    # Saves are covered by the models' calculate_progress(); deletes are not
+    invalidate_dashboard(instance.user_id)
+
+
+def _users_if_renamed(progress_model, created, update_fields, name_field, **lookup):
+    # Dashboards show names; without update_fields, any field may have changed
+    if created or (update_fields is not None and name_field not in update_fields):
+        return []
+    return progress_model.objects.filter(**lookup).values_list('user_id', flat=True)
+
+
+@receiver(post_save, sender=Course)
+def invalidate_dashboards_for_course(sender, instance, created, update_fields, **kwargs):
+    invalidate_dashboards(_users_if_renamed(CourseProgress, created, update_fields, 'course_name', course=instance))
+
+
+@receiver(post_save, sender=LearningPath)
+def invalidate_dashboards_for_path(sender, instance, created, update_fields, **kwargs):
+    invalidate_dashboards(
+        _users_if_renamed(LearningPathProgress, created, update_fields, 'path_name', learning_path=instance)
+    )
+
+
+@receiver(post_save, sender=Module)
+def invalidate_dashboards_for_module(sender, instance, created, update_fields, **kwargs):
+    invalidate_dashboards(_users_if_renamed(ModuleProgress, created, update_fields, 'module_name', module=instance))
+
+
+@receiver(pre_save, sender=LearningPath)
+def remember_course_of_path(sender, instance, **kwargs):
+    # A path moved to another course leaves the old course's navigation too
+    instance._previous_course_id = (
+        LearningPath.objects.filter(pk=instance.pk).values_list('course_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=LearningPath)
+def invalidate_navigation_for_path(sender, instance, **kwargs):
+    invalidate_navigation(instance.course_id, getattr(instance, '_previous_course_id', None))
+
+
+@receiver(pre_save, sender=Module)
+def remember_course_of_module(sender, instance, **kwargs):
+    # A module moved to a path of another course leaves the old course's navigation too
+    instance._previous_course_id = (
+        Module.objects.filter(pk=instance.pk).values_list('learning_path__course_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Module)
+def invalidate_navigation_for_module(sender, instance, **kwargs):
+    course_id = LearningPath.objects.filter(pk=instance.learning_path_id).values_list('course_id', flat=True).first()
+    invalidate_navigation(course_id, getattr(instance, '_previous_course_id', None))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=LearningPath)
+@receiver(post_save, sender=Module)
+@receiver(post_save, sender=Question)
+def update_search_entry(sender, instance, **kwargs):
+    transaction.on_commit(lambda: index_objects([instance]))
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=LearningPath)
+@receiver(post_delete, sender=Module)
+@receiver(post_delete, sender=Question)
+def remove_search_entry(sender, instance, **kwargs):
+    object_id = instance.pk  # Cleared once the delete finishes
+    transaction.on_commit(lambda: remove_object(sender, object_id))
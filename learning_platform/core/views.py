@@ -2,12 +2,13 @@ from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from django.db.models import Q
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.permissions import IsAuthenticated
-from .models import Course, LearningPath, Module, Quiz, Question, Answer, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress
-from .serializers import CourseSerializer, LearningPathSerializer, ModuleSerializer, QuizSerializer, UserSerializer, ModuleProgressSerializer, QuizProgressSerializer, CourseProgressSerializer, LearningPathProgressSerializer
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from .models import Course, LearningPath, Module, Quiz, Question, Answer, QuizGenerationJob, SearchEntry, ModuleProgress, QuizProgress, CourseProgress, LearningPathProgress, QuestionResponse
+from .serializers import CourseSerializer, LearningPathSerializer, ModuleSerializer, QuizSerializer, UserSerializer, ModuleProgressSerializer, QuizProgressSerializer, CourseProgressSerializer, LearningPathProgressSerializer, QuizGenerationJobSerializer, get_query_list
 from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
@@ -26,9 +27,17 @@ from django.utils import timezone
 from django.db.models import Prefetch
 from rest_framework.exceptions import NotFound
 from rest_framework.decorators import action
-from .services.quiz_generation_service import (
-    fetch_video_transcript, fetch_video_description, generate_quiz_with_chat_api, generate_default_quiz, generate_quiz_from_module
-)
+from .pagination import PositionPagination
+from .services.quiz_job_service import enqueue_quiz_generation
+from .services.quiz_grading import grade_answers, calculate_score
+from .services.quiz_cache import get_compiled_quiz, get_answer_key, render_quiz, etag
+from .services.dashboard_service import get_dashboard, profile_progress_data
+from .services.progress_service import record_module_progress, record_quiz_score
+from .services.progress_events import apply_progress_events
+from .services.youtube_quota import get_quota_status
+from .services.navigation import get_navigation
+from .services.search_index import search
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 import logging
 logger = logging.getLogger(__name__)
 
@@ -167,21 +176,32 @@ class PasswordResetConfirmView(APIView):
 
 # Course ViewSet
 class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+    queryset = Course.objects.prefetch_related('learning_paths__modules')
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]  # Protecting this route
 
 # Learning Path ViewSet
 class LearningPathViewSet(viewsets.ModelViewSet):
-    queryset = LearningPath.objects.all()
+    queryset = LearningPath.objects.prefetch_related('modules')
     serializer_class = LearningPathSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PositionPagination
 
 # Module ViewSet
 class ModuleViewSet(viewsets.ModelViewSet):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PositionPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Lists only render quizzes with ?expand=quizzes
+        if self.action != 'list' or 'quizzes' in get_query_list(self.request, 'expand'):
+            queryset = queryset.prefetch_related(
+                Prefetch('quizzes', queryset=Quiz.objects.prefetch_related('questions__answers'))
+            )
+        return queryset
 
 # Quiz ViewSet
 class QuizViewSet(viewsets.ModelViewSet):
@@ -189,23 +209,41 @@ class QuizViewSet(viewsets.ModelViewSet):
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Lists only render questions with ?expand=questions
+        if self.action != 'list' or 'questions' in get_query_list(self.request, 'expand'):
+            queryset = queryset.prefetch_related('questions__answers')
+        return queryset
+
+    def retrieve(self, request, pk=None):
+        """
+        Serve the compiled quiz from the shared cache, with an ETag for conditional requests.
+        """
+        compiled_quiz = get_compiled_quiz(pk) if str(pk).isdigit() else None
+        if compiled_quiz is None:
+            raise NotFound("Quiz not found")
+
+        quiz_etag = etag(compiled_quiz)
+        if quiz_etag in request.headers.get('If-None-Match', ''):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': quiz_etag})
+        return Response(render_quiz(compiled_quiz), headers={'ETag': quiz_etag})
+
 # Module Progress ViewSet
 class ModuleProgressViewSet(viewsets.ModelViewSet):
-    queryset = ModuleProgress.objects.all()
+    queryset = ModuleProgress.objects.select_related('user', 'module')
     serializer_class = ModuleProgressSerializer
     permission_classes = [IsAuthenticated]
+    progress_fields = ('video_watched', 'quiz_completed', 'score')
 
     @action(detail=True, methods=['patch'], url_path='update-progress')
     def update_progress(self, request, pk=None):
         user = request.user
         module = Module.objects.get(pk=pk)
-        
-        # Use `update_or_create` to ensure progress exists
-        progress, created = ModuleProgress.objects.update_or_create(
-            user=user,
-            module=module,
-            defaults=request.data  # Pass data to update fields
-        )
+
+        # Upsert only the fields a client may set, then roll up in the same transaction
+        fields = {key: request.data[key] for key in self.progress_fields if key in request.data}
+        progress = record_module_progress(user, module.pk, **fields)
 
         return Response(
             ModuleProgressSerializer(progress).data,
@@ -225,7 +263,7 @@ class QuizProgressViewSet(viewsets.ModelViewSet):
         return self.queryset
     
 class LearningPathProgressViewSet(viewsets.ModelViewSet):
-    queryset = LearningPathProgress.objects.all()
+    queryset = LearningPathProgress.objects.select_related('learning_path')
     serializer_class = LearningPathProgressSerializer
     permission_classes = [IsAuthenticated]
 
@@ -256,7 +294,7 @@ class LearningPathProgressViewSet(viewsets.ModelViewSet):
     
 # Course Progress ViewSet
 class CourseProgressViewSet(viewsets.ModelViewSet):
-    queryset = CourseProgress.objects.all()
+    queryset = CourseProgress.objects.select_related('user', 'course')
     serializer_class = CourseProgressSerializer
     permission_classes = [IsAuthenticated]
 
@@ -277,7 +315,7 @@ class CourseProgressViewSet(viewsets.ModelViewSet):
         except CourseProgress.DoesNotExist:
             return Response({"error": "Course progress not found"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            print(f"Error fetching course progress: {e}")
+            logger.exception("Error fetching course progress for course %s", course_id)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -291,14 +329,24 @@ def get_user_profile(request):
         "email": user.email,
     }
 
-    # Fetch course progress data for the user
-    progress_data = CourseProgress.objects.filter(user=user)
-    progress_serialized = CourseProgressSerializer(progress_data, many=True).data
-
-    user_data["progress_data"] = progress_serialized
+    # Course progress comes from the cached dashboard instead of per-row serialization
+    user_data["progress_data"] = profile_progress_data(user, get_dashboard(user))
     return Response(user_data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_dashboard_summary(request):
+    """All of the user's course, learning path and module progress in one response."""
+    user = request.user
+    dashboard = get_dashboard(user)
+    return Response({
+        "username": user.username,
+        "email": user.email,
+        "courses": dashboard["courses"],
+    })
+
+
 
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
@@ -318,38 +366,64 @@ def update_course_progress(request, course_id):
 
     return Response({"message": "Progress updated successfully", "progress": CourseProgressSerializer(progress).data})
 
+def _module_with_quizzes():
+    # Prefetch quizzes and their related questions and answers
+    return Module.objects.prefetch_related(
+        Prefetch('quizzes', queryset=Quiz.objects.prefetch_related('questions__answers'))
+    )
+
+
 @api_view(['GET'])
 def get_module_by_name(request, module_name):
+    """
+    Module with its quizzes, by name. Names are not unique: the earliest module with the name
+    is returned. Use get_module_by_slug to address one module exactly.
+    """
     try:
-         # Prefetch quizzes and their related questions and answers
-        module = Module.objects.prefetch_related(
-            Prefetch(
-                'quizzes',
-                queryset=Quiz.objects.prefetch_related('questions__answers')
-            )
-        ).get(module_name=module_name)
+        module = _module_with_quizzes().filter(module_name=module_name).order_by('id').first()
+        if module is None:
+            return Response({'error': 'Module not found'}, status=status.HTTP_404_NOT_FOUND)
         serializer = ModuleSerializer(module)
         return Response(serializer.data, status=status.HTTP_200_OK)
-    except Module.DoesNotExist:
-        return Response({'error': 'Module not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        # Log the error for debugging
-        print(f"Error fetching module: {str(e)}")
+        logger.exception("Error fetching module %r", module_name)
         return Response({'error': 'An unexpected error occurred'}, status=500)
-    
+
+
+@api_view(['GET'])
+def get_module_by_slug(request, slug):
+    try:
+        module = _module_with_quizzes().get(slug=slug)
+    except Module.DoesNotExist:
+        return Response({'error': 'Module not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ModuleSerializer(module).data, status=status.HTTP_200_OK)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def update_module_progress(request, module_id):
     try:
-        module_progress, created = ModuleProgress.objects.update_or_create(
-            user=request.user, module_id=module_id,
-            defaults={'video_watched': True}
-        )
-        module_progress.calculate_progress()
+        module_progress = record_module_progress(request.user, module_id, video_watched=True)
         return Response(ModuleProgressSerializer(module_progress).data)
     except Module.DoesNotExist:
         return Response({"error": "Module not found"}, status=status.HTTP_404_NOT_FOUND)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_progress_batch(request):
+    """
+    Apply an ordered batch of progress events (for clients syncing after being offline)
+    and return each event's outcome plus the user's resulting progress.
+    """
+    try:
+        results = apply_progress_events(request.user, request.data.get('events'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "results": results,
+        "courses": get_dashboard(request.user)["courses"],
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_module_progress(request):
@@ -357,11 +431,7 @@ def get_module_progress(request):
     Retrieve module progress for the logged-in user for a specific learning path.
     """
     learning_path_id = request.query_params.get('learning_path')  # Get learning path ID from query params
-    print(f"[DEBUG] Received learning_path_id: {learning_path_id}")
-    print(f"[DEBUG] Authenticated User: {request.user}")
-
     if not learning_path_id:
-        print("[DEBUG] Missing learning_path_id")
         return Response({"detail": "Learning path ID is required"}, status=400)
 
     progress = ModuleProgress.objects.filter(
@@ -375,8 +445,11 @@ def get_module_progress(request):
         "quiz_completed"
     )
 
-    print(f"[DEBUG] Module Progress Data for {request.user}: {progress}")
-    return Response(list(progress), status=200)
+    progress = list(progress)
+    logger.debug(
+        "Module progress for user %s in learning path %s: %d rows", request.user.pk, learning_path_id, len(progress)
+    )
+    return Response(progress, status=200)
 
 
 
@@ -386,11 +459,7 @@ def get_module_progress(request):
 def update_quiz_score(request, quiz_id):
     score = request.data.get("score", 0)
     try:
-        quiz_progress, created = QuizProgress.objects.update_or_create(
-            user=request.user, quiz_id=quiz_id,
-            defaults={'score': score}
-        )
-        quiz_progress.calculate_progress()
+        quiz_progress = record_quiz_score(request.user, quiz_id, score)
         return Response(QuizProgressSerializer(quiz_progress).data)
     except Quiz.DoesNotExist:
         return Response({"error": "Quiz not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -402,135 +471,162 @@ def update_quiz_score(request, quiz_id):
 def submit_quiz(request, quiz_id):
     try:
         user = request.user
-        quiz = Quiz.objects.get(id=quiz_id)
-
-        # Log incoming request
-        print(f"User: {user}, Quiz ID: {quiz_id}, Request Data: {request.data}")
+        compiled_quiz = get_compiled_quiz(quiz_id)
+        if compiled_quiz is None:
+            raise Quiz.DoesNotExist
 
         answers = request.data.get('answers', [])
-        total_questions = quiz.questions.count()
-        correct_answers = 0
+        if not isinstance(answers, list):
+            return Response({"error": "answers must be a list"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Check and calculate correct answers
-        for answer in answers:
-            question_id = answer.get('question_id')
-            answer_id = answer.get('answer_id')
-
-            print(f"Checking Question ID: {question_id}, Answer ID: {answer_id}")
-
-            if Answer.objects.filter(
-                id=answer_id,
-                question_id=question_id,
-                is_correct=True
-            ).exists():
-                correct_answers += 1
+        # Grade against the cached answer key
+        answer_key = get_answer_key(compiled_quiz)
+        try:
+            results = grade_answers(answer_key, answers)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # Calculate the score
-        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-        print(f"Correct Answers: {correct_answers}, Score: {score}")
-
-        # Update or create QuizProgress without triggering infinite recursion
-        quiz_progress, _ = QuizProgress.objects.update_or_create(
-            user=user,
-            quiz=quiz,
-            defaults={
-                "score": score,
-                "completed": score >= 70.0,
-                "completion_date": timezone.now() if score >= 70.0 else None
-            },
+        score = calculate_score(answer_key, results)
+        logger.debug(
+            "Quiz %s submitted by user %s: %d answers, score %s", quiz_id, user.pk, len(answers), score
         )
 
-        print(f"QuizProgress Updated: {quiz_progress}")
-
-        # Avoid recursion in `CourseProgress` by calculating explicitly
-        course_progress = CourseProgress.objects.filter(user=user, course=quiz.module.learning_path.course).first()
-        if course_progress:
-            course_progress.calculate_progress()
+        # Responses, quiz score and the module/path/course rollups commit together
+        with transaction.atomic():
+            submitted_at = timezone.now()
+            QuestionResponse.objects.bulk_create([
+                QuestionResponse(
+                    user=user, quiz_id=quiz_id, question_id=question_id, answer_id=answer_id,
+                    is_correct=is_correct, submitted_at=submitted_at
+                )
+                for question_id, answer_id, is_correct in results
+            ])
+            quiz_progress = record_quiz_score(user, quiz_id, score)
 
-        return Response({"score": score, "completed": quiz_progress.completed})
+        return Response({
+            "score": score,
+            "completed": quiz_progress.completed,
+            "results": [
+                {"question_id": question_id, "correct": is_correct}
+                for question_id, _, is_correct in results
+            ],
+        })
 
     except Quiz.DoesNotExist:
         return Response({"error": "Quiz not found"}, status=404)
     except Exception as e:
-        print(f"Error in submit_quiz: {e}")
+        logger.exception("Error in submit_quiz for quiz %s", quiz_id)
         return Response({"error": str(e)}, status=500)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_next_learning_path(request, current_learning_path_id):
-    try:
-        current_path = LearningPath.objects.get(id=current_learning_path_id)
-        next_path = LearningPath.objects.filter(
-            course=current_path.course,
-            id__gt=current_path.id  # Assuming IDs represent order
-        ).order_by('id').first()
-
-        if next_path:
-            serializer = LearningPathSerializer(next_path)
-            return Response(serializer.data, status=200)
-        else:
-            return Response({"detail": "No more learning paths available"}, status=404)
-    except LearningPath.DoesNotExist:
+    course_id = LearningPath.objects.filter(id=current_learning_path_id).values_list('course_id', flat=True).first()
+    if course_id is None:
         return Response({"error": "Current learning path not found"}, status=404)
-    
+
+    paths = {path['id']: path for path in get_navigation(course_id)['learning_paths']}
+    current_path = paths.get(current_learning_path_id)
+    next_path = paths.get(current_path['next']) if current_path else None
+    if next_path is None:
+        return Response({"detail": "No more learning paths available"}, status=404)
+    # Same shape as LearningPathSerializer
+    return Response({
+        'id': next_path['id'],
+        'path_name': next_path['path_name'],
+        'position': next_path['position'],
+        'modules': [module['module_name'] for module in next_path['modules']],
+    }, status=200)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_course_navigation(request, course_id):
+    """
+    The course's learning paths and modules in order, each with the ids of its previous and next
+    neighbours. Module links continue from one learning path into the next.
+    """
+    navigation = get_navigation(course_id)
+    if not navigation['learning_paths'] and not Course.objects.filter(pk=course_id).exists():
+        return Response({"error": "Course not found"}, status=404)
+    return Response(navigation)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def generate_quiz_from_video(request, module_id):
     """
-    Generate a quiz for a module using the associated YouTube video.
+    Queue quiz generation for a module from its YouTube video. Responds 202 with the job;
+    poll the job endpoint until it is done and carries the quiz id. A request for a module that
+    is already being generated returns the existing job. `reuse_existing` (default
+    settings.QUIZ_REUSE_EXISTING) links the module's quiz generated from the same content
+    instead of storing a copy.
     """
     try:
         module = Module.objects.get(id=module_id)
-
-        # Try to fetch transcript
-        content = fetch_video_transcript(module.video_link)
-        if not content:
-            # Fallback to fetching video description
-            print(f"No transcript available for {module.video_link}, trying description...")
-            content = fetch_video_description(module.video_link)
-
-        if not content:
-            # Dynamically generate meaningful fallback content
-            print(f"No transcript or description available for {module.video_link}. Generating default content.")
-            content = f"This module covers the topic: {module.topic}. Please prepare questions related to {module.topic}."
-
-        # Generate quiz questions
-        questions_text = generate_quiz_with_chat_api(content)
-        if not questions_text:
-            # Generate quiz from default OpenAI fallback
-            print(f"Failed to generate quiz from content. Using default OpenAI generation.")
-            questions_text = generate_default_quiz(module.topic)
-
-        if not questions_text:
-            return Response({"error": "Failed to generate quiz questions."}, status=500)
-
-        # Save quiz and questions to database
-        quiz = Quiz.objects.create(quiz_name=f"Quiz for {module.module_name}", module=module)
-        questions = questions_text.split("\n\n")
-
-        for question_data in questions:
-            if not question_data.strip():
-                continue
-
-            lines = question_data.split("\n")
-            question_text = lines[0].strip()
-            answers = lines[1:]
-
-            question = Question.objects.create(quiz=quiz, question_text=question_text)
-            for answer in answers:
-                is_correct = "Correct:" in answer
-                Answer.objects.create(
-                    question=question,
-                    answer_text=answer.replace("Correct:", "").strip(),
-                    is_correct=is_correct,
-                )
-
-        return Response({"message": "Quiz generated successfully!", "quiz_id": quiz.id})
     except Module.DoesNotExist:
         return Response({"error": "Module not found"}, status=404)
-    except Exception as e:
-        print(f"Error generating quiz: {e}")
-        return Response({"error": str(e)}, status=500)
 
+    reuse_existing = request.data.get('reuse_existing', settings.QUIZ_REUSE_EXISTING)
+    if isinstance(reuse_existing, str):
+        reuse_existing = reuse_existing.lower() in ('1', 'true', 'yes')
+    job, created = enqueue_quiz_generation(module, requested_by=request.user, reuse_existing=bool(reuse_existing))
+    data = QuizGenerationJobSerializer(job).data
+    data['status_url'] = request.build_absolute_uri(f'/api/v1/quiz-generation-jobs/{job.pk}/')
+    return Response(data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_quiz_generation_job(request, job_id):
+    """Status of a quiz generation job; `quiz` is set once it is done."""
+    try:
+        job = QuizGenerationJob.objects.get(pk=job_id)
+    except QuizGenerationJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=404)
+    return Response(QuizGenerationJobSerializer(job).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_youtube_quota(request):
+    """Remaining YouTube API budget and the enrichment jobs waiting on it (staff only)."""
+    return Response(get_quota_status())
+
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_catalog(request):
+    """
+    Ranked search over courses, learning paths, modules and quiz questions.
+    ?q= is required; ?type=module,question narrows the kinds; ?page= and ?page_size= (max 100) paginate.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    unknown = set(kinds) - {kind for kind, _ in SearchEntry.KIND_CHOICES}
+    if unknown:
+        return Response({"error": f"Unknown type: {', '.join(sorted(unknown))}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+        page_size = min(SEARCH_MAX_PAGE_SIZE, max(1, int(request.query_params.get('page_size', SEARCH_PAGE_SIZE))))
+    except ValueError:
+        return Response({"error": "page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+    total, hits = search(query, kinds, offset=(page - 1) * page_size, limit=page_size)
+    url = request.build_absolute_uri()
+    previous = None
+    if page > 1:
+        previous = replace_query_param(url, 'page', page - 1) if page > 2 else remove_query_param(url, 'page')
+    return Response({
+        'count': total,
+        'next': replace_query_param(url, 'page', page + 1) if page * page_size < total else None,
+        'previous': previous,
+        'results': hits,
+    })
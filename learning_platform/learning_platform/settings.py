@@ -33,10 +33,61 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('SECRET_KEY')
 
-YOUTUBE_API_KEY = config('YOUTUBE_API_KEY')
+YOUTUBE_API_KEY = config('YOUTUBE_API_KEY', default='')
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Run module content enrichment right after save instead of waiting for the
+# `process_enrichment_queue` worker (handy for local development)
+ENRICHMENT_INLINE = config('ENRICHMENT_INLINE', default=False, cast=bool)
+
+# Content discovery: seconds each source may take before a module is enriched without it,
+# and when a failing upstream is skipped (consecutive failures, seconds before a retry)
+DISCOVERY_DEADLINES = {
+    'youtube': config('DISCOVERY_YOUTUBE_DEADLINE', default=15.0, cast=float),
+    'blog': config('DISCOVERY_BLOG_DEADLINE', default=10.0, cast=float),
+}
+CIRCUIT_BREAKER = {
+    'failure_threshold': config('CIRCUIT_BREAKER_FAILURES', default=5, cast=int),
+    'reset_timeout': config('CIRCUIT_BREAKER_RESET_SECONDS', default=60.0, cast=float),
+}
+SERPAPI_URL = config('SERPAPI_URL', default='https://serpapi.com/search')
+
+# YouTube Data API budget shared by all processes (a search costs 100 units). Background
+# re-enrichment is deferred rather than spend the last YOUTUBE_QUOTA_RESERVE units
+YOUTUBE_QUOTA_UNITS_PER_DAY = config('YOUTUBE_QUOTA_UNITS_PER_DAY', default=10000, cast=int)
+YOUTUBE_QUOTA_RESERVE = config('YOUTUBE_QUOTA_RESERVE', default=2000, cast=int)
+
+# How YouTube candidates are ranked: weights for title and description relevance, views
+# (log scale), recency and duration (see core.services.relevance)
+VIDEO_RANKING_WEIGHTS = {
+    'title': config('VIDEO_RANK_TITLE_WEIGHT', default=0.4, cast=float),
+    'description': config('VIDEO_RANK_DESCRIPTION_WEIGHT', default=0.2, cast=float),
+    'views': config('VIDEO_RANK_VIEWS_WEIGHT', default=0.25, cast=float),
+    'recency': config('VIDEO_RANK_RECENCY_WEIGHT', default=0.1, cast=float),
+    'duration': config('VIDEO_RANK_DURATION_WEIGHT', default=0.05, cast=float),
+}
+
+# Chat completion client for quiz generation; core.services.llm_client.StubLLMClient
+# answers offline with a deterministic quiz (tests, benchmarks, local development)
+LLM_CLIENT = config('LLM_CLIENT', default='core.services.llm_client.OpenAIChatClient')
+LLM_STUB_LATENCY = config('LLM_STUB_LATENCY', default=0.0, cast=float)
+
+# Run quiz generation right after the request instead of waiting for the
+# `process_quiz_generation_queue` worker
+QUIZ_GENERATION_INLINE = config('QUIZ_GENERATION_INLINE', default=False, cast=bool)
+
+# Long transcripts are split into overlapping chunks (sizes in estimated tokens); the most
+# relevant chunks within the budget get questions generated for them in parallel
+QUIZ_CHUNK_TOKENS = config('QUIZ_CHUNK_TOKENS', default=1200, cast=int)
+QUIZ_CHUNK_OVERLAP_TOKENS = config('QUIZ_CHUNK_OVERLAP_TOKENS', default=150, cast=int)
+QUIZ_CONTENT_TOKEN_BUDGET = config('QUIZ_CONTENT_TOKEN_BUDGET', default=3600, cast=int)
+QUIZ_GENERATION_PARALLELISM = config('QUIZ_GENERATION_PARALLELISM', default=4, cast=int)
+
+# Default for the generate-quiz `reuse_existing` flag: link to the module's quiz generated from
+# the same content instead of storing another copy of its questions
+QUIZ_REUSE_EXISTING = config('QUIZ_REUSE_EXISTING', default=False, cast=bool)
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -78,6 +129,8 @@ LOGIN_REDIRECT_URL = '/'  # Redirect URL after login
 LOGOUT_REDIRECT_URL = '/'  # Redirect URL after logout
 
 MIDDLEWARE = [
+    'core.log.RequestIdMiddleware',
+    'core.metrics.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -116,24 +169,58 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'learning_platform.wsgi.application'
 
+# Per-route request metrics in Prometheus format at /metrics (see core/metrics.py), served to
+# staff users and to scrapers sending `Authorization: Bearer <METRICS_TOKEN>`
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Logging: JSON lines (or LOG_FORMAT=text), tagged with the request id, written from a background thread.
+# Application loggers ('core.*') log at LOG_LEVEL; set it to DEBUG for progress/quiz tracing.
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_FORMAT = config('LOG_FORMAT', default='json')
+DJANGO_LOG_LEVEL = config('DJANGO_LOG_LEVEL', default='INFO')
+LOG_FILE = config('LOG_FILE', default='')  # Also write Django's own records to this file when set
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'core.log.RequestIdFilter'},
+    },
     'handlers': {
-        'file': {
-            'level': 'DEBUG',
-            'class': 'logging.FileHandler',
-            'filename': 'debug.log',
+        'console': {
+            '()': 'core.log.QueuedHandler',
+            'handler_class': 'logging.StreamHandler',
+            'fmt': LOG_FORMAT,
+            'filters': ['request_id'],
         },
     },
+    'root': {
+        'handlers': ['console'],
+        'level': 'WARNING',
+    },
     'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
         'django': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
-            'propagate': True,
+            'handlers': ['console'],
+            'level': DJANGO_LOG_LEVEL,
+            'propagate': False,
         },
     },
 }
+if LOG_FILE:
+    LOGGING['handlers']['file'] = {
+        '()': 'core.log.QueuedHandler',
+        'handler_class': 'logging.FileHandler',
+        'filename': LOG_FILE,
+        'fmt': LOG_FORMAT,
+        'filters': ['request_id'],
+    }
+    LOGGING['loggers']['django']['handlers'].append('file')
 
 
 # Database
@@ -155,6 +242,38 @@ DATABASES = {
 }
 
 
+# Caches
+# The 'api' cache stores YouTube/SerpAPI/transcript responses across processes.
+# Run `python manage.py createcachetable` after migrating when using the default DB backend.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': config('API_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('API_CACHE_LOCATION', default='api_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    # Derived data shared by all worker processes (compiled quizzes, ...)
+    'shared': {
+        'BACKEND': config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('SHARED_CACHE_LOCATION', default='shared_cache'),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Per-source TTLs in seconds (see core/services/api_cache.py for the defaults)
+API_CACHE_TTLS = {
+    'youtube_search': config('API_CACHE_TTL_YOUTUBE', default=60 * 60 * 24, cast=int),
+    'blog_search': config('API_CACHE_TTL_BLOG', default=60 * 60 * 24, cast=int),
+    'video_transcript': config('API_CACHE_TTL_TRANSCRIPT', default=60 * 60 * 24 * 30, cast=int),
+    'video_description': config('API_CACHE_TTL_DESCRIPTION', default=60 * 60 * 24 * 7, cast=int),
+    'generated_quiz': config('API_CACHE_TTL_GENERATED_QUIZ', default=60 * 60 * 24 * 90, cast=int),
+    'negative': config('API_CACHE_TTL_NEGATIVE', default=60 * 60 * 6, cast=int),
+}
+
+
 # JWT settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -162,7 +281,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Allow access to APIs without CSRF
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.IdCursorPagination',
 }
 
 
@@ -228,4 +348,5 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', cast=bool)
 
 FRONTEND_URL = "https://path-ed.vercel.app"  # Frontend url for email verification
 
-django_heroku.settings(locals())
\ No newline at end of file
+# LOGGING above is ours; don't let django_heroku replace it
+django_heroku.settings(locals(), logging=False)
\ No newline at end of file
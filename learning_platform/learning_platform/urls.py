@@ -9,11 +9,13 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.http import HttpResponseRedirect
 from rest_framework import permissions
+from core.metrics import metrics_view
 from core.views import (
     CourseViewSet, ModuleViewSet, QuizViewSet, LearningPathViewSet, 
     RegisterView, LoginView, VerifyEmailView, PasswordResetRequestView,
     PasswordResetConfirmView, ModuleProgressViewSet, QuizProgressViewSet,
-    CourseProgressViewSet, get_user_profile, update_course_progress, get_module_by_name, submit_quiz, LearningPathProgressViewSet, get_module_progress, get_next_learning_path, generate_quiz_from_video
+    CourseProgressViewSet, get_user_profile, get_dashboard_summary, submit_progress_batch, update_course_progress, get_module_by_name, get_module_by_slug, submit_quiz, LearningPathProgressViewSet, get_module_progress, get_next_learning_path, generate_quiz_from_video, get_quiz_generation_job,
+    get_youtube_quota, search_catalog, get_course_navigation
 )
 
 # Versioned Router Setup for API
@@ -51,15 +53,24 @@ urlpatterns = [
     path('api/v1/password-reset-request/', PasswordResetRequestView.as_view(), name='password_reset_request'),
     path('api/v1/reset-password-confirm/', PasswordResetConfirmView.as_view(), name='reset_password_confirm'),
     path('api/v1/user-profile/', get_user_profile, name='get_user_profile'),  # Fetch user profile
+    path('api/v1/dashboard/', get_dashboard_summary, name='get_dashboard_summary'),
     path('api/v1/course-progress/<int:course_id>/', CourseProgressViewSet.as_view({'get': 'retrieve', 'patch': 'partial_update'}), name='course-progress-detail'), 
     # Explicit path for retrieving module details
     path('api/v1/modules/<int:pk>/', ModuleViewSet.as_view({'get': 'retrieve'}), name='module-detail'),  
     path('api/v1/module-by-name/<str:module_name>/', get_module_by_name, name='get_module_by_name'),
+    path('api/v1/module-by-slug/<slug:slug>/', get_module_by_slug, name='get_module_by_slug'),
     path('api/v1/quizzes/<int:quiz_id>/submit/', submit_quiz, name='submit_quiz'),
+    path('api/v1/modules/<int:module_id>/generate-quiz/', generate_quiz_from_video, name='generate_quiz_from_video'),
+    path('api/v1/quiz-generation-jobs/<int:job_id>/', get_quiz_generation_job, name='get_quiz_generation_job'),
+    path('api/v1/search/', search_catalog, name='search_catalog'),
+    path('api/v1/quota/youtube/', get_youtube_quota, name='get_youtube_quota'),
+    path('api/v1/progress/batch/', submit_progress_batch, name='submit_progress_batch'),
     path('api/v1/module-progress', get_module_progress, name='get_module_progress'),
+    path('api/v1/courses/<int:course_id>/navigation/', get_course_navigation, name='get_course_navigation'),
     path('api/v1/next-learning-path/<int:current_learning_path_id>/', get_next_learning_path, name='get_next_learning_path'),
     # Versioned router endpoint
     path('api/v1/', include(router.urls)),
+    path('metrics', metrics_view, name='metrics'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
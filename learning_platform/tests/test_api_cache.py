@@ -0,0 +1,75 @@
+from unittest.mock import patch, MagicMock
+
+from django.test import SimpleTestCase, override_settings
+from youtube_transcript_api import TranscriptsDisabled
+
+from core.services import api_cache
+from core.services.circuit_breaker import reset_breakers
+from core.services.blog_service import get_blog_posts
+from core.services.quiz_generation_service import fetch_video_transcript
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'api': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api-cache-tests'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestApiCache(SimpleTestCase):
+
+    def setUp(self):
+        api_cache.clear()
+        reset_breakers()
+        api_cache.reset_cache_stats()
+
+    def test_cached_call_hits_after_first_fetch(self):
+        fetch = MagicMock(return_value={'url': 'https://example.com'})
+
+        first = api_cache.cached_call('blog_search', 'python', fetch)
+        second = api_cache.cached_call('blog_search', 'python', fetch)
+
+        self.assertEqual(first, second)
+        fetch.assert_called_once()
+        self.assertEqual(api_cache.get_cache_stats()['blog_search'], {'hits': 1, 'misses': 1})
+
+    def test_errors_are_not_cached(self):
+        fetch = MagicMock(side_effect=[Exception("API error"), {'url': 'https://example.com'}])
+
+        with self.assertRaises(Exception):
+            api_cache.cached_call('blog_search', 'python', fetch)
+        value = api_cache.cached_call('blog_search', 'python', fetch)
+
+        self.assertEqual(value, {'url': 'https://example.com'})
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_topics_are_normalized(self):
+        self.assertEqual(api_cache.normalize_topic("  Learn   Python "), api_cache.normalize_topic("learn python"))
+
+    @patch("core.services.blog_service.get_session")
+    def test_blog_posts_served_from_cache(self, mock_session):
+        mock_get = mock_session.return_value.get
+        mock_get.return_value.json.return_value = {
+            "organic_results": [{"title": "Learn Python Tutorial", "link": "https://example.com/learn-python"}]
+        }
+
+        get_blog_posts("Python")
+        result = get_blog_posts("  python ")
+
+        mock_get.assert_called_once()
+        self.assertEqual(result["url"], "https://example.com/learn-python")
+
+    @patch("core.services.quiz_generation_service.YouTubeTranscriptApi.get_transcript")
+    def test_missing_transcript_is_negatively_cached(self, mock_transcript):
+        mock_transcript.side_effect = TranscriptsDisabled("abc")
+
+        self.assertIsNone(fetch_video_transcript("https://www.youtube.com/watch?v=abc"))
+        self.assertIsNone(fetch_video_transcript("https://www.youtube.com/watch?v=abc"))
+
+        mock_transcript.assert_called_once()
+
+    @patch("core.services.quiz_generation_service.YouTubeTranscriptApi.get_transcript")
+    def test_transcript_errors_are_retried(self, mock_transcript):
+        mock_transcript.side_effect = [Exception("network down"), [{'text': 'hello'}, {'text': 'world'}]]
+
+        self.assertIsNone(fetch_video_transcript("https://www.youtube.com/watch?v=xyz"))
+        self.assertEqual(fetch_video_transcript("https://www.youtube.com/watch?v=xyz"), "hello world")
@@ -0,0 +1,97 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningPath, Module, User
+from tests.utils import QueryCountTestCase, build_catalog
+
+
+class TestListPagination(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        build_catalog(30, "catalog")
+
+    def test_modules_are_paginated(self):
+        first = self.client.get('/api/v1/modules/', {'page_size': 25})
+        self.assertEqual(len(first.data['results']), 25)
+        self.assertIsNone(first.data['previous'])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+        first_ids = {module['id'] for module in first.data['results']}
+        self.assertFalse(first_ids & {module['id'] for module in second.data['results']})
+
+    def test_nested_fields_need_expand_on_lists(self):
+        response = self.client.get('/api/v1/modules/')
+        self.assertNotIn('quizzes', response.data['results'][0])
+
+        expanded = self.client.get('/api/v1/modules/', {'expand': 'quizzes'})
+        self.assertEqual(len(expanded.data['results'][0]['quizzes'][0]['questions']), 2)
+
+    def test_detail_keeps_nested_fields(self):
+        module_id = self.client.get('/api/v1/modules/').data['results'][0]['id']
+        response = self.client.get(f'/api/v1/modules/{module_id}/')
+        self.assertIn('quizzes', response.data)
+
+    def test_sparse_fieldset(self):
+        response = self.client.get('/api/v1/modules/', {'fields': 'id,module_name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'module_name'})
+
+
+class TestPositionOrderedLists(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        course = Course.objects.create(course_name="Course", description="Fixture")
+        # Later rows come first
+        self.paths = [
+            LearningPath.objects.create(path_name=f"Path {i}", course=course, position=5 - i) for i in range(5)
+        ]
+        self.modules = [
+            Module.objects.create(module_name=f"Module {i}", learning_path=self.paths[0], topic="Topic", position=5 - i)
+            for i in range(5)
+        ]
+
+    def list_ids(self, url, page_size=2):
+        ids, page = [], self.client.get(url, {'page_size': page_size})
+        while True:
+            ids += [row['id'] for row in page.data['results']]
+            if page.data['next'] is None:
+                return ids
+            page = self.client.get(page.data['next'])
+
+    def test_learning_paths_follow_position(self):
+        self.assertEqual(self.list_ids('/api/v1/learning-paths/'), [path.pk for path in reversed(self.paths)])
+
+    def test_modules_follow_position(self):
+        self.assertEqual(self.list_ids('/api/v1/modules/'), [module.pk for module in reversed(self.modules)])
+
+    def test_many_rows_sharing_a_position_are_each_listed_once(self):
+        # Positions restart in every course, so thousands of paths can share position 1
+        courses = Course.objects.bulk_create(
+            Course(course_name=f"Course {i}", description="Fixture") for i in range(1100)
+        )
+        LearningPath.objects.bulk_create(
+            LearningPath(path_name="Intro", course=course, position=1) for course in courses
+        )
+        expected = list(LearningPath.objects.order_by('position', 'id').values_list('id', flat=True))
+
+        self.assertEqual(self.list_ids('/api/v1/learning-paths/', page_size=100), expected)
+
+
+class TestExpandedListQueryCounts(QueryCountTestCase):
+
+    def test_expanded_module_list(self):
+        self.assertConstantQueries('/api/v1/modules/?expand=quizzes')
+
+    def test_expanded_quiz_list(self):
+        self.assertConstantQueries('/api/v1/quizzes/?expand=questions')
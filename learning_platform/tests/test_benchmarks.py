@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.benchmarks import SCENARIOS, percentile, populate, run_scenario
+from core.models import CourseProgress, LearningPathProgress, ModuleProgress
+from core.services import quiz_cache
+from tests.utils import LOCMEM_CACHES
+
+
+class TestPercentile(SimpleTestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7.0], 95), 7.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestBenchmarkScenarios(TestCase):
+
+    def setUp(self):
+        quiz_cache._cache().clear()
+        self.dataset = populate(courses=1, paths=2, modules=2, questions=2, users=3, progress=0.5, seed=1)
+
+    def test_populate_builds_consistent_rollups(self):
+        self.assertEqual(len(self.dataset.modules), 4)
+        self.assertEqual(len(self.dataset.quizzes), 4)
+        for path_progress in LearningPathProgress.objects.all():
+            self.assertEqual(
+                path_progress.completed_modules,
+                ModuleProgress.objects.filter(
+                    user=path_progress.user, module__learning_path=path_progress.learning_path, completed=True
+                ).count(),
+            )
+        self.assertTrue(CourseProgress.objects.exists())
+
+    def test_every_scenario_runs_without_errors(self):
+        for name in SCENARIOS:
+            with self.subTest(name):
+                result = run_scenario(name, self.dataset, requests=5, warmup=1)
+
+                self.assertEqual(result['errors'], 0)
+                self.assertEqual(result['requests'], 5)
+                if name == 'search' and connection.vendor != 'postgresql':
+                    # Served from the in-process index once it is loaded
+                    self.assertEqual(result['queries_per_request'], 0)
+                else:
+                    self.assertGreater(result['queries_per_request'], 0)
+                self.assertLessEqual(result['p50_ms'], result['p99_ms'])
@@ -1,12 +1,19 @@
 import unittest
 from unittest.mock import patch
+from core.services import api_cache
+from core.services.circuit_breaker import reset_breakers
 from core.services.blog_service import get_blog_posts
 
 
 class TestBlogService(unittest.TestCase):
 
-    @patch("core.services.blog_service.requests.get")
-    def test_get_blog_posts_success(self, mock_get):
+    def setUp(self):
+        api_cache.clear()
+        reset_breakers()
+
+    @patch("core.services.blog_service.get_session")
+    def test_get_blog_posts_success(self, mock_session):
+        mock_get = mock_session.return_value.get
         # Mock response from SerpAPI
         mock_response = {
             "organic_results": [
@@ -25,8 +32,9 @@ class TestBlogService(unittest.TestCase):
         self.assertEqual(result["title"], "Learn Python Tutorial")
         self.assertEqual(result["url"], "https://example.com/learn-python")
 
-    @patch("core.services.blog_service.requests.get")
-    def test_get_blog_posts_no_results(self, mock_get):
+    @patch("core.services.blog_service.get_session")
+    def test_get_blog_posts_no_results(self, mock_session):
+        mock_get = mock_session.return_value.get
         # Mock response with no organic results
         mock_response = {"organic_results": []}
         mock_get.return_value.json.return_value = mock_response
@@ -38,8 +46,9 @@ class TestBlogService(unittest.TestCase):
         # Assertions
         self.assertIsNone(result)
 
-    @patch("core.services.blog_service.requests.get")
-    def test_get_blog_posts_api_error(self, mock_get):
+    @patch("core.services.blog_service.get_session")
+    def test_get_blog_posts_api_error(self, mock_session):
+        mock_get = mock_session.return_value.get
         # Mock an HTTP error
         mock_get.side_effect = Exception("API error")
 
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from core.services import api_cache
+from core.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, reset_breakers
+from core.services.blog_service import get_blog_posts, search_blog_posts
+from core.services.content_discovery import discover_content
+from core.services.youtube_client import reset_youtube_clients
+from tests.utils import LOCMEM_CACHES
+
+BLOG_RESULTS = {"organic_results": [{"title": "Learn HTML Tutorial", "link": "https://example.com/html"}]}
+
+
+class StandInServer:
+    """
+    Local HTTP server answering every GET with `status` and `body` after `delay` seconds.
+    """
+
+    def __init__(self, status=200, body=None, delay=0):
+        self.status, self.body, self.delay = status, body or {}, delay
+        self.hits = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.hits += 1
+                time.sleep(stand_in.delay)
+                payload = json.dumps(stand_in.body).encode()
+                self.send_response(stand_in.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestCircuitBreaker(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30, clock=lambda: self.now)
+
+    def fail(self):
+        raise ValueError("upstream down")
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.breaker.call(self.fail)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: 'ok')
+
+    def test_success_resets_failure_count(self):
+        with self.assertRaises(ValueError):
+            self.breaker.call(self.fail)
+        self.breaker.call(lambda: 'ok')
+        with self.assertRaises(ValueError):
+            self.breaker.call(self.fail)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_trial_closes_or_reopens(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.breaker.call(self.fail)
+
+        self.assertTrue(self.breaker.is_open())
+        self.now = 31
+        self.assertFalse(self.breaker.is_open())
+        self.assertEqual(self.breaker.state, OPEN)  # Checking doesn't start the trial
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())  # Only one trial call at a time
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.now = 62
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CIRCUIT_BREAKER={'failure_threshold': 2, 'reset_timeout': 60})
+class TestContentDiscovery(TransactionTestCase):
+
+    def setUp(self):
+        api_cache.clear()
+        reset_breakers()
+
+    def test_serpapi_retries_then_breaker_stops_calls(self):
+        with StandInServer(status=503) as serpapi, override_settings(SERPAPI_URL=serpapi.url):
+            for _ in range(2):
+                self.assertIsNone(get_blog_posts("html"))
+            hits = serpapi.hits
+
+            with self.assertRaises(CircuitOpenError):
+                search_blog_posts("html")
+
+        self.assertEqual(hits, 6)  # Each search tries once and retries twice
+        self.assertEqual(serpapi.hits, hits)
+
+    def test_slow_source_times_out_without_holding_back_others(self):
+        with StandInServer(body={'items': []}, delay=2) as youtube, \
+                StandInServer(body=BLOG_RESULTS) as serpapi, \
+                patch.dict(os.environ, {'YOUTUBE_API_ENDPOINT': youtube.url}), \
+                override_settings(SERPAPI_URL=serpapi.url, DISCOVERY_DEADLINES={'youtube': 0.3, 'blog': 5}):
+            reset_youtube_clients()
+            started = time.monotonic()
+            found = discover_content("html")
+            elapsed = time.monotonic() - started
+
+        reset_youtube_clients()
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(found['errors'], {'youtube': 'timeout'})
+        self.assertEqual(found['results']['blog'], {'title': 'Learn HTML Tutorial', 'url': 'https://example.com/html'})
+
+    def test_failing_source_is_reported(self):
+        def broken(topic):
+            raise ValueError("invalid query")
+
+        found = discover_content("html", sources={'youtube': broken, 'blog': lambda topic: None})
+
+        self.assertEqual(found, {'results': {'blog': None}, 'errors': {'youtube': 'invalid query'}})
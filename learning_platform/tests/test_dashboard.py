@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import User, Module, ModuleProgress
+from core.services import dashboard_service
+from tests.utils import LOCMEM_CACHES, create_course
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestDashboard(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        caches[dashboard_service.CACHE_ALIAS].clear()
+
+    def start_course(self, num_paths):
+        course = create_course(num_paths=num_paths, modules_per_path=2)
+        for module in Module.objects.filter(learning_path__course=course).order_by('id')[::2]:
+            ModuleProgress.objects.create(user=self.user, module=module, video_watched=True, quiz_completed=True)
+        return course
+
+    def test_build_runs_fixed_number_of_queries(self):
+        self.start_course(num_paths=1)
+        with self.assertNumQueries(3):
+            dashboard_service.build_dashboard(self.user)
+
+        for _ in range(3):
+            self.start_course(num_paths=5)
+        with self.assertNumQueries(3):
+            dashboard = dashboard_service.build_dashboard(self.user)
+
+        self.assertEqual(len(dashboard['courses']), 4)
+        path = dashboard['courses'][0]['learning_paths'][0]
+        self.assertEqual(path['completed_modules'], 1)
+        self.assertEqual(path['progress_percentage'], 50)
+        self.assertEqual(len(path['modules']), 1)
+
+    def test_profile_keeps_progress_data_shape(self):
+        course = self.start_course(num_paths=2)
+
+        response = self.client.get('/api/v1/user-profile/')
+
+        self.assertEqual(response.status_code, 200)
+        entry = response.data['progress_data'][0]
+        self.assertEqual(entry['user'], "learner")
+        self.assertEqual(entry['course'], course.course_name)
+        self.assertEqual(entry['progress_percentage'], 50)
+        self.assertEqual(
+            set(entry['learning_path_progress'][0]),
+            {'id', 'learning_path', 'learning_path_name', 'completed', 'completion_date', 'progress_percentage'},
+        )
+
+    def test_dashboard_is_cached_until_progress_changes(self):
+        course = self.start_course(num_paths=1)
+        self.client.get('/api/v1/dashboard/')
+
+        with self.assertNumQueries(0):
+            dashboard_service.get_dashboard(self.user)
+
+        remaining = Module.objects.filter(learning_path__course=course).exclude(
+            pk__in=ModuleProgress.objects.values('module_id')
+        ).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            ModuleProgress.objects.create(user=self.user, module=remaining, video_watched=True, quiz_completed=True)
+
+        response = self.client.get('/api/v1/dashboard/')
+        self.assertEqual(response.data['courses'][0]['progress_percentage'], 100)
+        self.assertTrue(response.data['courses'][0]['completed'])
+
+    def test_dashboard_built_during_a_commit_is_not_served(self):
+        self.start_course(num_paths=1)
+        build_dashboard = dashboard_service.build_dashboard
+
+        def build_then_commit_elsewhere(user):
+            stale = build_dashboard(user)
+            # Another request commits a progress change while this one is still building
+            with self.captureOnCommitCallbacks(execute=True):
+                ModuleProgress.objects.filter(user=user).delete()
+            return stale
+
+        with patch('core.services.dashboard_service.build_dashboard', side_effect=build_then_commit_elsewhere):
+            stale = dashboard_service.get_dashboard(self.user)
+
+        self.assertEqual(len(stale['courses'][0]['learning_paths'][0]['modules']), 1)
+        self.assertEqual(dashboard_service.get_dashboard(self.user)['courses'][0]['learning_paths'][0]['modules'], [])
+
+    def test_renames_refresh_the_dashboard(self):
+        course = self.start_course(num_paths=1)
+        dashboard_service.get_dashboard(self.user)
+        learning_path = course.learning_paths.get()
+        module = ModuleProgress.objects.get(user=self.user).module
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.course_name = "Renamed course"
+            course.save()
+            learning_path.path_name = "Renamed path"
+            learning_path.save(update_fields=['path_name'])
+            module.module_name = "Renamed module"
+            module.save()
+
+        path = dashboard_service.get_dashboard(self.user)['courses'][0]['learning_paths'][0]
+        self.assertEqual(dashboard_service.get_dashboard(self.user)['courses'][0]['course_name'], "Renamed course")
+        self.assertEqual(path['learning_path_name'], "Renamed path")
+        self.assertEqual(path['modules'][0]['module_name'], "Renamed module")
+
+        # Saves that can't have renamed anything leave the cached dashboard alone
+        with self.captureOnCommitCallbacks(execute=True):
+            learning_path.save(update_fields=['position'])
+        with self.assertNumQueries(0):
+            dashboard_service.get_dashboard(self.user)
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Course, LearningPath, Module, EnrichmentJob
+from core.services.enrichment_service import drain_enrichment_queue
+from core.services.job_queue import MAX_ATTEMPTS
+
+
+class TestEnrichmentService(TestCase):
+
+    def setUp(self):
+        course = Course.objects.create(course_name="Web Development", description="Basics")
+        self.learning_path = LearningPath.objects.create(path_name="Frontend", course=course)
+
+    def create_module(self, topic="HTML basics"):
+        return Module.objects.create(module_name="HTML", learning_path=self.learning_path, topic=topic)
+
+    @patch("core.services.enrichment_service.get_blog_posts")
+    @patch("core.services.enrichment_service.get_youtube_videos")
+    def test_save_queues_without_fetching(self, mock_videos, mock_blog):
+        module = self.create_module()
+
+        mock_videos.assert_not_called()
+        mock_blog.assert_not_called()
+        self.assertEqual(module.enrichment_status, Module.ENRICHMENT_PENDING)
+        self.assertEqual(EnrichmentJob.objects.filter(module=module, status=EnrichmentJob.STATUS_PENDING).count(), 1)
+
+    @patch("core.services.enrichment_service.get_blog_posts")
+    @patch("core.services.enrichment_service.get_youtube_videos")
+    def test_drain_stores_links(self, mock_videos, mock_blog):
+        mock_videos.return_value = [{'url': 'https://www.youtube.com/watch?v=abc', 'title': 'HTML'}]
+        mock_blog.return_value = {'title': 'HTML tutorial', 'url': 'https://example.com/html'}
+        module = self.create_module()
+
+        counts = drain_enrichment_queue()
+
+        module.refresh_from_db()
+        self.assertEqual(counts['done'], 1)
+        self.assertEqual(module.video_link, 'https://www.youtube.com/watch?v=abc')
+        self.assertEqual(module.blog_link, 'https://example.com/html')
+        self.assertEqual(module.enrichment_status, Module.ENRICHMENT_DONE)
+        self.assertEqual(module.enriched_topic, "HTML basics")
+
+    @patch("core.services.enrichment_service.get_blog_posts", return_value=None)
+    @patch("core.services.enrichment_service.get_youtube_videos", return_value=[])
+    def test_only_topic_change_requeues(self, mock_videos, mock_blog):
+        module = self.create_module()
+        drain_enrichment_queue()
+        module.refresh_from_db()
+
+        module.module_name = "HTML 101"
+        module.save()
+        self.assertFalse(EnrichmentJob.objects.filter(status=EnrichmentJob.STATUS_PENDING).exists())
+
+        module.topic = "HTML forms"
+        module.save()
+        self.assertTrue(EnrichmentJob.objects.filter(status=EnrichmentJob.STATUS_PENDING, topic="HTML forms").exists())
+
+    @patch("core.services.enrichment_service.get_blog_posts", return_value=None)
+    @patch("core.services.enrichment_service.get_youtube_videos")
+    def test_failing_job_is_retried_then_failed(self, mock_videos, mock_blog):
+        mock_videos.side_effect = Exception("API error")
+        module = self.create_module()
+
+        counts = drain_enrichment_queue()
+
+        job = EnrichmentJob.objects.get(module=module)
+        self.assertEqual(counts['pending'], 1)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+        # Not retried until the backoff has passed
+        self.assertEqual(drain_enrichment_queue()['pending'], 0)
+
+        for _ in range(MAX_ATTEMPTS - 1):
+            EnrichmentJob.objects.update(run_after=timezone.now())
+            counts = drain_enrichment_queue()
+
+        module.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual(counts['failed'], 1)
+        self.assertEqual(job.attempts, MAX_ATTEMPTS)
+        self.assertEqual(job.status, EnrichmentJob.STATUS_FAILED)
+        self.assertEqual(module.enrichment_status, Module.ENRICHMENT_FAILED)
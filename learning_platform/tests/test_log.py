@@ -0,0 +1,72 @@
+import io
+import json
+import logging
+import sys
+
+from django.test import SimpleTestCase, RequestFactory
+from django.http import HttpResponse
+
+from core.log import JsonFormatter, QueuedHandler, RequestIdFilter, RequestIdMiddleware, get_request_id
+
+
+def make_record(msg, *args, exc_info=None, **extra):
+    record = logging.LogRecord('core.test', logging.INFO, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter(SimpleTestCase):
+
+    def test_renders_message_and_extra_fields(self):
+        record = make_record("Quiz %s graded", 7, score=80.0, request_id="abc")
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(entry['message'], "Quiz 7 graded")
+        self.assertEqual(entry['level'], "INFO")
+        self.assertEqual(entry['request_id'], "abc")
+        self.assertEqual(entry['score'], 80.0)
+
+
+class TestQueuedHandler(SimpleTestCase):
+
+    def test_writes_on_listener_thread_and_keeps_traceback(self):
+        stream = io.StringIO()
+        handler = QueuedHandler(stream=stream)
+        handler.addFilter(RequestIdFilter())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            handler.handle(make_record("Failed %s", "job", exc_info=sys.exc_info()))
+        handler.close()
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry['message'], "Failed job")
+        self.assertEqual(entry['request_id'], "-")
+        self.assertIn("ValueError: boom", entry['exc_info'])
+
+
+class TestRequestIdMiddleware(SimpleTestCase):
+
+    def run_request(self, **headers):
+        seen = {}
+
+        def view(request):
+            seen['request_id'] = get_request_id()
+            return HttpResponse()
+
+        response = RequestIdMiddleware(view)(RequestFactory().get('/', headers=headers))
+        return seen['request_id'], response
+
+    def test_uses_incoming_header(self):
+        request_id, response = self.run_request(**{'X-Request-ID': "client-123"})
+
+        self.assertEqual(request_id, "client-123")
+        self.assertEqual(response['X-Request-ID'], "client-123")
+        self.assertEqual(get_request_id(), "-")
+
+    def test_generates_id_for_missing_or_invalid_header(self):
+        request_id, response = self.run_request(**{'X-Request-ID': "bad id\n"})
+
+        self.assertEqual(len(request_id), 32)
+        self.assertEqual(response['X-Request-ID'], request_id)
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.metrics import PerformanceMiddleware, reset_metrics, track_external
+from core.models import User, Course
+
+
+def scrape():
+    return APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token').content.decode()
+
+
+@override_settings(METRICS_TOKEN='scrape-token')
+class TestPerformanceMiddleware(TestCase):
+
+    def setUp(self):
+        reset_metrics()
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Course.objects.create(course_name="Course", description="Test course")
+
+    def test_server_timing_reports_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/courses/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+        self.assertIn('desc="0 calls"', response['Server-Timing'])
+
+    def test_metrics_endpoint_aggregates_by_route(self):
+        self.client.get('/api/v1/courses/')
+        self.client.get('/api/v1/courses/')
+
+        body = scrape()
+
+        self.assertIn('http_requests_total{route="course-list",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{route="course-list",method="GET"} 2', body)
+        self.assertIn('http_request_db_queries_count{route="course-list"} 2', body)
+
+    def test_metrics_endpoint_needs_staff_or_token(self):
+        self.assertEqual(APIClient().get('/metrics').status_code, 401)
+        self.assertEqual(APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_blank_token_is_never_accepted(self):
+        self.assertEqual(APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 401)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_endpoint_can_be_disabled(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_external_calls_count_against_request(self):
+        def view(request):
+            with track_external('youtube'):
+                pass
+            try:
+                with track_external('openai'):
+                    raise RuntimeError("rate limited")
+            except RuntimeError:
+                pass
+            return HttpResponse("ok")
+
+        response = PerformanceMiddleware(view)(RequestFactory().get('/'))
+
+        self.assertIn('desc="2 calls"', response['Server-Timing'])
+        body = scrape()
+        self.assertIn('external_call_errors_total{service="openai"} 1', body)
+        self.assertIn('http_request_external_calls_sum{route="unmatched"} 2', body)
@@ -0,0 +1,161 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningPath, Module, User
+from core.services import navigation
+from core.services.navigation import build_navigation, get_navigation
+from tests.utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCourseNavigation(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.course = Course.objects.create(course_name="Web Development", description="Basics")
+        # Created out of order: positions, not ids, decide the order
+        self.backend = LearningPath.objects.create(path_name="Backend", course=self.course, position=2)
+        self.frontend = LearningPath.objects.create(path_name="Frontend", course=self.course, position=1)
+        self.css = Module.objects.create(module_name="CSS", learning_path=self.frontend, topic="CSS", position=2)
+        self.html = Module.objects.create(module_name="HTML", learning_path=self.frontend, topic="HTML", position=1)
+        self.node = Module.objects.create(module_name="Node.js", learning_path=self.backend, topic="Node.js")
+
+        user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_new_rows_are_appended(self):
+        express = Module.objects.create(module_name="Express", learning_path=self.backend, topic="Express")
+        devops = LearningPath.objects.create(path_name="DevOps", course=self.course)
+
+        self.assertEqual(self.node.position, 1)
+        self.assertEqual(express.position, 2)
+        self.assertEqual(devops.position, 3)
+        self.assertEqual(list(self.frontend.modules.all()), [self.html, self.css])
+
+    def test_slugs_are_unique_and_stable(self):
+        duplicate = Module.objects.create(module_name="HTML", learning_path=self.backend, topic="HTML")
+        self.assertEqual((self.html.slug, duplicate.slug), ("html", "html-2"))
+
+        duplicate.module_name = "HTML forms"
+        duplicate.save()
+        duplicate.refresh_from_db()
+        self.assertEqual(duplicate.slug, "html-2")
+
+    def test_slug_taken_by_a_concurrent_create_moves_to_the_next_suffix(self):
+        unique_slug = Module.unique_slug
+        lookups = []
+
+        def lookup_before_the_other_create(name, taken=()):
+            lookups.append(name)
+            # The first lookup ran before the "HTML" module created in setUp committed
+            return "html" if len(lookups) == 1 else unique_slug(name, taken)
+
+        with patch.object(Module, 'unique_slug', side_effect=lookup_before_the_other_create):
+            duplicate = Module.objects.create(module_name="HTML", learning_path=self.backend, topic="HTML")
+
+        self.assertEqual(duplicate.slug, "html-2")
+        self.assertEqual(len(lookups), 2)
+
+    def test_module_lookup_by_duplicate_name_and_by_slug(self):
+        duplicate = Module.objects.create(module_name="HTML", learning_path=self.backend, topic="HTML")
+
+        response = self.client.get('/api/v1/module-by-name/HTML/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.html.pk)
+
+        response = self.client.get(f'/api/v1/module-by-slug/{duplicate.slug}/')
+        self.assertEqual(response.data['id'], duplicate.pk)
+        self.assertEqual(self.client.get('/api/v1/module-by-slug/missing/').status_code, 404)
+
+    def test_navigation_links_paths_and_modules_in_order(self):
+        with CaptureQueriesContext(connection) as queries:
+            navigation = build_navigation(self.course.pk)
+
+        self.assertEqual(len(queries), 1)
+        frontend, backend = navigation['learning_paths']
+        self.assertEqual(
+            (frontend['id'], frontend['previous'], frontend['next']), (self.frontend.pk, None, self.backend.pk)
+        )
+        self.assertEqual([module['slug'] for module in frontend['modules']], ["html", "css"])
+        # Module links continue into the next learning path
+        self.assertEqual(frontend['modules'][1]['next'], self.node.pk)
+        self.assertEqual(backend['modules'][0]['previous'], self.css.pk)
+        self.assertIsNone(backend['next'])
+
+    def test_cached_until_a_module_changes(self):
+        get_navigation(self.course.pk)
+        with self.assertNumQueries(0):
+            get_navigation(self.course.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.css.position = 0
+            self.css.save()
+
+        modules = get_navigation(self.course.pk)['learning_paths'][0]['modules']
+        self.assertEqual([module['id'] for module in modules], [self.css.pk, self.html.pk])
+
+    def test_map_built_during_a_commit_is_not_served(self):
+        def build_then_commit_elsewhere(course_id):
+            stale = build_navigation(course_id)
+            # Another request reorders the modules while this one is still building
+            with self.captureOnCommitCallbacks(execute=True):
+                self.css.position = 0
+                self.css.save()
+            return stale
+
+        with patch('core.services.navigation.build_navigation', side_effect=build_then_commit_elsewhere):
+            stale = navigation.get_navigation(self.course.pk)
+
+        stale_modules = stale['learning_paths'][0]['modules']
+        self.assertEqual([module['id'] for module in stale_modules], [self.html.pk, self.css.pk])
+        modules = get_navigation(self.course.pk)['learning_paths'][0]['modules']
+        self.assertEqual([module['id'] for module in modules], [self.css.pk, self.html.pk])
+
+    def test_moves_to_another_course_refresh_both_maps(self):
+        other_course = Course.objects.create(course_name="Data Science", description="Numbers")
+        other_path = LearningPath.objects.create(path_name="Python", course=other_course)
+        get_navigation(self.course.pk)
+        get_navigation(other_course.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.css.learning_path = other_path
+            self.css.save()
+
+        frontend = get_navigation(self.course.pk)['learning_paths'][0]
+        self.assertEqual([module['id'] for module in frontend['modules']], [self.html.pk])
+        other = get_navigation(other_course.pk)['learning_paths'][0]
+        self.assertEqual([module['id'] for module in other['modules']], [self.css.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.course = other_course
+            self.backend.save()
+
+        self.assertEqual(
+            [path['id'] for path in get_navigation(self.course.pk)['learning_paths']], [self.frontend.pk]
+        )
+
+    def test_next_learning_path_follows_positions(self):
+        response = self.client.get(f'/api/v1/next-learning-path/{self.frontend.pk}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'id': self.backend.pk, 'path_name': "Backend", 'position': 2, 'modules': ["Node.js"],
+        })
+        self.assertEqual(self.client.get(f'/api/v1/next-learning-path/{self.backend.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/next-learning-path/999/').status_code, 404)
+
+    def test_navigation_endpoint(self):
+        response = self.client.get(f'/api/v1/courses/{self.course.pk}/navigation/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['course_id'], self.course.pk)
+        self.assertEqual(len(response.data['learning_paths']), 2)
+        self.assertEqual(self.client.get('/api/v1/courses/999/navigation/').status_code, 404)
@@ -0,0 +1,136 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import (
+    User, Course, LearningPath, Module, Quiz, Question, Answer,
+    ModuleProgress, QuizProgress, LearningPathProgress, CourseProgress, ProgressEvent, QuestionResponse,
+)
+from core.services import quiz_cache
+from core.services.progress_service import record_module_progress, record_quiz_score
+from tests.utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestProgressBatch(TestCase):
+
+    def setUp(self):
+        quiz_cache._cache().clear()
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.course = Course.objects.create(course_name="Course", description="Test course")
+        self.modules = []
+        for path_index in range(2):
+            path = LearningPath.objects.create(path_name=f"Path {path_index}", course=self.course)
+            for module_index in range(4):
+                module = Module.objects.create(
+                    module_name=f"Module {path_index}-{module_index}", learning_path=path, topic="Topic",
+                    enriched_topic="Topic", enrichment_status=Module.ENRICHMENT_DONE,
+                )
+                quiz = Quiz.objects.create(quiz_name=f"Quiz {module.pk}", module=module)
+                question = Question.objects.create(quiz=quiz, question_text="Pick the right answer")
+                right = Answer.objects.create(question=question, answer_text="Right", is_correct=True)
+                wrong = Answer.objects.create(question=question, answer_text="Wrong", is_correct=False)
+                self.modules.append((module, quiz, question, right, wrong))
+
+    def events_for(self, modules, passed=True):
+        events = []
+        for module, quiz, question, right, wrong in modules:
+            events.append({'idempotency_key': f"video-{module.pk}", 'type': 'video_watched', 'module_id': module.pk})
+            events.append({
+                'idempotency_key': f"quiz-{quiz.pk}-{passed}", 'type': 'quiz_submitted', 'quiz_id': quiz.pk,
+                'answers': [{'question_id': question.pk, 'answer_id': (right if passed else wrong).pk}],
+                'timestamp': "2024-05-01T10:00:00Z",
+            })
+        return events
+
+    def post(self, events):
+        return self.client.post('/api/v1/progress/batch/', {'events': events}, format='json')
+
+    def test_batch_completes_course(self):
+        response = self.post(self.events_for(self.modules))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({result['status'] for result in response.data['results']}, {'applied'})
+        self.assertEqual(response.data['courses'][0]['progress_percentage'], 100)
+
+        course_progress = CourseProgress.objects.get(user=self.user)
+        self.assertTrue(course_progress.completed)
+        self.assertEqual(course_progress.completed_learning_paths, 2)
+        self.assertEqual(set(LearningPathProgress.objects.values_list('completed_modules', flat=True)), {4})
+        self.assertEqual(QuizProgress.objects.filter(user=self.user, completed=True).count(), 8)
+
+    def test_replayed_batch_is_not_applied_twice(self):
+        events = self.events_for(self.modules[:2])
+        first = self.post(events)
+        responses = QuestionResponse.objects.count()
+
+        second = self.post(events)
+
+        self.assertEqual({result['status'] for result in second.data['results']}, {'duplicate'})
+        self.assertEqual(
+            [result.get('score') for result in second.data['results']],
+            [result.get('score') for result in first.data['results']],
+        )
+        self.assertEqual(QuestionResponse.objects.count(), responses)
+        self.assertEqual(LearningPathProgress.objects.get(user=self.user, completed_modules=2).progress_percentage, 50)
+
+    def test_repeated_key_within_batch_is_a_duplicate(self):
+        event = self.events_for(self.modules[:1])[0]
+
+        response = self.post([event, event])
+
+        self.assertEqual([result['status'] for result in response.data['results']], ['applied', 'duplicate'])
+        self.assertEqual(ProgressEvent.objects.count(), 1)
+
+    def test_matches_one_request_per_event(self):
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="password", full_name="Other"
+        )
+        # Pass everything, then fail the first path's quizzes again
+        for module, quiz, question, right, wrong in self.modules:
+            record_module_progress(other, module.pk, video_watched=True)
+            record_quiz_score(other, quiz.pk, 100.0)
+        for module, quiz, question, right, wrong in self.modules[:4]:
+            record_quiz_score(other, quiz.pk, 0.0)
+
+        self.post(self.events_for(self.modules) + self.events_for(self.modules[:4], passed=False))
+
+        def state(user):
+            return (
+                sorted(ModuleProgress.objects.filter(user=user).values_list('module_id', 'completed')),
+                sorted(LearningPathProgress.objects.filter(user=user).values_list(
+                    'learning_path_id', 'completed_modules', 'progress_percentage', 'completed'
+                )),
+                list(CourseProgress.objects.filter(user=user).values_list(
+                    'progress_percentage', 'completed_learning_paths', 'path_progress_total', 'completed'
+                )),
+            )
+        self.assertEqual(state(self.user), state(other))
+
+    def test_query_count_does_not_grow_with_events(self):
+        path_modules = self.modules[:4]
+        for _, quiz, *_ in path_modules:
+            quiz_cache.get_compiled_quiz(quiz.pk)
+        self.post(self.events_for(path_modules[:1]))  # Creates the rollup rows
+
+        with CaptureQueriesContext(connection) as small:
+            self.post(self.events_for(path_modules[1:2]))
+        with CaptureQueriesContext(connection) as large:
+            self.post(self.events_for(path_modules[2:]))
+
+        self.assertEqual(len(small), len(large))
+
+    def test_invalid_event_rejects_whole_batch(self):
+        events = self.events_for(self.modules[:1]) + [{'idempotency_key': "bad", 'type': 'video_watched', 'module_id': 0}]
+
+        response = self.post(events)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProgressEvent.objects.exists())
+        self.assertFalse(ModuleProgress.objects.exists())
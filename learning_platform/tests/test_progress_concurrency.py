@@ -0,0 +1,103 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import (
+    User, Course, LearningPath, Module, Quiz, Question, Answer, ModuleProgress, LearningPathProgress, CourseProgress
+)
+from tests.utils import LOCMEM_CACHES, supports_concurrent_writes
+
+
+@unittest.skipUnless(
+    supports_concurrent_writes(),
+    "needs a database that serializes concurrent writers (Postgres, or file SQLite with transaction_mode=IMMEDIATE)",
+)
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestConcurrentProgressWrites(TransactionTestCase):
+    workers = 8
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.course = Course.objects.create(course_name="Course", description="Test course")
+        self.quizzes = []
+        for path_index in range(2):
+            path = LearningPath.objects.create(path_name=f"Path {path_index}", course=self.course)
+            for module_index in range(4):
+                module = Module.objects.create(
+                    module_name=f"Module {path_index}-{module_index}", learning_path=path, topic="Topic",
+                    enriched_topic="Topic", enrichment_status=Module.ENRICHMENT_DONE,
+                )
+                ModuleProgress.objects.create(user=self.user, module=module, video_watched=True)
+                quiz = Quiz.objects.create(quiz_name=f"Quiz {module.pk}", module=module)
+                question = Question.objects.create(quiz=quiz, question_text="Pick the right answer")
+                right = Answer.objects.create(question=question, answer_text="Right", is_correct=True)
+                wrong = Answer.objects.create(question=question, answer_text="Wrong", is_correct=False)
+                self.quizzes.append((quiz.pk, question.pk, right.pk, wrong.pk))
+
+    def submit(self, submission):
+        quiz_id, question_id, answer_id = submission
+        try:
+            client = APIClient()
+            client.force_authenticate(self.user)
+            response = client.post(
+                f'/api/v1/quizzes/{quiz_id}/submit/',
+                {'answers': [{'question_id': question_id, 'answer_id': answer_id}]},
+                format='json',
+            )
+            return response.status_code
+        finally:
+            connection.close()
+
+    def run_in_parallel(self, submissions):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            statuses = list(pool.map(self.submit, submissions))
+        self.assertEqual(set(statuses), {200})
+
+    def assertCountersExact(self):
+        # Counters maintained incrementally must match a count from the module rows
+        for path_progress in LearningPathProgress.objects.filter(user=self.user):
+            done = ModuleProgress.objects.filter(
+                user=self.user, module__learning_path=path_progress.learning_path, completed=True
+            ).count()
+            self.assertEqual(path_progress.completed_modules, done)
+            self.assertEqual(path_progress.progress_percentage, round(done / 4 * 100))
+
+        totals = LearningPathProgress.objects.filter(user=self.user).aggregate(
+            done=Count('id', filter=Q(completed=True)),
+        )
+        course_progress = CourseProgress.objects.get(user=self.user, course=self.course)
+        path_total = sum(LearningPathProgress.objects.filter(user=self.user).values_list('progress_percentage', flat=True))
+        self.assertEqual(course_progress.completed_learning_paths, totals['done'])
+        self.assertEqual(course_progress.path_progress_total, path_total)
+        self.assertEqual(course_progress.progress_percentage, round(path_total / 2))
+
+    def test_parallel_passing_submissions_complete_the_course(self):
+        # Every quiz passed twice at once, as if from two tabs
+        submissions = [(quiz_id, question_id, right) for quiz_id, question_id, right, _ in self.quizzes] * 2
+        random.Random(1).shuffle(submissions)
+
+        self.run_in_parallel(submissions)
+
+        self.assertCountersExact()
+        course_progress = CourseProgress.objects.get(user=self.user, course=self.course)
+        self.assertEqual(course_progress.progress_percentage, 100)
+        self.assertTrue(course_progress.completed)
+
+    def test_parallel_mixed_submissions_keep_counters_exact(self):
+        rng = random.Random(2)
+        submissions = [
+            (quiz_id, question_id, rng.choice([right, wrong]))
+            for _ in range(4) for quiz_id, question_id, right, wrong in self.quizzes
+        ]
+        rng.shuffle(submissions)
+
+        self.run_in_parallel(submissions)
+
+        self.assertCountersExact()
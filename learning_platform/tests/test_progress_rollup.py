@@ -0,0 +1,84 @@
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import User, Module, ModuleProgress, LearningPathProgress, CourseProgress
+from core.services.progress_service import recompute_all
+from tests.utils import create_course
+
+
+class TestProgressRollup(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+
+    def complete(self, module):
+        ModuleProgress.objects.update_or_create(
+            user=self.user, module=module, defaults={'video_watched': True, 'quiz_completed': True}
+        )
+
+    def test_completing_modules_rolls_up(self):
+        course = create_course(num_paths=2, modules_per_path=2)
+        first_path = course.learning_paths.order_by('id').first()
+        modules = list(first_path.modules.order_by('id'))
+
+        self.complete(modules[0])
+        path_progress = LearningPathProgress.objects.get(user=self.user, learning_path=first_path)
+        self.assertEqual(path_progress.completed_modules, 1)
+        self.assertEqual(path_progress.progress_percentage, 50)
+
+        self.complete(modules[1])
+        path_progress.refresh_from_db()
+        course_progress = CourseProgress.objects.get(user=self.user, course=course)
+        self.assertTrue(path_progress.completed)
+        self.assertEqual(course_progress.progress_percentage, 50)
+        self.assertEqual(course_progress.completed_learning_paths, 1)
+
+    def test_uncompleting_module_decrements(self):
+        course = create_course(num_paths=1, modules_per_path=2)
+        module = Module.objects.filter(learning_path__course=course).first()
+        self.complete(module)
+
+        ModuleProgress.objects.update_or_create(user=self.user, module=module, defaults={'quiz_completed': False})
+
+        path_progress = LearningPathProgress.objects.get(user=self.user)
+        self.assertEqual(path_progress.completed_modules, 0)
+        self.assertEqual(CourseProgress.objects.get(user=self.user).progress_percentage, 0)
+
+    def count_event_queries(self, course):
+        modules = list(Module.objects.filter(learning_path__course=course).order_by('id')[:2])
+        self.complete(modules[0])  # Creates the rollup rows
+        with CaptureQueriesContext(connection) as queries:
+            self.complete(modules[1])
+        return len(queries)
+
+    def test_query_count_is_independent_of_course_size(self):
+        small = self.count_event_queries(create_course(num_paths=2, modules_per_path=3))
+        large = self.count_event_queries(create_course(num_paths=40, modules_per_path=3))
+        self.assertEqual(small, large)
+
+    def test_recompute_fixes_drift(self):
+        course = create_course(num_paths=2, modules_per_path=1)
+        for module in Module.objects.filter(learning_path__course=course):
+            self.complete(module)
+        LearningPathProgress.objects.update(completed_modules=0, progress_percentage=0)
+        CourseProgress.objects.update(path_progress_total=0, progress_percentage=0)
+
+        recompute_all()
+
+        course_progress = CourseProgress.objects.get(user=self.user, course=course)
+        self.assertEqual(course_progress.progress_percentage, 100)
+        self.assertEqual(course_progress.completed_learning_paths, 2)
+        self.assertEqual(set(LearningPathProgress.objects.values_list('completed_modules', flat=True)), {1})
+
+    def test_duplicate_progress_rows_are_rejected(self):
+        course = create_course(num_paths=1, modules_per_path=1)
+        module = Module.objects.get(learning_path__course=course)
+        self.complete(module)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ModuleProgress.objects.bulk_create([ModuleProgress(user=self.user, module=module)])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CourseProgress.objects.bulk_create([CourseProgress(user=self.user, course=course)])
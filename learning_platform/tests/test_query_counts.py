@@ -0,0 +1,16 @@
+from tests.utils import QueryCountTestCase
+
+
+class TestViewSetQueryCounts(QueryCountTestCase):
+
+    def test_course_list(self):
+        self.assertConstantQueries('/api/v1/courses/')
+
+    def test_learning_path_list(self):
+        self.assertConstantQueries('/api/v1/learning-paths/')
+
+    def test_module_list(self):
+        self.assertConstantQueries('/api/v1/modules/')
+
+    def test_quiz_list(self):
+        self.assertConstantQueries('/api/v1/quizzes/')
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import User, Course, LearningPath, Module, Quiz, Question, Answer
+from core.services import quiz_cache
+from tests.utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestQuizCache(TestCase):
+
+    def setUp(self):
+        quiz_cache._cache().clear()
+        course = Course.objects.create(course_name="Course", description="Test course")
+        path = LearningPath.objects.create(path_name="Path", course=course)
+        module = Module.objects.create(module_name="Module", learning_path=path, topic="Topic")
+        self.quiz = Quiz.objects.create(quiz_name="Quiz", module=module)
+        self.question = Question.objects.create(quiz=self.quiz, question_text="What is HTML?")
+        self.correct = Answer.objects.create(question=self.question, answer_text="Markup", is_correct=True)
+        self.wrong = Answer.objects.create(question=self.question, answer_text="Database", is_correct=False)
+
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_compiled_quiz_is_served_from_cache(self):
+        compiled = quiz_cache.get_compiled_quiz(self.quiz.id)
+
+        with self.assertNumQueries(0):
+            cached = quiz_cache.get_compiled_quiz(self.quiz.id)
+
+        self.assertEqual(compiled, cached)
+        self.assertEqual(quiz_cache.get_answer_key(cached), {self.question.id: {self.correct.id}})
+
+    def test_answer_change_invalidates_and_changes_version(self):
+        version = quiz_cache.get_compiled_quiz(self.quiz.id)['version']
+
+        self.wrong.is_correct = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wrong.save()
+
+        compiled = quiz_cache.get_compiled_quiz(self.quiz.id)
+        self.assertNotEqual(compiled['version'], version)
+        self.assertEqual(quiz_cache.get_answer_key(compiled), {self.question.id: {self.correct.id, self.wrong.id}})
+
+    def test_question_delete_invalidates(self):
+        quiz_cache.get_compiled_quiz(self.quiz.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.delete()
+
+        self.assertEqual(quiz_cache.get_compiled_quiz(self.quiz.id)['questions'], [])
+
+    def test_copy_compiled_during_a_commit_is_not_served(self):
+        compile_quiz = quiz_cache.compile_quiz
+
+        def compile_then_commit_elsewhere(quiz_id):
+            stale = compile_quiz(quiz_id)
+            # Another process commits a change and invalidates while this reader is still compiling
+            Answer.objects.filter(pk=self.wrong.pk).update(is_correct=True)
+            quiz_cache.invalidate_quiz(quiz_id)
+            return stale
+
+        with patch('core.services.quiz_cache.compile_quiz', side_effect=compile_then_commit_elsewhere):
+            stale = quiz_cache.get_compiled_quiz(self.quiz.id)
+
+        self.assertEqual(quiz_cache.get_answer_key(stale), {self.question.id: {self.correct.id}})
+        compiled = quiz_cache.get_compiled_quiz(self.quiz.id)
+        self.assertEqual(quiz_cache.get_answer_key(compiled), {self.question.id: {self.correct.id, self.wrong.id}})
+
+    def test_retrieve_uses_etag(self):
+        response = self.client.get(f'/api/v1/quizzes/{self.quiz.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['questions'][0]['answers'][0]['answer_text'], "Markup")
+
+        cached = self.client.get(f'/api/v1/quizzes/{self.quiz.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_retrieve_missing_quiz(self):
+        self.assertEqual(self.client.get('/api/v1/quizzes/999/').status_code, 404)
@@ -0,0 +1,177 @@
+import unittest
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import User, Course, LearningPath, Module, Quiz, QuizGenerationJob
+from core.services import api_cache
+from core.services.job_queue import MAX_ATTEMPTS
+from core.services.llm_client import LLMError, StubLLMClient
+from core.services.quiz_generation_service import QUIZ_PROMPT, quiz_content_hash
+from core.services.quiz_job_service import drain_quiz_generation_queue, enqueue_quiz_generation
+from tests.utils import LOCMEM_CACHES, supports_concurrent_writes
+
+STUB_LLM = 'core.services.llm_client.StubLLMClient'
+
+
+def make_modules(count):
+    course = Course.objects.create(course_name="Course", description="Test course")
+    path = LearningPath.objects.create(path_name="Path", course=course)
+    return [
+        Module.objects.create(
+            module_name=f"Module {i}", learning_path=path, topic=f"Topic {i}", enriched_topic=f"Topic {i}",
+            video_link=f"https://www.youtube.com/watch?v=video{i}",
+        )
+        for i in range(count)
+    ]
+
+
+class TestStubLLMClient(SimpleTestCase):
+
+    def test_is_deterministic_and_follows_quiz_format(self):
+        messages = [{'role': 'user', 'content': "Create 4 multiple-choice quiz questions. Content: caching caching sql"}]
+
+        first = StubLLMClient().complete(messages, max_tokens=800)
+
+        self.assertEqual(first, StubLLMClient().complete(messages, max_tokens=800))
+        blocks = first.split("\n\n")
+        self.assertEqual(len(blocks), 4)
+        for block in blocks:
+            answers = block.split("\n")[1:]
+            self.assertEqual(len(answers), 4)
+            self.assertEqual(sum("Correct:" in answer for answer in answers), 1)
+
+
+@override_settings(LLM_CLIENT=STUB_LLM, LLM_STUB_LATENCY=0, CACHES=LOCMEM_CACHES)
+@patch('core.services.quiz_generation_service.fetch_video_description', return_value=None)
+@patch('core.services.quiz_generation_service.fetch_video_transcript', return_value="Indexes speed up lookups.")
+class TestQuizGenerationJobs(TestCase):
+
+    def setUp(self):
+        api_cache.clear()
+        self.module = make_modules(1)[0]
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def request_quiz(self):
+        return self.client.post(f'/api/v1/modules/{self.module.pk}/generate-quiz/')
+
+    def test_request_queues_job_without_calling_llm(self, transcript, description):
+        response = self.request_quiz()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], QuizGenerationJob.STATUS_PENDING)
+        self.assertTrue(response.data['status_url'].endswith(f"/api/v1/quiz-generation-jobs/{response.data['id']}/"))
+        transcript.assert_not_called()
+
+    def test_duplicate_requests_share_in_flight_job(self, transcript, description):
+        first = self.request_quiz()
+        second = self.request_quiz()
+        job, created = enqueue_quiz_generation(self.module)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertFalse(created)
+        self.assertEqual(job.pk, first.data['id'])
+        self.assertEqual(QuizGenerationJob.objects.count(), 1)
+
+    def test_worker_generates_quiz_and_status_reports_it(self, transcript, description):
+        job_id = self.request_quiz().data['id']
+
+        counts = drain_quiz_generation_queue()
+
+        self.assertEqual(counts['done'], 1)
+        status = self.client.get(f'/api/v1/quiz-generation-jobs/{job_id}/').data
+        self.assertEqual(status['status'], QuizGenerationJob.STATUS_DONE)
+        quiz = Quiz.objects.get(pk=status['quiz'])
+        self.assertEqual(quiz.module, self.module)
+        self.assertEqual(quiz.questions.count(), 5)
+        # A finished job does not block a new request
+        self.assertEqual(self.request_quiz().status_code, 202)
+
+    def test_llm_failure_is_retried_then_marked_failed(self, transcript, description):
+        job_id = self.request_quiz().data['id']
+
+        with patch.object(StubLLMClient, 'complete', side_effect=LLMError("rate limited")):
+            for _ in range(MAX_ATTEMPTS):
+                drain_quiz_generation_queue()
+                # Skip the retry backoff
+                QuizGenerationJob.objects.update(run_after=None)
+
+        job = QuizGenerationJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, QuizGenerationJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, MAX_ATTEMPTS)
+        self.assertIn("Failed to generate", job.last_error)
+        self.assertFalse(Quiz.objects.exists())
+
+    def test_same_content_calls_llm_once(self, transcript, description):
+        with patch.object(StubLLMClient, 'complete', autospec=True, side_effect=StubLLMClient.complete) as complete:
+            self.request_quiz()
+            drain_quiz_generation_queue()
+            self.request_quiz()
+            drain_quiz_generation_queue()
+
+        self.assertEqual(complete.call_count, 1)
+        first, second = Quiz.objects.order_by('pk')
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(second.questions.count(), 5)
+
+    def test_reuse_existing_links_previous_quiz(self, transcript, description):
+        first_job = self.client.post(
+            f'/api/v1/modules/{self.module.pk}/generate-quiz/', {'reuse_existing': True}, format='json'
+        ).data['id']
+        drain_quiz_generation_queue()
+        second_job = self.client.post(
+            f'/api/v1/modules/{self.module.pk}/generate-quiz/', {'reuse_existing': True}, format='json'
+        ).data['id']
+        drain_quiz_generation_queue()
+
+        quiz = Quiz.objects.get()
+        self.assertEqual(
+            list(QuizGenerationJob.objects.filter(pk__in=[first_job, second_job]).values_list('quiz', flat=True)),
+            [quiz.pk, quiz.pk],
+        )
+
+    def test_unknown_module_and_job_are_404(self, transcript, description):
+        self.assertEqual(self.client.post('/api/v1/modules/0/generate-quiz/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/quiz-generation-jobs/0/').status_code, 404)
+
+
+class TestQuizContentHash(SimpleTestCase):
+
+    def test_depends_on_every_input(self):
+        base = quiz_content_hash("content", QUIZ_PROMPT, "gpt-3.5-turbo", 5)
+
+        self.assertEqual(base, quiz_content_hash("content", QUIZ_PROMPT, "gpt-3.5-turbo", 5))
+        self.assertNotEqual(base, quiz_content_hash("content!", QUIZ_PROMPT, "gpt-3.5-turbo", 5))
+        self.assertNotEqual(base, quiz_content_hash("content", QUIZ_PROMPT + " ", "gpt-3.5-turbo", 5))
+        self.assertNotEqual(base, quiz_content_hash("content", QUIZ_PROMPT, "stub", 5))
+        self.assertNotEqual(base, quiz_content_hash("content", QUIZ_PROMPT, "gpt-3.5-turbo", 3))
+
+
+@unittest.skipUnless(
+    supports_concurrent_writes(),
+    "needs a database that serializes concurrent writers (Postgres, or file SQLite with transaction_mode=IMMEDIATE)",
+)
+@override_settings(LLM_CLIENT=STUB_LLM, LLM_STUB_LATENCY=0.05, CACHES=LOCMEM_CACHES)
+@patch('core.services.quiz_generation_service.fetch_video_description', return_value=None)
+@patch('core.services.quiz_generation_service.fetch_video_transcript', return_value="Indexes speed up lookups.")
+class TestConcurrentQuizGeneration(TransactionTestCase):
+
+    def test_pool_runs_each_job_once(self, transcript, description):
+        api_cache.clear()
+        modules = make_modules(8)
+        for module in modules:
+            enqueue_quiz_generation(module)
+
+        counts = drain_quiz_generation_queue(workers=4)
+
+        self.assertEqual(counts, {'done': 8, 'pending': 0, 'failed': 0})
+        self.assertEqual(
+            sorted(Quiz.objects.values_list('module_id', flat=True)), sorted(module.pk for module in modules)
+        )
+        self.assertEqual(set(QuizGenerationJob.objects.values_list('attempts', flat=True)), {1})
@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import User, Course, LearningPath, Module, Quiz, Question, Answer, QuizProgress, QuestionResponse
+from core.services.quiz_grading import grade_answers
+
+
+def create_quiz(num_questions):
+    course = Course.objects.create(course_name="Course", description="Test course")
+    path = LearningPath.objects.create(path_name="Path", course=course)
+    module = Module.objects.create(module_name="Module", learning_path=path, topic="Topic")
+    quiz = Quiz.objects.create(quiz_name="Quiz", module=module)
+    answers = {}
+    for i in range(num_questions):
+        question = Question.objects.create(quiz=quiz, question_text=f"Question {i}")
+        correct = Answer.objects.create(question=question, answer_text="Right", is_correct=True)
+        wrong = Answer.objects.create(question=question, answer_text="Wrong", is_correct=False)
+        answers[question.id] = (correct.id, wrong.id)
+    return quiz, answers
+
+
+class TestGradeAnswers(TestCase):
+
+    def test_grades_against_answer_key(self):
+        answer_key = {1: {10}, 2: {20}}
+        results = grade_answers(answer_key, [
+            {'question_id': 1, 'answer_id': 10},
+            {'question_id': '2', 'answer_id': '21'},
+            {'question_id': 3, 'answer_id': 30},
+        ])
+        self.assertEqual(results, [(1, 10, True), (2, 21, False)])
+
+    def test_rejects_duplicate_answers(self):
+        with self.assertRaises(ValueError):
+            grade_answers({1: {10}}, [{'question_id': 1, 'answer_id': 10}, {'question_id': 1, 'answer_id': 11}])
+
+    def test_rejects_answers_that_are_not_objects(self):
+        for answer in (1, "1", [1, 10], None):
+            with self.assertRaises(ValueError):
+                grade_answers({1: {10}}, [answer])
+
+
+class TestSubmitQuiz(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def submit(self, quiz, answers):
+        return self.client.post(f'/api/v1/quizzes/{quiz.id}/submit/', {'answers': answers}, format='json')
+
+    def test_submit_scores_and_records_responses(self):
+        quiz, answers = create_quiz(4)
+        submission = [
+            {'question_id': question_id, 'answer_id': correct if i < 3 else wrong}
+            for i, (question_id, (correct, wrong)) in enumerate(answers.items())
+        ]
+
+        response = self.submit(quiz, submission)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 75)
+        self.assertTrue(response.data['completed'])
+        self.assertEqual(QuestionResponse.objects.filter(user=self.user, quiz=quiz).count(), 4)
+        self.assertEqual(QuestionResponse.objects.filter(user=self.user, is_correct=True).count(), 3)
+        self.assertEqual(QuizProgress.objects.get(user=self.user, quiz=quiz).score, 75)
+
+    def test_duplicate_question_is_rejected(self):
+        quiz, answers = create_quiz(2)
+        question_id, (correct, wrong) = next(iter(answers.items()))
+
+        response = self.submit(quiz, [
+            {'question_id': question_id, 'answer_id': wrong},
+            {'question_id': question_id, 'answer_id': correct},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuizProgress.objects.exists())
+
+    def test_malformed_answers_are_rejected(self):
+        quiz, _ = create_quiz(2)
+
+        response = self.submit(quiz, [1, 2])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuizProgress.objects.exists())
+
+    def count_submit_queries(self, num_questions):
+        quiz, answers = create_quiz(num_questions)
+        submission = [{'question_id': q, 'answer_id': correct} for q, (correct, _) in answers.items()]
+        with CaptureQueriesContext(connection) as queries:
+            self.submit(quiz, submission)
+        return len(queries)
+
+    def test_query_count_is_independent_of_quiz_size(self):
+        self.assertEqual(self.count_submit_queries(5), self.count_submit_queries(50))
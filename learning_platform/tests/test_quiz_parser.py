@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Course, LearningPath, Module, Quiz, Answer
+from core.services.quiz_generation_service import save_generated_quiz
+from core.services.quiz_parser import parse_quiz_text
+
+
+def correct_answers(questions):
+    return [[answer['text'] for answer in question['answers'] if answer['is_correct']] for question in questions]
+
+
+class TestParseQuizText(SimpleTestCase):
+
+    def test_prompt_format(self):
+        questions = parse_quiz_text(
+            "Question 1: What does an index speed up?\nWrites\nLookups Correct:\nBackups\nMigrations\n\n"
+            "Question 2: Which cache is shared?\nlocmem Correct:\nnone\n"
+        )
+
+        self.assertEqual([q['question'] for q in questions], ["What does an index speed up?", "Which cache is shared?"])
+        self.assertEqual([len(q['answers']) for q in questions], [4, 2])
+        self.assertEqual(correct_answers(questions), [["Lookups"], ["locmem"]])
+
+    def test_format_drift(self):
+        questions = parse_quiz_text(
+            "Here is your quiz:\r\n\r\n"
+            "**Question 1:** What is an index?\r\nA) A table\r\nB) A lookup structure (Correct)\r\nC) A view\r\n"
+            "Question 2:\nPick a letter\na. x\nb. y\nc. z\nCorrect answer: C\n"
+            "3. Which one?\n- one\n- two ✓\n\n\n"
+            "Q4 - Last?\nCorrect: yes\nno\n"
+        )
+
+        self.assertEqual(
+            [q['question'] for q in questions], ["What is an index?", "Pick a letter", "Which one?", "Last?"]
+        )
+        self.assertEqual(correct_answers(questions), [["A lookup structure"], ["z"], ["two"], ["yes"]])
+        self.assertEqual([a['text'] for a in questions[0]['answers']], ["A table", "A lookup structure", "A view"])
+
+    def test_drops_questions_without_exactly_one_correct_answer(self):
+        with self.assertLogs('core.services.quiz_parser', 'WARNING') as logs:
+            questions = parse_quiz_text(
+                "Question 1: None?\nA\nB\n\n"
+                "Question 2: Two?\nA Correct:\nB Correct:\n\n"
+                "Question 3: One answer?\nA Correct:\n\n"
+                "Question 4: Fine?\nA\nB Correct:\n"
+            )
+
+        self.assertEqual([q['question'] for q in questions], ["Fine?"])
+        self.assertEqual(len(logs.output), 3)
+
+    def test_empty_output(self):
+        self.assertEqual(parse_quiz_text(""), [])
+        self.assertEqual(parse_quiz_text(None), [])
+
+
+class TestSaveGeneratedQuiz(TestCase):
+
+    def test_three_inserts_in_one_transaction(self):
+        course = Course.objects.create(course_name="Course", description="Test course")
+        path = LearningPath.objects.create(path_name="Path", course=course)
+        module = Module.objects.create(module_name="Module", learning_path=path, topic="Topic", enriched_topic="Topic")
+        generated = {
+            'content_hash': "a" * 64,
+            'questions': parse_quiz_text("\n\n".join(
+                f"Question {n}: Q{n}?\nA\nB Correct:\nC\nD" for n in range(1, 6)
+            )),
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            quiz = save_generated_quiz(module, generated)
+
+        statements = [q['sql'] for q in queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(statements), 3)
+        self.assertTrue(all(sql.startswith('INSERT') for sql in statements))
+        self.assertEqual(Quiz.objects.get().content_hash, "a" * 64)
+        self.assertEqual(quiz.questions.count(), 5)
+        self.assertEqual(Answer.objects.filter(question__quiz=quiz, is_correct=True).count(), 5)
+        self.assertEqual(
+            list(quiz.questions.order_by('pk').values_list('question_text', flat=True)),
+            ["Q1?", "Q2?", "Q3?", "Q4?", "Q5?"],
+        )
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.services.relevance import rank_videos, score_documents, term_coverage, tokenize
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def video(title, views=1000, published_at='2024-05-01T00:00:00Z', minutes=60, title_similarity=1.0,
+          desc_similarity=1.0):
+    return {
+        'title': title, 'views': views, 'published_at': published_at, 'duration': timedelta(minutes=minutes),
+        'title_similarity': title_similarity, 'desc_similarity': desc_similarity,
+    }
+
+
+class TestRelevanceScoring(SimpleTestCase):
+
+    def test_tokenize_normalizes(self):
+        self.assertEqual(tokenize("Python Decorators, explained!"), ['python', 'decorator', 'explained'])
+        self.assertEqual(tokenize("How to"), ['how', 'to'])
+
+    def test_term_coverage(self):
+        self.assertEqual(term_coverage("Python decorators", "Decorator patterns in PYTHON"), 1.0)
+        self.assertEqual(term_coverage("Python decorators", "Python for beginners"), 0.5)
+        self.assertEqual(term_coverage("", "anything"), 0.0)
+
+    def test_score_documents_prefers_rare_terms_and_ignores_repetition(self):
+        documents = [
+            "python python python python python basics",
+            "python decorators with examples",
+            "cooking pasta at home",
+        ]
+        scores = score_documents("python decorators", documents)
+
+        self.assertEqual(scores[1], max(scores))
+        self.assertLess(scores[0], 0.5)
+        self.assertEqual(scores[2], 0.0)
+        self.assertTrue(all(0.0 <= score <= 1.0 for score in scores))
+
+    def test_rank_combines_relevance_with_popularity(self):
+        relevant = video("Python decorators", views=10_000)
+        popular = video("Python news", views=5_000_000, title_similarity=0.5, desc_similarity=0.1)
+
+        ranked = rank_videos([popular, relevant], now=NOW)
+
+        self.assertEqual(ranked[0]['title'], "Python decorators")
+        self.assertGreater(ranked[0]['relevance_score'], ranked[1]['relevance_score'])
+
+    def test_rank_weights_are_configurable(self):
+        relevant = video("Python decorators", views=10_000)
+        popular = video("Python news", views=5_000_000, title_similarity=0.5, desc_similarity=0.1)
+
+        ranked = rank_videos([relevant, popular], weights={'views': 1.0}, now=NOW)
+        self.assertEqual(ranked[0]['title'], "Python news")
+
+        with override_settings(VIDEO_RANKING_WEIGHTS={'recency': 1.0}):
+            ranked = rank_videos(
+                [video("Old", published_at='2019-01-01T00:00:00Z'), video("New")], now=NOW
+            )
+        self.assertEqual(ranked[0]['title'], "New")
+
+    def test_overlong_videos_score_lower(self):
+        ranked = rank_videos([video("Ten hours", minutes=600), video("One hour", minutes=60)], now=NOW)
+        self.assertEqual(ranked[0]['title'], "One hour")
+
+    def test_benchmark_command_runs(self):
+        out = StringIO()
+        call_command('benchmark_relevance', searches=2, candidates=3, description_words=20, stdout=out)
+        self.assertIn("speedup", out.getvalue())
@@ -0,0 +1,181 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningPath, Module, Question, Quiz, SearchEntry, User
+from core.services import search_index
+from core.services.quiz_generation_service import save_generated_quiz
+from core.services.quiz_parser import parse_quiz_text
+from core.services.search_index import rebuild_index, search
+from tests.utils import LOCMEM_CACHES
+
+
+def titles(hits):
+    return [hit['title'] for hit in hits]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SearchTestCase(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        search_index._index.reset()
+        self.course = Course.objects.create(course_name="Python Programming", description="Learn Python from scratch")
+        self.path = LearningPath.objects.create(path_name="Web development with Django", course=self.course)
+        self.decorators = Module.objects.create(
+            module_name="Python decorators", learning_path=self.path, topic="Python decorators",
+        )
+        self.forms = Module.objects.create(module_name="Django forms", learning_path=self.path, topic="HTML forms")
+        self.quiz = Quiz.objects.create(quiz_name="Decorators quiz", module=self.decorators)
+        self.question = Question.objects.create(quiz=self.quiz, question_text="What does a decorator return?")
+        rebuild_index()
+
+
+class TestCatalogSearch(SearchTestCase):
+
+    def test_prefix_matches_whole_words(self):
+        total, hits = search("decor")
+
+        self.assertEqual(total, 2)
+        self.assertEqual(set(titles(hits)), {"Python decorators", "What does a decorator return?"})
+
+    def test_every_word_must_match(self):
+        total, hits = search("python deco")
+
+        self.assertEqual(total, 1)
+        self.assertEqual(hits[0]['type'], SearchEntry.KIND_MODULE)
+        self.assertEqual(hits[0]['id'], self.decorators.pk)
+        self.assertEqual(hits[0]['learning_path_id'], self.path.pk)
+        self.assertEqual(search("python cooking"), (0, []))
+
+    def test_title_matches_rank_above_body_matches(self):
+        total, hits = search("python")
+
+        self.assertEqual(total, 2)
+        # "Python" is in the titles of the course and the module; the course matches it in the body too
+        self.assertEqual(titles(hits), ["Python Programming", "Python decorators"])
+        self.assertGreaterEqual(hits[0]['score'], hits[1]['score'])
+
+        _, hits = search("html")
+        self.assertEqual(titles(hits), ["Django forms"])  # Topic only
+
+    def test_kinds_filter_and_question_context(self):
+        total, hits = search("decorator", kinds=[SearchEntry.KIND_QUESTION])
+
+        self.assertEqual(total, 1)
+        self.assertEqual(hits[0]['quiz_id'], self.quiz.pk)
+        self.assertEqual(hits[0]['module_id'], self.decorators.pk)
+
+    def test_offset_and_limit(self):
+        total, first = search("django", limit=1)
+        _, second = search("django", offset=1, limit=1)
+
+        self.assertEqual(total, 2)
+        self.assertEqual(len(first), 1)
+        self.assertNotEqual(titles(first), titles(second))
+
+    def test_blank_query_finds_nothing(self):
+        self.assertEqual(search("  ,. "), (0, []))
+
+
+class TestIndexMaintenance(SearchTestCase):
+
+    def test_saves_and_deletes_update_the_index(self):
+        search("python")  # Load the index
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.forms.module_name = "Django forms and validation"
+            self.forms.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.delete()
+
+        self.assertEqual(titles(search("validation")[1]), ["Django forms and validation"])
+        self.assertEqual(search("decorator", kinds=[SearchEntry.KIND_QUESTION]), (0, []))
+        self.assertTrue(SearchEntry.objects.get(kind=SearchEntry.KIND_QUESTION).deleted)
+
+    def test_other_process_changes_are_picked_up(self):
+        search("python")  # Load the index
+
+        # Another process renames a module and deletes the question
+        SearchEntry.objects.filter(kind=SearchEntry.KIND_MODULE, object_id=self.forms.pk).update(
+            title="Flask forms", updated_at=search_index.timezone.now(),
+        )
+        SearchEntry.objects.filter(kind=SearchEntry.KIND_QUESTION).update(
+            deleted=True, updated_at=search_index.timezone.now(),
+        )
+        self.assertEqual(search("flask")[0], 0)  # Token unchanged: the index is current as far as it knows
+
+        caches['shared'].set(search_index.VERSION_KEY, 'changed-elsewhere')
+        with patch('core.services.search_index.time.monotonic', return_value=10 ** 9):
+            self.assertEqual(titles(search("flask")[1]), ["Flask forms"])
+            self.assertEqual(search("decorator", kinds=[SearchEntry.KIND_QUESTION]), (0, []))
+
+    def test_rebuild_drops_tombstones_and_orphans(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.delete()
+        Module.objects.filter(pk=self.forms.pk).delete()  # Never committed, so the entry is left behind
+        SearchEntry.objects.create(kind=SearchEntry.KIND_COURSE, object_id=10 ** 6, title="Gone")
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn("Indexed 3 catalog object(s)", out.getvalue())
+        self.assertEqual(SearchEntry.objects.count(), 3)
+        self.assertFalse(SearchEntry.objects.filter(deleted=True).exists())
+        self.assertEqual(search("gone"), (0, []))
+
+    def test_generated_questions_are_indexed(self):
+        generated = {
+            'content_hash': "a" * 64,
+            'questions': parse_quiz_text("Question 1: Which syntax wraps functions?\nA\n@ Correct:\nC\nD"),
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_generated_quiz(self.forms, generated)
+
+        _, hits = search("wraps")
+        self.assertEqual(titles(hits), ["Which syntax wraps functions?"])
+        self.assertEqual(hits[0]['module_id'], self.forms.pk)
+
+
+class TestSearchEndpoint(SearchTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_paginates_results(self):
+        response = self.client.get('/api/v1/search/', {'q': 'python', 'page_size': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(titles(response.data['results']), ["Python Programming"])
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('page=2', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(titles(response.data['results']), ["Python decorators"])
+        self.assertIsNone(response.data['next'])
+        self.assertNotIn('page=', response.data['previous'])
+
+    def test_type_filter(self):
+        response = self.client.get('/api/v1/search/', {'q': 'decorator', 'type': 'module,course'})
+
+        self.assertEqual(titles(response.data['results']), ["Python decorators"])
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/', {'q': 'python', 'type': 'video'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/search/', {'q': 'python', 'page': 'x'}).status_code, 400)
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/v1/search/', {'q': 'python'}).status_code, 401)
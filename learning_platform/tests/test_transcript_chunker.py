@@ -0,0 +1,99 @@
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from core.services import api_cache
+from core.services.llm_client import StubLLMClient
+from core.services.quiz_generation_service import generate_quiz_from_content
+from core.services.transcript_chunker import estimate_tokens, iter_chunks, query_terms, select_chunks
+from tests.utils import LOCMEM_CACHES
+
+
+def lecture(sections):
+    """A long transcript made of 300-word sections, each about one subject."""
+    return " ".join(" ".join(f"{subject} filler{i}" for i in range(150)) for subject in sections)
+
+
+class TestIterChunks(SimpleTestCase):
+
+    def test_chunks_are_bounded_and_overlap(self):
+        text = " ".join(f"word{i}" for i in range(1000))
+
+        chunks = list(iter_chunks(text, chunk_tokens=200, overlap_tokens=20))
+
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(chunk.tokens <= 201 for chunk in chunks))
+        for previous, current in zip(chunks, chunks[1:]):
+            # 20 tokens is ten two-token words
+            self.assertEqual(current.text.split()[:10], previous.text.split()[-10:])
+        self.assertTrue(chunks[-1].text.endswith("word999"))
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual([chunk.text for chunk in iter_chunks("just a few words", 200, 20)], ["just a few words"])
+        self.assertEqual(list(iter_chunks("", 200, 20)), [])
+
+    def test_overlap_must_be_smaller_than_chunk(self):
+        with self.assertRaises(ValueError):
+            list(iter_chunks("text", 100, 100))
+
+
+class TestSelectChunks(SimpleTestCase):
+
+    def test_prefers_chunks_about_the_query_in_transcript_order(self):
+        chunks = list(iter_chunks(lecture(["intro", "indexes", "weather", "indexes", "outro"]), 600, 0))
+
+        selected = select_chunks(chunks, query_terms("Database indexes"), limit=2)
+
+        self.assertEqual(len(selected), 2)
+        self.assertTrue(all("indexes" in chunk.text for chunk in selected))
+        self.assertLess(selected[0].index, selected[1].index)
+
+    def test_spreads_picks_without_matching_terms(self):
+        chunks = list(iter_chunks(lecture(["a1", "b2", "c3", "d4", "e5", "f6"]), 600, 0))
+
+        selected = select_chunks(chunks, query_terms("unrelated"), limit=3)
+
+        self.assertEqual([chunk.index for chunk in selected], [0, 2, 4])
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES, LLM_CLIENT='core.services.llm_client.StubLLMClient', LLM_STUB_LATENCY=0.05,
+    QUIZ_CHUNK_TOKENS=600, QUIZ_CHUNK_OVERLAP_TOKENS=50, QUIZ_CONTENT_TOKEN_BUDGET=1800,
+)
+class TestGenerateQuizFromContent(SimpleTestCase):
+
+    def setUp(self):
+        api_cache.clear()
+
+    def generate(self, content, **kwargs):
+        prompts, threads = [], set()
+        original = StubLLMClient.complete
+
+        def complete(client, messages, max_tokens, temperature=0.7):
+            prompts.append(messages[-1]['content'])
+            threads.add(threading.current_thread().name)
+            return original(client, messages, max_tokens, temperature)
+
+        with patch.object(StubLLMClient, 'complete', autospec=True, side_effect=complete):
+            generated = generate_quiz_from_content(content, **kwargs)
+        return generated, prompts, threads
+
+    def test_long_transcript_stays_within_budget(self):
+        sections = ["indexes" if i % 7 == 0 else f"topic{i}" for i in range(60)]
+
+        generated, prompts, threads = self.generate(lecture(sections), query="indexes", num_questions=5)
+
+        self.assertEqual(len(prompts), 3)  # budget // chunk size
+        self.assertTrue(all(estimate_tokens(prompt) < 600 + 100 for prompt in prompts))
+        self.assertTrue(all("indexes" in prompt for prompt in prompts))
+        self.assertGreater(len(threads), 1)
+        self.assertEqual(len(generated['questions']), 5)
+        self.assertEqual(len(generated['content_hash']), 64)
+
+    def test_short_content_is_sent_as_is(self):
+        generated, prompts, threads = self.generate("Indexes speed up lookups.", query="indexes")
+
+        self.assertEqual(len(prompts), 1)
+        self.assertIn("Indexes speed up lookups.", prompts[0])
+        self.assertEqual(len(generated['questions']), 5)
@@ -0,0 +1,60 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from core.services import youtube_client
+from core.services.youtube_client import get_youtube_client, reset_youtube_clients
+
+
+class TestYouTubeClient(unittest.TestCase):
+
+    def setUp(self):
+        reset_youtube_clients()
+
+    @patch('core.services.youtube_client.build_from_document')
+    def test_client_is_reused_within_a_thread(self, mock_build):
+        mock_build.side_effect = lambda *args, **kwargs: object()
+
+        first = get_youtube_client()
+        second = get_youtube_client()
+
+        self.assertIs(first, second)
+        mock_build.assert_called_once()
+
+    @patch('core.services.youtube_client.build_from_document')
+    def test_each_thread_gets_its_own_client(self, mock_build):
+        mock_build.side_effect = lambda *args, **kwargs: object()
+        clients = []
+
+        thread = threading.Thread(target=lambda: clients.append(get_youtube_client()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(clients[0], get_youtube_client())
+        self.assertEqual(mock_build.call_count, 2)
+
+    @patch('core.services.youtube_client.build_from_document')
+    def test_api_key_is_read_lazily(self, mock_build):
+        with patch.dict(os.environ, {'YOUTUBE_API_KEY': 'key-1'}):
+            get_youtube_client()
+        self.assertEqual(mock_build.call_args.kwargs['developerKey'], 'key-1')
+
+        reset_youtube_clients()
+        with patch.dict(os.environ, {'YOUTUBE_API_KEY': 'key-2'}):
+            get_youtube_client()
+        self.assertEqual(mock_build.call_args.kwargs['developerKey'], 'key-2')
+
+    @patch('core.services.youtube_client.get_static_doc', wraps=youtube_client.get_static_doc)
+    def test_discovery_document_loaded_once(self, mock_static_doc):
+        youtube_client._discovery_document = None
+
+        get_youtube_client()
+        reset_youtube_clients()
+        get_youtube_client()
+
+        mock_static_doc.assert_called_once_with('youtube', 'v3')
+
+
+if __name__ == '__main__':
+    unittest.main()
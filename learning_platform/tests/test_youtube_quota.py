@@ -0,0 +1,196 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import ApiQuota, BackgroundJob, Course, EnrichmentJob, LearningPath, Module, User
+from core.services import api_cache, youtube_quota
+from core.services.circuit_breaker import CLOSED, OPEN, CircuitOpenError, get_breaker, reset_breakers
+from core.services.enrichment_service import drain_enrichment_queue, requeue_modules
+from core.services.job_queue import claim_next_job
+from core.services.youtube_quota import QuotaExceeded, consume, get_quota_status, wait_time
+from core.services.youtube_service import get_youtube_videos
+from tests.utils import supports_concurrent_writes
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+BACKGROUND = BackgroundJob.PRIORITY_BACKGROUND
+
+
+def set_remaining(tokens, at=NOW):
+    ApiQuota.objects.update_or_create(
+        name=youtube_quota.BUCKET, defaults={'capacity': 1000, 'tokens': tokens, 'refilled_at': at}
+    )
+
+
+@override_settings(YOUTUBE_QUOTA_UNITS_PER_DAY=1000, YOUTUBE_QUOTA_RESERVE=300)
+@patch('core.services.youtube_quota.timezone.now', return_value=NOW)
+class TestQuotaBucket(TestCase):
+
+    def test_consume_spends_from_full_bucket(self, now):
+        self.assertEqual(consume(100), 900)
+        self.assertEqual(consume(1), 899)
+        self.assertEqual(get_quota_status()['remaining'], 899)
+
+    def test_bucket_refills_over_time(self, now):
+        set_remaining(0, at=NOW - timedelta(hours=6))
+
+        self.assertEqual(get_quota_status()['remaining'], 250)
+        self.assertEqual(consume(250), 0)
+
+    def test_background_work_keeps_reserve(self, now):
+        set_remaining(350)
+
+        with self.assertRaises(QuotaExceeded) as raised:
+            consume(100, BACKGROUND)
+        self.assertAlmostEqual(raised.exception.retry_after, 50 * 86400 / 1000)
+        self.assertEqual(consume(100), 250)  # Interactive calls may spend the reserve
+
+    def test_exhausted_bucket_is_not_charged(self, now):
+        set_remaining(50)
+
+        with self.assertRaises(QuotaExceeded):
+            consume(100)
+        self.assertEqual(ApiQuota.objects.get().tokens, 50)
+        self.assertEqual(wait_time(100), 50 * 86400 / 1000)
+        self.assertEqual(wait_time(50), 0)
+
+
+@override_settings(YOUTUBE_QUOTA_UNITS_PER_DAY=1000, YOUTUBE_QUOTA_RESERVE=300)
+class TestQuotaScheduling(TestCase):
+
+    def setUp(self):
+        api_cache.clear()
+        reset_breakers()
+        course = Course.objects.create(course_name="Web Development", description="Basics")
+        self.learning_path = LearningPath.objects.create(path_name="Frontend", course=course)
+
+    def create_module(self, topic, enriched=False):
+        return Module.objects.create(
+            module_name=topic, learning_path=self.learning_path, topic=topic, enriched_topic=topic if enriched else '',
+        )
+
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_search_without_quota_skips_api_and_breaker(self, mock_get_client):
+        set_remaining(50, at=datetime.now(timezone.utc))
+
+        self.assertEqual(get_youtube_videos("HTML"), [])
+        with self.assertRaises(QuotaExceeded):
+            get_youtube_videos("HTML", raise_errors=True)
+
+        mock_get_client.assert_not_called()
+        self.assertEqual(get_breaker('youtube').state, CLOSED)
+        self.assertEqual(get_breaker('youtube').failures, 0)
+
+    @override_settings(CIRCUIT_BREAKER={'failure_threshold': 1, 'reset_timeout': 60})
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_open_circuit_leaves_quota_untouched(self, mock_get_client):
+        set_remaining(500, at=datetime.now(timezone.utc))
+        get_breaker('youtube').record_failure()
+
+        self.assertEqual(get_youtube_videos("HTML"), [])
+        with self.assertRaises(CircuitOpenError):
+            get_youtube_videos("HTML", raise_errors=True)
+
+        mock_get_client.assert_not_called()
+        self.assertEqual(ApiQuota.objects.get().tokens, 500)
+        self.assertEqual(get_breaker('youtube').state, OPEN)
+
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_search_charges_search_and_details(self, mock_get_client):
+        mock_get_client.return_value.search.return_value.list.return_value.execute.return_value = {'items': []}
+
+        get_youtube_videos("HTML")
+
+        self.assertAlmostEqual(ApiQuota.objects.get().tokens, 1000 - 101, places=0)
+
+    def test_interactive_jobs_are_claimed_first(self):
+        background = self.create_module("HTML", enriched=True)
+        requeue_modules([background])
+        interactive = self.create_module("CSS")
+
+        job = claim_next_job(EnrichmentJob)
+
+        self.assertEqual(job.module, interactive)
+
+    def test_save_escalates_queued_background_job(self):
+        module = self.create_module("HTML", enriched=True)
+        requeue_modules([module])
+        EnrichmentJob.objects.update(run_after=datetime.now(timezone.utc) + timedelta(hours=1))
+
+        module.topic = "HTML forms"
+        module.save()
+
+        job = EnrichmentJob.objects.get(status=EnrichmentJob.STATUS_PENDING)
+        self.assertEqual(job.priority, BackgroundJob.PRIORITY_INTERACTIVE)
+        self.assertIsNone(job.run_after)
+
+    @patch("core.services.enrichment_service.get_blog_posts", return_value=None)
+    @patch("core.services.enrichment_service.get_youtube_videos", return_value=[])
+    def test_background_job_is_deferred_when_quota_is_low(self, mock_videos, mock_blog):
+        self.create_module("CSS")
+        background = self.create_module("HTML")
+        EnrichmentJob.objects.filter(module=background).update(priority=BACKGROUND)
+        set_remaining(350, at=datetime.now(timezone.utc))
+
+        counts = drain_enrichment_queue()
+
+        self.assertEqual(counts, {'done': 1, 'pending': 1, 'failed': 0})
+        mock_videos.assert_called_once_with("CSS", raise_errors=True, priority=BackgroundJob.PRIORITY_INTERACTIVE)
+        job = EnrichmentJob.objects.get(module=background)
+        self.assertEqual((job.status, job.attempts), (EnrichmentJob.STATUS_PENDING, 0))
+        self.assertGreater(job.run_after, datetime.now(timezone.utc))
+        background.refresh_from_db()
+        self.assertEqual(background.enrichment_status, Module.ENRICHMENT_PENDING)
+
+        # Not picked up again until run_after
+        self.assertEqual(drain_enrichment_queue(), {'done': 0, 'pending': 0, 'failed': 0})
+        status = get_quota_status()
+        self.assertFalse(status['background_allowed'])
+        self.assertEqual(status['pending_jobs'], {'interactive': 0, 'background': 1, 'deferred': 1})
+
+    def test_status_endpoint_is_staff_only(self):
+        user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get('/api/v1/quota/youtube/').status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        response = client.get('/api/v1/quota/youtube/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['capacity'], 1000)
+        self.assertEqual(response.data['remaining'], 1000)
+        self.assertEqual(response.data['reserve'], 300)
+
+
+@unittest.skipUnless(
+    supports_concurrent_writes(),
+    "needs a database that serializes concurrent writers (Postgres, or file SQLite with transaction_mode=IMMEDIATE)",
+)
+@override_settings(YOUTUBE_QUOTA_UNITS_PER_DAY=1000, YOUTUBE_QUOTA_RESERVE=0)
+class TestConcurrentQuota(TransactionTestCase):
+
+    def spend(self, _):
+        try:
+            consume(100)
+            return True
+        except QuotaExceeded:
+            return False
+        finally:
+            connection.close()
+
+    def test_processes_never_overspend(self):
+        set_remaining(500, at=datetime.now(timezone.utc))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            spent = list(pool.map(self.spend, range(8)))
+
+        self.assertEqual(spent.count(True), 5)
+        self.assertLess(ApiQuota.objects.get().tokens, 100)
@@ -1,12 +1,19 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from core.services.youtube_service import get_youtube_videos
+from django.test import TestCase
+from core.services import api_cache
+from core.services.circuit_breaker import reset_breakers
+from core.services.youtube_service import get_youtube_videos, get_youtube_videos_for_topics
 
-class TestYouTubeService(unittest.TestCase):
+class TestYouTubeService(TestCase):
 
-    @patch('core.services.youtube_service.build')
+    def setUp(self):
+        api_cache.clear()
+        reset_breakers()
+
+    @patch('core.services.youtube_service.get_youtube_client')
     @patch('core.services.youtube_service.calculate_text_similarity')
-    def test_get_youtube_videos_success(self, mock_similarity, mock_build):
+    def test_get_youtube_videos_success(self, mock_similarity, mock_get_client):
         """Test fetching YouTube videos successfully."""
         # Setup mock similarity to always return high values
         mock_similarity.return_value = 0.8
@@ -28,6 +35,7 @@ class TestYouTubeService(unittest.TestCase):
         mock_videos.execute.return_value = {
             'items': [
                 {
+                    'id': 'video1',
                     'contentDetails': {'duration': 'PT1H30M'},
                     'snippet': {
                         'title': 'Object Oriented Programming Explained',
@@ -38,6 +46,7 @@ class TestYouTubeService(unittest.TestCase):
                     'statistics': {'viewCount': '1000'}
                 },
                 {
+                    'id': 'video2',
                     'contentDetails': {'duration': 'PT1H45M'},
                     'snippet': {
                         'title': 'Advanced OOP Techniques',
@@ -50,7 +59,7 @@ class TestYouTubeService(unittest.TestCase):
             ]
         }
 
-        mock_build.return_value = mock_youtube
+        mock_get_client.return_value = mock_youtube
 
         # Call the function
         topic = "Object Oriented Programming"
@@ -70,13 +79,13 @@ class TestYouTubeService(unittest.TestCase):
             print(f"Title Similarity: {video.get('title_similarity')}")
             print("---")
 
-    @patch('core.services.youtube_service.build')
-    def test_get_youtube_videos_no_results(self, mock_build):
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_get_youtube_videos_no_results(self, mock_get_client):
         """Test fetching YouTube videos with no results."""
         # Mock YouTube API response with no items
         mock_youtube = MagicMock()
         mock_youtube.search.return_value.list.return_value.execute.return_value = {'items': []}
-        mock_build.return_value = mock_youtube
+        mock_get_client.return_value = mock_youtube
 
         # Call the function
         topic = "Nonexistent Topic"
@@ -85,11 +94,11 @@ class TestYouTubeService(unittest.TestCase):
         # Assert no results
         self.assertEqual(len(videos), 0)
 
-    @patch('core.services.youtube_service.build')
-    def test_get_youtube_videos_error_handling(self, mock_build):
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_get_youtube_videos_error_handling(self, mock_get_client):
         """Test error handling in fetching YouTube videos."""
         # Mock YouTube API to raise an exception
-        mock_build.side_effect = Exception("API error")
+        mock_get_client.side_effect = Exception("API error")
 
         # Call the function
         topic = "Error Topic"
@@ -98,5 +107,143 @@ class TestYouTubeService(unittest.TestCase):
         # Assert empty result due to error
         self.assertEqual(len(videos), 0)
 
+    @patch('core.services.youtube_service.get_youtube_client')
+    @patch('core.services.youtube_service.calculate_text_similarity')
+    def test_get_youtube_videos_batches_details(self, mock_similarity, mock_get_client):
+        """Test that details for all search hits are fetched in one call."""
+        mock_similarity.return_value = 0.8
+        mock_youtube = MagicMock()
+        mock_youtube.search.return_value.list.return_value.execute.return_value = {
+            'items': [{'id': {'videoId': f'video{i}'}} for i in range(20)]
+        }
+        mock_youtube.videos.return_value.list.return_value.execute.return_value = {
+            'items': [
+                {
+                    'id': f'video{i}',
+                    'contentDetails': {'duration': 'PT1H'},
+                    'snippet': {
+                        'title': f'Python part {i}',
+                        'description': 'Python',
+                        'channelTitle': 'Tech Tutorials',
+                        'publishedAt': '2023-01-01T00:00:00Z',
+                    },
+                    'statistics': {'viewCount': str(i)}
+                }
+                for i in range(20)
+            ]
+        }
+        mock_get_client.return_value = mock_youtube
+
+        videos = get_youtube_videos("Python", max_results=5)
+
+        mock_youtube.videos.return_value.list.assert_called_once()
+        ids = mock_youtube.videos.return_value.list.call_args.kwargs['id'].split(',')
+        self.assertEqual(len(ids), 20)
+        self.assertEqual([video['videoId'] for video in videos], [f'video{i}' for i in range(19, 14, -1)])
+
+    @patch('core.services.youtube_service.get_youtube_client')
+    @patch('core.services.youtube_service.calculate_text_similarity')
+    def test_get_youtube_videos_skips_details_without_id(self, mock_similarity, mock_get_client):
+        """Test that a details item without an id is skipped rather than matched by position."""
+        mock_similarity.return_value = 0.8
+        mock_youtube = MagicMock()
+        mock_youtube.search.return_value.list.return_value.execute.return_value = {
+            'items': [{'id': {'videoId': 'removed'}}, {'id': {'videoId': 'kept'}}]
+        }
+
+        def video_item(title):
+            return {
+                'contentDetails': {'duration': 'PT1H'},
+                'snippet': {
+                    'title': title,
+                    'description': 'Python',
+                    'channelTitle': 'Tech Tutorials',
+                    'publishedAt': '2023-01-01T00:00:00Z',
+                },
+                'statistics': {'viewCount': '10'}
+            }
+
+        # 'removed' is missing from the response and the one item returned has lost its id
+        mock_youtube.videos.return_value.list.return_value.execute.return_value = {
+            'items': [video_item('Python for beginners')]
+        }
+        mock_get_client.return_value = mock_youtube
+
+        with self.assertLogs('core.services.youtube_service', 'WARNING'):
+            videos = get_youtube_videos("Python")
+
+        self.assertEqual(videos, [])
+
+    @patch('core.services.youtube_service.get_youtube_client')
+    @patch('core.services.youtube_service.calculate_text_similarity')
+    def test_get_youtube_videos_for_topics_dedupes_ids(self, mock_similarity, mock_get_client):
+        """Test that a video found for several topics is only looked up once."""
+        mock_similarity.return_value = 0.8
+        mock_youtube = MagicMock()
+        mock_youtube.search.return_value.list.return_value.execute.side_effect = [
+            {'items': [{'id': {'videoId': 'shared'}}, {'id': {'videoId': 'html'}}]},
+            {'items': [{'id': {'videoId': 'shared'}}, {'id': {'videoId': 'css'}}]},
+        ]
+
+        def video_item(video_id):
+            return {
+                'id': video_id,
+                'contentDetails': {'duration': 'PT1H'},
+                'snippet': {
+                    'title': video_id,
+                    'description': video_id,
+                    'channelTitle': 'Tech Tutorials',
+                    'publishedAt': '2023-01-01T00:00:00Z',
+                },
+                'statistics': {'viewCount': '10'}
+            }
+
+        mock_youtube.videos.return_value.list.return_value.execute.return_value = {
+            'items': [video_item('shared'), video_item('html'), video_item('css')]
+        }
+        mock_get_client.return_value = mock_youtube
+
+        results = get_youtube_videos_for_topics(["HTML", "CSS"])
+
+        mock_youtube.videos.return_value.list.assert_called_once()
+        self.assertEqual(mock_youtube.videos.return_value.list.call_args.kwargs['id'], 'shared,html,css')
+        self.assertEqual({video['videoId'] for video in results["HTML"]}, {'shared', 'html'})
+        self.assertEqual({video['videoId'] for video in results["CSS"]}, {'shared', 'css'})
+
+    @patch('core.services.youtube_service.get_youtube_client')
+    def test_get_youtube_videos_ranks_relevance_over_views(self, mock_get_client):
+        """Test that a relevant video outranks a more popular, loosely related one."""
+        mock_youtube = MagicMock()
+        mock_youtube.search.return_value.list.return_value.execute.return_value = {
+            'items': [{'id': {'videoId': video_id}} for video_id in ('news', 'decorators', 'pasta')]
+        }
+
+        def video_item(video_id, title, description, views):
+            return {
+                'id': video_id,
+                'contentDetails': {'duration': 'PT1H'},
+                'snippet': {
+                    'title': title,
+                    'description': description,
+                    'channelTitle': 'Tech Tutorials',
+                    'publishedAt': '2023-01-01T00:00:00Z',
+                },
+                'statistics': {'viewCount': str(views)}
+            }
+
+        mock_youtube.videos.return_value.list.return_value.execute.return_value = {
+            'items': [
+                video_item('news', 'Python news roundup', 'This week in Python', 5_000_000),
+                video_item('decorators', 'Python Decorators Explained', 'How decorators wrap functions', 10_000),
+                video_item('pasta', 'Cooking pasta', 'Dinner ideas', 9_000_000),
+            ]
+        }
+        mock_get_client.return_value = mock_youtube
+
+        videos = get_youtube_videos("Python decorators", similarity_threshold=0.5)
+
+        self.assertEqual([video['videoId'] for video in videos], ['decorators', 'news'])
+        self.assertGreater(videos[0]['relevance_score'], videos[1]['relevance_score'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Fixtures shared by the test modules.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import slugify
+from rest_framework.test import APIClient
+
+from core.models import User, Course, LearningPath, Module, Quiz, Question, Answer
+
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'api': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared-tests'},
+}
+
+
+def supports_concurrent_writes():
+    # In-memory SQLite shares one cache between threads and fails with "table is locked" instead of waiting
+    if connection.vendor == 'sqlite':
+        return (
+            not connection.is_in_memory_db()
+            and connection.settings_dict['OPTIONS'].get('transaction_mode') == 'IMMEDIATE'
+        )
+    return connection.features.has_select_for_update
+
+
+def create_course(num_paths, modules_per_path):
+    course = Course.objects.create(course_name=f"Course {num_paths}", description="Test course")
+    paths = LearningPath.objects.bulk_create(
+        [LearningPath(path_name=f"Path {i}", course=course) for i in range(num_paths)]
+    )
+    Module.objects.bulk_create([
+        Module(
+            module_name=f"Module {path.pk}-{i}", slug=f"module-{path.pk}-{i}", learning_path=path,
+            topic="Topic", enriched_topic="Topic",
+        )
+        for path in paths for i in range(modules_per_path)
+    ])
+    return course
+
+
+def build_catalog(num_modules, prefix):
+    """
+    Bulk-create a course whose learning paths hold `num_modules` modules in total,
+    each with a quiz of two questions with two answers.
+    """
+    course = Course.objects.create(course_name=f"{prefix} course", description="Fixture")
+    paths = LearningPath.objects.bulk_create([
+        LearningPath(path_name=f"{prefix} path {i}", course=course) for i in range(max(1, num_modules // 10))
+    ])
+    modules = Module.objects.bulk_create([
+        Module(
+            module_name=f"{prefix} module {i}", slug=slugify(f"{prefix} module {i}"),
+            learning_path=paths[i % len(paths)],
+            topic="Topic", enriched_topic="Topic", enrichment_status=Module.ENRICHMENT_DONE,
+        )
+        for i in range(num_modules)
+    ])
+    quizzes = Quiz.objects.bulk_create([Quiz(quiz_name=f"Quiz {module.pk}", module=module) for module in modules])
+    questions = Question.objects.bulk_create([
+        Question(quiz=quiz, question_text=f"Question {i}") for quiz in quizzes for i in range(2)
+    ])
+    Answer.objects.bulk_create([
+        Answer(question=question, answer_text=f"Answer {i}", is_correct=i == 0) for question in questions for i in range(2)
+    ])
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Asserts an endpoint's query count does not grow with the number of rows it returns.
+    """
+    small_size = 10
+    large_size = 1000
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="learner", email="learner@example.com", password="password", full_name="Learner"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url):
+        build_catalog(self.small_size, "small")
+        small = self.count_queries(url)
+        build_catalog(self.large_size, "large")
+        large = self.count_queries(url)
+        self.assertEqual(small, large, f"{url} ran {small} queries for {self.small_size} rows but {large} for more")